@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Szenario-Vergleich für die Liquiditätsplanung V4.0
+
+Statt Monatsblöcke je Zeitplan zu kopieren, entsteht der Plan aus Treibern je
+Standort (planning-scenarios-v4.json): Umsatz je Linie, Personal, Betriebskosten,
+Schließungsmonat und Nachlauf bis zur letzten Nachzahlung. Alle Kombinationen
+aus "grid" werden gemeinsam gerechnet; ausgegeben wird je Szenario Endstand
+und Tiefststand, gespeichert im Format von ForecastScenario/ForecastAssumption.
+
+Verwendung:
+    python3 compare-scenarios-v4.py
+    python3 compare-scenarios-v4.py --top 10
+    python3 compare-scenarios-v4.py --scenarios PLANUNG-V4.0-SZENARIEN.json   # gespeicherte neu rechnen
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from planning.scenarios import (ScenarioConfigError, build_scenarios, comparison, evaluate, load_drivers,
+                                load_scenarios, save_scenarios)
+
+OUTPUT_FILE = Path('/Users/david/Projekte/AI Terminal/Inso-Liquiplanung/Cases/Hausärztliche Versorgung PLUS eG/06-review/PLANUNG-V4.0-SZENARIEN.json')
+DRIVERS_FILE = Path(__file__).with_name('planning-scenarios-v4.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Szenario-Vergleich Schließungstermine/Nachlauf (Planung V4.0)")
+    parser.add_argument("--drivers", type=Path, default=DRIVERS_FILE,
+                        help=f"Treiber und Raster (Standard: {DRIVERS_FILE.name})")
+    parser.add_argument("--scenarios", type=Path,
+                        help="Gespeicherte Szenarien (ForecastScenario/ForecastAssumption) statt Treibern rechnen")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE, help="Szenarien und Vergleich als JSON")
+    parser.add_argument("--top", type=int, default=0, help="Nur die n Szenarien mit dem tiefsten Stand zeigen")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        scenarios = load_scenarios(args.scenarios) if args.scenarios else build_scenarios(load_drivers(args.drivers))
+    except ScenarioConfigError as e:
+        raise SystemExit(str(e))
+    if not scenarios:
+        raise SystemExit("Keine Szenarien")
+
+    start = time.perf_counter()
+    results = evaluate(scenarios)
+    table = comparison(results)
+    seconds = time.perf_counter() - start
+
+    if not args.scenarios:
+        save_scenarios(args.output, scenarios, table)
+
+    print(f"{len(scenarios)} Szenarien × {len(results.months)} Monate in {seconds * 1000:.1f} ms")
+    print(f"\n{'Endstand':>13} {'Tiefststand':>13} {'Monat':<8}  Szenario")
+    for row in table[:args.top or None]:
+        marker = " !" if row['fehlbetrag'] else ""
+        print(f"{row['endstand']:>13,.2f} {row['tiefststand']:>13,.2f} {row['tiefststandMonat']:<8}  "
+              f"{row['scenario']}{marker}")
+    shortfalls = sum(row['fehlbetrag'] for row in table)
+    print(f"\nMit Fehlbetrag: {shortfalls} von {len(table)}")
+    if not args.scenarios:
+        print(f"Gespeichert: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,8 @@ Timeline:
 
 import json
 
+from planning.matrix import changed_values, compute_plan, euro_text, liquidity_curve, to_euro
+
 # Basis-Struktur laden
 with open('/Users/david/Projekte/AI Terminal/Inso-Liquiplanung/Cases/Hausärztliche Versorgung PLUS eG/06-review/PLANUNG-V4.0-IV-TAUGLICH.json', 'r') as f:
     planning = json.load(f)
@@ -29,11 +31,9 @@ monate = [
                 "hzv_velbert": 0,
                 "hzv_uckerath": 0,
                 "pvs_velbert": 0,
-                "gesamt": 26066.67
             },
             "altforderungen": 22566.67,
             "insolvenzspezifisch": 0,
-            "gesamt": 48633.34
         },
         "ausgaben": {
             "personal": {
@@ -44,12 +44,9 @@ monate = [
                 "velbert": -8800,
                 "uckerath": -6822.22,
                 "eitorf": -4627.78,
-                "gesamt": -20250
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -20250
         },
-        "saldo": 28383.34,
         "anmerkungen": []
     },
 
@@ -66,11 +63,9 @@ monate = [
                 "hzv_velbert": 100000,  # Quartalsabschluss!
                 "hzv_uckerath": 110000,  # Quartalsabschluss!
                 "pvs_velbert": 0,
-                "gesamt": 229066.67
             },
             "altforderungen": 168186.43,
             "insolvenzspezifisch": 0,
-            "gesamt": 397253.10
         },
         "ausgaben": {
             "personal": {
@@ -81,12 +76,9 @@ monate = [
                 "velbert": -14000,
                 "uckerath": -13500,
                 "eitorf": -7250,
-                "gesamt": -34750
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -34750
         },
-        "saldo": 362503.10,
         "anmerkungen": ["Quartalsabschlüsse HZV Q4/2025 (+170k EUR)"]
     },
 
@@ -104,11 +96,9 @@ monate = [
                 "hzv_uckerath": 40000,
                 "pvs_velbert": 5000,
                 "pvs_uckerath": 5000,
-                "gesamt": 147700
             },
             "altforderungen": 30000,
             "insolvenzspezifisch": 0,
-            "gesamt": 177700
         },
         "ausgaben": {
             "personal": {
@@ -119,17 +109,13 @@ monate = [
                 "velbert": -14000,
                 "uckerath": -13500,
                 "eitorf": -7250,
-                "gesamt": -34750
             },
             "insolvenzspezifisch": {
                 "rückzahlung_vorfinanzierung": -88052.96,
                 "sachaufnahme": -2000,
-                "gesamt": -90052.96,
                 "erläuterung": "Rückzahlung an Bankhaus Bauer: 70.553 EUR Oktober-Gehälter + 17.500 EUR Gebühren (5% von 350k). Verifiziert aus ISK-Kontoauszug 08.01.2026 (siehe A4)."
             },
-            "gesamt": -124802.96
         },
-        "saldo": 52897.04,
         "anmerkungen": []
     },
 
@@ -147,14 +133,11 @@ monate = [
                 "hzv_uckerath": 40000,
                 "pvs_velbert": 5000,
                 "pvs_uckerath": 5000,
-                "gesamt": 147700
             },
             "altforderungen": 0,
             "insolvenzspezifisch": {
                 "steuererstattung": 11000,
-                "gesamt": 11000
             },
-            "gesamt": 158700
         },
         "ausgaben": {
             "personal": {
@@ -164,19 +147,15 @@ monate = [
                 "zentrale": -28800,
                 "vertreter": -5000,
                 "lohnbuchhaltung": -785,
-                "gesamt": -210929.20,
                 "erläuterung": "Erste Gehaltszahlung durch Masse nach Ende der Insolvenzgeld-Phase (siehe A2)."
             },
             "betrieblich": {
                 "velbert": -14000,
                 "uckerath": -13500,
                 "eitorf": -7250,
-                "gesamt": -34750
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -245679.20
         },
-        "saldo": -86979.20,
         "anmerkungen": ["Liquiditätsdefizit wird durch Dezember-Puffer (362k EUR) gedeckt"]
     },
 
@@ -194,11 +173,9 @@ monate = [
                 "hzv_uckerath": 110000,  # Quartalsabschluss!
                 "pvs_velbert": 5000,
                 "pvs_uckerath": 5000,
-                "gesamt": 265133.33
             },
             "altforderungen": 22566.67,
             "insolvenzspezifisch": 0,
-            "gesamt": 287700
         },
         "ausgaben": {
             "personal": {
@@ -208,19 +185,15 @@ monate = [
                 "zentrale": -28800,
                 "vertreter": -5000,
                 "lohnbuchhaltung": -785,
-                "gesamt": -210929.20,
                 "erläuterung": "Letzte Gehaltszahlung für alle Standorte vor Schließung Uckerath/Eitorf."
             },
             "betrieblich": {
                 "velbert": -14000,
                 "uckerath": -13500,
                 "eitorf": -7250,
-                "gesamt": -34750
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -245679.20
         },
-        "saldo": 42020.80,
         "anmerkungen": ["Quartalsabschlüsse HZV Q1/2026 (+170k EUR)", "Letzte Woche Q1 - Uckerath/Eitorf schließen Anfang April"]
     },
 
@@ -235,11 +208,9 @@ monate = [
                 "kv_velbert": 40000,
                 "hzv_velbert": 30000,
                 "pvs_velbert": 10000,
-                "gesamt": 90000
             },
             "altforderungen": 10000,  # Restforderungen Uckerath/Eitorf
             "insolvenzspezifisch": 0,
-            "gesamt": 100000
         },
         "ausgaben": {
             "personal": {
@@ -250,9 +221,7 @@ monate = [
                 "velbert": -14000
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -93744.20
         },
-        "saldo": 6255.80,
         "anmerkungen": ["Schließung Uckerath und Eitorf Anfang April", "Personalkosten sinken von 211k auf 80k EUR"]
     },
 
@@ -267,11 +236,9 @@ monate = [
                 "kv_velbert": 40000,  # KV-Zahlung für April-Leistungen
                 "hzv_velbert": 30000,  # HZV-Zahlung für April-Leistungen
                 "pvs_velbert": 10000,
-                "gesamt": 80000
             },
             "altforderungen": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 80000
         },
         "ausgaben": {
             "personal": {
@@ -282,9 +249,7 @@ monate = [
                 "velbert": -14000
             },
             "insolvenzspezifisch": 0,
-            "gesamt": -93744.20
         },
-        "saldo": -13744.20,
         "anmerkungen": ["Velbert: Letzte Leistungserbringung", "Schließung Ende Mai geplant"]
     },
 
@@ -298,19 +263,15 @@ monate = [
             "umsatz": {
                 "kv_velbert": 19300,  # Nachzahlung Mai-Leistungen (halber Monat)
                 "pvs_velbert": 19300,  # PVS-Nachzahlungen
-                "gesamt": 38600
             },
             "altforderungen": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 38600
         },
         "ausgaben": {
             "personal": 0,
             "betrieblich": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 0
         },
-        "saldo": 38600,
         "anmerkungen": ["Nachzahlungen für bereits erbrachte Leistungen"]
     },
 
@@ -323,19 +284,15 @@ monate = [
         "einnahmen": {
             "umsatz": {
                 "kv_velbert": 59100,  # Quartalsabschluss Q2 + Restzahlungen
-                "gesamt": 59100
             },
             "altforderungen": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 59100
         },
         "ausgaben": {
             "personal": 0,
             "betrieblich": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 0
         },
-        "saldo": 59100,
         "anmerkungen": ["Quartalsabschluss Q2/2026", "Letzte erwartete Nachzahlungen"]
     },
 
@@ -349,33 +306,35 @@ monate = [
             "umsatz": 0,
             "altforderungen": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 0
         },
         "ausgaben": {
             "personal": 0,
             "betrieblich": 0,
             "insolvenzspezifisch": 0,
-            "gesamt": 0
         },
-        "saldo": 0,
         "anmerkungen": ["Ende des Planungshorizonts"]
     }
 ]
 
-# Zusammenfassung berechnen
-total_einnahmen = sum(m['einnahmen']['gesamt'] for m in monate)
-total_ausgaben = sum(m['ausgaben']['gesamt'] for m in monate)
-netto_saldo = total_einnahmen + total_ausgaben
+# Summen, Saldo und Liquiditätsverlauf aus den Planpositionen ableiten
+# (gesamt/saldo/kumuliert werden nicht von Hand gepflegt)
+matrix, totals = compute_plan(monate)
+total_einnahmen = to_euro(totals.inflows.sum())
+total_ausgaben = to_euro(totals.outflows.sum())
+netto_saldo = to_euro(totals.saldo.sum())
+# Hinweise nicht von Hand: jeder Monat mit negativem Saldo bekommt einen Defizit-Hinweis
+liquiditaetsverlauf = liquidity_curve(monate)
+
+# Abweichungen zur bisherigen Datei zeigen (z.B. von Hand gepflegte Summen, die nicht aufgingen)
+for monat, feld, vorher, nachher in changed_values(planning.get('monate', []), monate):
+    print(f"Geändert {monat} {feld}: {euro_text(vorher)} -> {euro_text(nachher)} EUR")
 
 planning['monate'] = monate
 planning['zusammenfassung'] = {
-    "gesamteinnahmen": round(total_einnahmen, 2),
-    "gesamtausgaben": round(total_ausgaben, 2),
-    "nettosaldo": round(netto_saldo, 2),
-    "liquiditätsverlauf": [
-        {"monat": "Februar 2026", "saldo": -86979.20, "kumuliert": 356804, "hinweis": "Defizit durch Dezember-Puffer gedeckt"},
-        {"monat": "Mai 2026", "saldo": -13744.20, "kumuliert": 385316, "hinweis": "Kleines Defizit in Auslaufphase"}
-    ]
+    "gesamteinnahmen": total_einnahmen,
+    "gesamtausgaben": total_ausgaben,
+    "nettosaldo": netto_saldo,
+    "liquiditätsverlauf": liquiditaetsverlauf
 }
 
 # Speichern
@@ -386,3 +345,4 @@ print("✅ Planung V4.0 erstellt!")
 print(f"Gesamteinnahmen: {total_einnahmen:,.2f} EUR")
 print(f"Gesamtausgaben: {total_ausgaben:,.2f} EUR")
 print(f"Nettosaldo: {netto_saldo:,.2f} EUR")
+print(f"Tiefster Stand: {to_euro(totals.cumulative.min()):,.2f} EUR ({matrix.months[totals.cumulative.argmin()]})")
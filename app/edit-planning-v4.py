@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Einzelne Planpositionen der Liquiditätsplanung V4.0 ändern
+
+Statt create-planning-v4.py erneut laufen zu lassen (alles neu schreiben und
+summieren), wird nur die Position gesetzt; Gruppensummen, Saldo und der
+kumulierte Verlauf ab diesem Monat werden nachgezogen. Die geänderten Felder
+werden angezeigt und ins Änderungsprotokoll (-AUDIT.jsonl neben der Planung)
+geschrieben. Gespeicherte Summen, die schon beim Laden nicht aufgehen, werden
+korrigiert, angezeigt und als eigener Eintrag (ADJUSTED) protokolliert.
+
+Verwendung:
+    python3 edit-planning-v4.py --set 2026-01 ausgaben.insolvenzspezifisch.rückzahlung_vorfinanzierung=-90000 \\
+        --reason "Endabrechnung Bankhaus Bauer"
+    python3 edit-planning-v4.py --set 2026-06 einnahmen.umsatz.kv_velbert=25000 --dry-run
+"""
+
+import argparse
+import getpass
+import json
+from pathlib import Path
+
+from planning.graph import PlanEditError, PlanGraph, append_audit
+from planning.matrix import euro_text, liquidity_curve, to_euro
+
+PLAN_FILE = Path('/Users/david/Projekte/AI Terminal/Inso-Liquiplanung/Cases/Hausärztliche Versorgung PLUS eG/06-review/PLANUNG-V4.0-IV-TAUGLICH.json')
+
+
+def parse_edit(month, assignment):
+    field, sep, value = assignment.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"{assignment!r}: erwartet FELD=WERT")
+    try:
+        return month, field.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{assignment!r}: {value!r} ist keine Zahl")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Planpositionen ändern (Planung V4.0)")
+    parser.add_argument("--plan", type=Path, default=PLAN_FILE, help="Planungsdatei (JSON mit monate)")
+    parser.add_argument("--set", nargs=2, action="append", metavar=("MONAT", "FELD=WERT"), required=True,
+                        help="Position setzen, z.B. 2026-01 ausgaben.betrieblich.velbert=-15000 (EUR)")
+    parser.add_argument("--reason", help="Begründung für das Änderungsprotokoll")
+    parser.add_argument("--user", default=getpass.getuser(), help="Benutzer für das Änderungsprotokoll")
+    parser.add_argument("--audit", type=Path, help="Änderungsprotokoll (Standard: neben der Planung, -AUDIT.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts schreiben")
+    args = parser.parse_args()
+    try:
+        args.edits = [parse_edit(month, assignment) for month, assignment in args.set]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    return args
+
+
+def update_summary(planning, graph):
+    """
+    zusammenfassung aus den fortgeschriebenen Summen neu schreiben (wie in
+    create-planning-v4.py); liefert die geänderten Felder als (None, Feld, vorher, nachher)
+    """
+    summary = planning.get('zusammenfassung')
+    if summary is None:
+        return []
+    totals = graph.totals
+    values = {
+        'gesamteinnahmen': to_euro(totals.inflows.sum()),
+        'gesamtausgaben': to_euro(totals.outflows.sum()),
+        'nettosaldo': to_euro(totals.saldo.sum()),
+        'liquiditätsverlauf': liquidity_curve(graph.monate),
+    }
+    changes = [(None, f'zusammenfassung.{key}', summary.get(key), value)
+               for key, value in values.items() if summary.get(key) != value]
+    summary.update(values)
+    return changes
+
+
+def print_change(month, field, before, after):
+    if isinstance(after, list):
+        print(f"    {field}: neu aufgebaut ({len(after)} Monate)")
+    else:
+        print(f"    {' '.join(filter(None, (month, field)))}: {euro_text(before)} -> {euro_text(after)}")
+
+
+def main():
+    args = parse_args()
+    with open(args.plan, encoding='utf-8') as f:
+        planning = json.load(f)
+
+    graph = PlanGraph(planning['monate'])
+    # Vor der ersten Änderung: was die Neuberechnung an den gespeicherten Werten korrigiert
+    summary_corrections = update_summary(planning, graph)
+    corrections = graph.corrections + summary_corrections
+    if corrections:
+        print(f"Beim Laden neu berechnet ({len(corrections)} Felder gingen nicht auf):")
+        for change in corrections:
+            print_change(*change)
+
+    try:
+        edits = [graph.set(month, field, value, args.reason, args.user) for month, field, value in args.edits]
+    except PlanEditError as e:
+        raise SystemExit(str(e))
+
+    for edit in edits:
+        print(f"{edit.month} {edit.field}: {edit.before:,.2f} -> {edit.after:,.2f} EUR")
+        for change in edit.changes:
+            print_change(*change)
+    low = int(graph.totals.cumulative.argmin())
+    print(f"Tiefster Stand: {to_euro(graph.totals.cumulative[low]):,.2f} EUR ({graph.matrix.months[low]})")
+
+    if args.dry_run:
+        return
+    update_summary(planning, graph)
+    with open(args.plan, 'w', encoding='utf-8') as f:
+        json.dump(planning, f, indent=2, ensure_ascii=False)
+    audit = args.audit or args.plan.with_name(args.plan.stem + '-AUDIT.jsonl')
+    entries = graph.audit_entries(edits)
+    if corrections:
+        entries.insert(0, graph.correction_entry(summary_corrections, args.user))
+    append_audit(audit, entries)
+    print(f"Gespeichert: {args.plan}, Protokoll: {audit}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""
+Hilfsmodule für die Liquiditätsplanung (create-planning-v4.py).
+
+Das Skript bleibt der Einstiegspunkt und enthält die Planwerte; hier liegt
+die Rechenlogik, die aus den Planpositionen Summen und Verläufe ableitet.
+Setzt numpy voraus.
+"""
@@ -0,0 +1,204 @@
+"""
+Inkrementelle Planrechnung: Abhängigkeiten der abgeleiteten Felder.
+
+Jede Position (Monat, einnahmen.umsatz.kv_velbert) geht in die "gesamt" ihrer
+Gruppen im selben Monat, die Abschnittssummen in den Saldo des Monats, der
+Saldo in "kumuliert" dieses und aller späteren Monate. Ändert sich eine Zahl,
+werden nur diese Knoten um die Differenz fortgeschrieben (Cent, ganzzahlig -
+gleiches Ergebnis wie eine Neuberechnung) statt den ganzen Plan neu zu summieren.
+
+Jede Änderung liefert die geänderten Felder (Monat, Feld, vorher, nachher) und
+landet im Änderungsprotokoll, Einträge im Stil von LedgerAuditLog
+(action, fieldChanges {old, new}, reason, userId, timestamp).
+
+Beim Aufbau werden alle abgeleiteten Felder einmal neu berechnet. Gespeicherte
+Werte, die dabei nicht aufgehen (von Hand gepflegt, leer), stehen in
+corrections und bekommen einen eigenen Protokolleintrag (ADJUSTED).
+"""
+
+import json
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from .matrix import SECTIONS, TOTAL, _node, compute_plan, derived_values, diff_derived, to_cents, to_euro
+
+# changes: [(Monat, Feld, vorher, nachher)] der abgeleiteten Felder, in EUR wie changed_values()
+PlanEdit = namedtuple("PlanEdit", ["month", "field", "before", "after", "changes", "reason", "user", "timestamp"])
+
+
+class PlanEditError(Exception):
+    """Änderung passt nicht zum Plan (unbekannter Monat, Feld ist eine Gruppe, ...)"""
+
+
+def _field(path):
+    return ".".join(path)
+
+
+class PlanGraph:
+    """
+    Plan (monate-Liste) mit Abhängigkeiten; abgeleitete Felder stehen nach
+    jeder Änderung aktuell in den Monaten.
+    """
+
+    def __init__(self, monate, opening_cents=0):
+        self.monate = monate
+        self.opening_cents = opening_cents
+        self.edits = []
+        stored = derived_values(monate)
+        self._build()
+        # Gespeicherte abgeleitete Felder, die die Neuberechnung überschrieben hat
+        self.corrections = diff_derived(stored, derived_values(monate), include_missing=True)
+
+    def _build(self):
+        self.matrix, self.totals = compute_plan(self.monate, self.opening_cents)
+        self.month_index = {month: row for row, month in enumerate(self.matrix.months)}
+        # Gruppen je Position (Präfixe und der Pfad selbst, falls er woanders Gruppe ist)
+        self.parents = [np.flatnonzero(self.matrix.membership[column]) for column in range(len(self.matrix.items))]
+        self.sections = {self.matrix.group_index[(section,)]: section for section in SECTIONS
+                         if (section,) in self.matrix.group_index}
+
+    def inputs(self, month, field):
+        """Direkte Eingänge eines abgeleiteten Feldes ("saldo", "kumuliert", "ausgaben.personal.gesamt")"""
+        row = self._row(month)
+        if field == "saldo":
+            return [(month, f"{section}.{TOTAL}") for section in SECTIONS if (section,) in self.matrix.group_index]
+        if field == "kumuliert":
+            previous = [(self.matrix.months[row - 1], "kumuliert")] if row > 0 else []
+            return previous + [(month, "saldo")]
+        path = tuple(field.split("."))
+        if path[-1] != TOTAL or path[:-1] not in self.matrix.group_index:
+            raise PlanEditError(f"{field} ist kein abgeleitetes Feld")
+        node = _node(self.monate[row], path[:-1])
+        if not isinstance(node, dict):
+            return []
+        group = path[:-1]
+        return [(month, _field(group + (key, TOTAL)) if isinstance(value, dict) else _field(group + (key,)))
+                for key, value in node.items()
+                if key != TOTAL and (isinstance(value, dict) or group + (key,) in self.matrix.item_index)]
+
+    def dependents(self, month, path):
+        """Felder, die eine Position beeinflusst: ihre Gruppen, Saldo, kumuliert ab diesem Monat"""
+        row = self._row(month)
+        column = self.matrix.item_index[tuple(path)]
+        fields = [(month, _field(self.matrix.groups[group] + (TOTAL,))) for group in self.parents[column]]
+        fields.append((month, "saldo"))
+        fields.extend((later, "kumuliert") for later in self.matrix.months[row:])
+        return fields
+
+    def _row(self, month):
+        try:
+            return self.month_index[month]
+        except KeyError:
+            raise PlanEditError(f"Monat {month} nicht im Plan")
+
+    def set(self, month, field, value, reason=None, user=None):
+        """Eine Position auf value (EUR) setzen, abhängige Felder nachziehen; liefert den PlanEdit"""
+        row = self._row(month)
+        path = tuple(field.split("."))
+        if path[0] not in SECTIONS or len(path) < 2 or TOTAL in path:
+            raise PlanEditError(f"{field} ist keine Planposition")
+
+        node = _node(self.monate[row], path)
+        if isinstance(node, dict):
+            raise PlanEditError(f"{field} ist in {month} eine Gruppe")
+        before = node if isinstance(node, (int, float)) and not isinstance(node, bool) else 0
+        self._set_leaf(self.monate[row], path, value)
+
+        column = self.matrix.item_index.get(path)
+        if column is None:
+            # Neue Position: einmal komplett neu aufbauen
+            old = derived_values(self.monate)
+            self._build()
+            changes = diff_derived(old, derived_values(self.monate), include_missing=True)
+        else:
+            changes = self._propagate(row, column, to_cents(value) - int(self.matrix.values[row, column]))
+
+        edit = PlanEdit(month, field, before, value, changes, reason, user, datetime.now().isoformat())
+        self.edits.append(edit)
+        return edit
+
+    def _set_leaf(self, month_data, path, value):
+        node = month_data
+        for key in path[:-1]:
+            child = node.get(key)
+            if child is None or child == 0:
+                child = node[key] = {}
+            elif not isinstance(child, dict):
+                raise PlanEditError(f"{'.'.join(path)}: {key} ist in {month_data['monat']} keine Gruppe")
+            node = child
+        node[path[-1]] = value
+
+    def _propagate(self, row, column, delta):
+        """Differenz in Gruppen, Saldo und kumuliert fortschreiben; geänderte Felder zurückschreiben"""
+        self.matrix.values[row, column] += delta
+        if delta == 0:
+            return []
+        matrix, totals, month = self.matrix, self.totals, self.monate[row]
+        key = matrix.months[row]
+        changes = []
+
+        for group in self.parents[column]:
+            old = int(totals.groups[row, group])
+            totals.groups[row, group] += delta
+            node = _node(month, matrix.groups[group])
+            if isinstance(node, dict):
+                node[TOTAL] = to_euro(totals.groups[row, group])
+                changes.append((key, _field(matrix.groups[group] + (TOTAL,)), to_euro(old), node[TOTAL]))
+
+        for group, section in self.sections.items():
+            (totals.inflows if section == "einnahmen" else totals.outflows)[row] = totals.groups[row, group]
+        old = int(totals.saldo[row])
+        totals.saldo[row] += delta
+        month["saldo"] = to_euro(totals.saldo[row])
+        changes.append((key, "saldo", to_euro(old), month["saldo"]))
+
+        old = totals.cumulative[row:].copy()
+        totals.cumulative[row:] += delta
+        for offset, later in enumerate(self.monate[row:]):
+            later["kumuliert"] = to_euro(totals.cumulative[row + offset])
+            changes.append((later["monat"], "kumuliert", to_euro(old[offset]), later["kumuliert"]))
+        return changes
+
+    def audit_entries(self, edits=None):
+        """Änderungen als Protokolleinträge (Felder wie LedgerAuditLog)"""
+        entries = []
+        for edit in self.edits if edits is None else edits:
+            field_changes = {f"{edit.month} {edit.field}": {"old": edit.before, "new": edit.after}}
+            field_changes.update({f"{month} {field}": {"old": before, "new": after}
+                                  for month, field, before, after in edit.changes})
+            entries.append({
+                "action": "UPDATED",
+                "month": edit.month,
+                "field": edit.field,
+                "fieldChanges": field_changes,
+                "reason": edit.reason,
+                "userId": edit.user,
+                "timestamp": edit.timestamp,
+            })
+        return entries
+
+    def correction_entry(self, changes=None, user=None):
+        """
+        Protokolleintrag für die beim Aufbau neu berechneten Felder (corrections),
+        changes: zusätzliche (Monat oder None, Feld, vorher, nachher), z.B. der zusammenfassung
+        """
+        field_changes = {" ".join(filter(None, (month, field))): {"old": before, "new": after}
+                         for month, field, before, after in self.corrections + list(changes or [])}
+        return {
+            "action": "ADJUSTED",
+            "month": None,
+            "field": None,
+            "fieldChanges": field_changes,
+            "reason": "Abgeleitete Felder neu berechnet (gespeicherte Werte gingen nicht auf)",
+            "userId": user,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def append_audit(path, entries):
+    """Protokolleinträge an eine JSONL-Datei anhängen (eine Zeile je Änderung)"""
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
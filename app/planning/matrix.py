@@ -0,0 +1,205 @@
+"""
+Planrechnung als Matrix: Monate × Planpositionen, in Cent.
+
+Ein Planmonat ist verschachtelt (einnahmen.umsatz.kv_velbert,
+ausgaben.personal.velbert, ...). Jede Zahl unterhalb von einnahmen/ausgaben
+ist eine Position, jede Ebene darüber eine Gruppe, deren "gesamt" die Summe
+aller Positionen darunter ist. Die Positionen aller Monate bilden die Spalten
+einer dichten Matrix (fehlt eine Position in einem Monat, steht dort 0).
+
+Alle Gruppensummen entstehen in einem Matrixprodukt mit der Zugehörigkeits-
+matrix (Position liegt in Gruppe: 1), Saldo und kumulierte Liquidität als
+Summe und cumsum darüber. Abgeleitete Felder ("gesamt", "saldo",
+"kumuliert") werden nicht gelesen, sondern berechnet und zurückgeschrieben.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+SECTIONS = ("einnahmen", "ausgaben")
+TOTAL = "gesamt"
+
+# groups: Monate × Gruppen; inflows, outflows, saldo, cumulative: je Monat (alles Cent)
+PlanTotals = namedtuple("PlanTotals", ["groups", "inflows", "outflows", "saldo", "cumulative"])
+
+
+def to_cents(value):
+    return int(round(value * 100))
+
+
+def to_euro(cents):
+    return int(cents) / 100
+
+
+def _leaves(node, path):
+    """(Pfad, Wert) aller Zahlen unterhalb von node - Texte (erläuterung) und gesamt übergangen"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key != TOTAL:
+                yield from _leaves(value, path + (key,))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield path, node
+
+
+def month_leaves(month):
+    """Alle Planpositionen eines Monats als (Pfad, EUR)"""
+    for section in SECTIONS:
+        if section in month:
+            yield from _leaves(month[section], (section,))
+
+
+class PlanMatrix:
+    """
+    months: Monatsschlüssel ("2025-11"), items: Positionspfade
+    (("einnahmen", "umsatz", "kv_velbert"), ...), values: int64 Monate × Positionen in Cent
+    """
+
+    def __init__(self, months, items, values):
+        self.months = list(months)
+        self.items = list(items)
+        self.values = values
+        self.item_index = {path: i for i, path in enumerate(self.items)}
+
+        # Gruppen = alle echten Präfixe der Positionspfade, in Reihenfolge des ersten Auftretens
+        groups = {}
+        for path in self.items:
+            for depth in range(1, len(path)):
+                groups.setdefault(path[:depth], len(groups))
+        # Eine Position kann in anderen Monaten selbst Gruppe sein ("personal": 0 vs. {"velbert": ...})
+        self.groups = list(groups)
+        self.group_index = groups
+
+        self.membership = np.zeros((len(self.items), len(self.groups)), dtype=np.int64)
+        for i, path in enumerate(self.items):
+            for depth in range(1, len(path) + 1):
+                j = groups.get(path[:depth])
+                if j is not None:
+                    self.membership[i, j] = 1
+
+    @classmethod
+    def from_monate(cls, monate):
+        """Dichte Matrix aus der verschachtelten monate-Liste des Plans"""
+        items = {}
+        cells = []
+        for row, month in enumerate(monate):
+            for path, value in month_leaves(month):
+                column = items.setdefault(path, len(items))
+                cells.append((row, column, to_cents(value)))
+
+        values = np.zeros((len(monate), len(items)), dtype=np.int64)
+        if cells:
+            rows, columns, cents = zip(*cells)
+            values[list(rows), list(columns)] = cents
+        return cls((month["monat"] for month in monate), items, values)
+
+    def column(self, path):
+        return self.values[:, self.item_index[tuple(path)]]
+
+    def month_row(self, month):
+        return self.months.index(month)
+
+    def compute(self, opening_cents=0, values=None):
+        """
+        Gruppensummen, Saldo und kumulierte Liquidität in einem Durchgang.
+        values: andere Werte gleicher Form (z.B. Szenario), sonst die Matrix selbst.
+        """
+        values = self.values if values is None else values
+        groups = values @ self.membership
+        zeros = np.zeros(values.shape[:-1], dtype=np.int64)
+        inflows = groups[..., self.group_index[("einnahmen",)]] if ("einnahmen",) in self.group_index else zeros
+        outflows = groups[..., self.group_index[("ausgaben",)]] if ("ausgaben",) in self.group_index else zeros
+        saldo = inflows + outflows
+        cumulative = opening_cents + np.cumsum(saldo, axis=-1)
+        return PlanTotals(groups, inflows, outflows, saldo, cumulative)
+
+
+def _node(month, path):
+    node = month
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+
+def write_back(monate, matrix, totals):
+    """gesamt je Gruppe (wo sie im Monat ein Dict ist), saldo und kumuliert in die Monate schreiben"""
+    for row, month in enumerate(monate):
+        for column, path in enumerate(matrix.groups):
+            node = _node(month, path)
+            if isinstance(node, dict):
+                node[TOTAL] = to_euro(totals.groups[row, column])
+        month["saldo"] = to_euro(totals.saldo[row])
+        month["kumuliert"] = to_euro(totals.cumulative[row])
+
+
+def derived_values(monate):
+    """{(Monat, "einnahmen.umsatz.gesamt"): EUR, ...} aller abgeleiteten Felder (gesamt, saldo, kumuliert)"""
+    values = {}
+
+    def walk(node, path, month_key):
+        for key, value in node.items():
+            if key == TOTAL:
+                values[(month_key, ".".join(path + (key,)))] = value
+            elif isinstance(value, dict):
+                walk(value, path + (key,), month_key)
+
+    for month in monate:
+        for section in SECTIONS:
+            if isinstance(month.get(section), dict):
+                walk(month[section], (section,), month["monat"])
+        for key in ("saldo", "kumuliert"):
+            if key in month:
+                values[(month["monat"], key)] = month[key]
+    return values
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def diff_derived(old, new, include_missing=False):
+    """
+    (Monat, Feld, vorher, nachher) zweier derived_values(), wo sie sich um mindestens
+    1 Cent unterscheiden. Leere Werte (None) gelten als Unterschied mit vorher None,
+    fehlende Felder nur mit include_missing.
+    """
+    changes = []
+    for key, value in new.items():
+        if key not in old and not include_missing:
+            continue
+        before = _number(old.get(key))
+        if before is None or to_cents(before) != to_cents(value):
+            changes.append(key + (before, value))
+    return changes
+
+
+def changed_values(before, after):
+    """(Monat, Feld, vorher, nachher) für abgeleitete Felder, die sich um mindestens 1 Cent unterscheiden"""
+    return diff_derived(derived_values(before), derived_values(after))
+
+
+def euro_text(value):
+    """EUR-Betrag für Ausgaben, leerer Wert als "-" """
+    return "-" if value is None else f"{value:,.2f}"
+
+
+def liquidity_curve(monate):
+    """zusammenfassung.liquiditätsverlauf aus den (berechneten) Monaten; Defizit-Hinweis bei negativem Saldo"""
+    verlauf = []
+    for month in monate:
+        eintrag = {"monat": month["monat_name"], "saldo": month["saldo"], "kumuliert": month["kumuliert"]}
+        if to_cents(month["saldo"]) < 0:
+            eintrag["hinweis"] = ("Defizit durch kumulierten Bestand gedeckt" if to_cents(month["kumuliert"]) >= 0
+                                  else "Defizit - Liquidität negativ")
+        verlauf.append(eintrag)
+    return verlauf
+
+
+def compute_plan(monate, opening_cents=0):
+    """Matrix bauen, rechnen, abgeleitete Felder zurückschreiben - liefert (PlanMatrix, PlanTotals)"""
+    matrix = PlanMatrix.from_monate(monate)
+    totals = matrix.compute(opening_cents)
+    write_back(monate, matrix, totals)
+    return matrix, totals
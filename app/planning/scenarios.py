@@ -0,0 +1,339 @@
+"""
+Szenario-Rechnung für die Liquiditätsplanung: Treiber je Standort -> Annahmen
+im Format von ForecastScenario/ForecastAssumption -> alle Szenarien in einem
+Durchgang.
+
+Ein Standort hat Umsatzlinien (KV/HZV/PVS als Monatsrate, optional mit
+Saisonprofil für Quartalszahlungen und erstem Leistungsmonat), Personal- und
+Betriebskosten, einen Schließungsmonat (letzter Leistungsmonat) und einen
+Nachlauf: Leistungen vom Start bis zur Schließung werden um den Nachlauf
+verzögert bezahlt (je Linie abweichend über lagMonths). Ein längerer Nachlauf
+verschiebt Zahlungen, erzeugt aber keine zusätzlichen. Leistungen vor Planstart
+sind Altforderungen (Einmalposten). Kosten laufen bis zur Schließung, Personal
+erst nach der Insolvenzgeld-Phase. Zentrale Kosten laufen bis zur letzten
+Schließung, Einmalposten (Altforderungen, Rückzahlungen, Erstattungen) kommen in
+ihrem Monat.
+
+Ein Szenario-Raster (Kreuzprodukt der Varianten, z.B. Schließungsmonate und
+Verzögerung) wird als Arrays Szenarien × Annahmen × Monate ausgewertet - nach
+denselben Regeln wie forecastAmount() in src/lib/forecast/engine.ts (Wachstum,
+Saisonfaktor, Math.round-Rundung, PERCENTAGE_OF_REVENUE im zweiten Schritt).
+Gespeichert werden Szenarien mit den Feldnamen der Prisma-Modelle, BigInt-Felder
+als String wie in der JSON-Serialisierung der App.
+"""
+
+import copy
+import itertools
+import json
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+FLOW_IN = "INFLOW"
+FLOW_OUT = "OUTFLOW"
+
+ASSUMPTION_TYPES = ("RUN_RATE", "FIXED", "ONE_TIME", "PERCENTAGE_OF_REVENUE")
+_RUN_RATE, _FIXED, _ONE_TIME, _PERCENTAGE = range(len(ASSUMPTION_TYPES))
+
+BIGINT_FIELDS = ("openingBalanceCents", "reservesTotalCents", "baseAmountCents", "riskImpactCents")
+
+# closing/cash_in/cash_out: Szenarien × Monate in Cent
+ScenarioResults = namedtuple("ScenarioResults", ["names", "months", "closing", "cash_in", "cash_out"])
+
+
+class ScenarioConfigError(Exception):
+    """Treiber- oder Raster-Konfiguration unvollständig oder fehlerhaft"""
+
+
+def month_offset(start, month):
+    """Periodenindex von "2026-02" bei Planstart "2025-11" -> 3"""
+    start_year, start_month = map(int, start.split("-"))
+    year, number = map(int, month.split("-"))
+    return (year - start_year) * 12 + number - start_month
+
+
+def month_key(start, index):
+    year, number = map(int, start.split("-"))
+    total = year * 12 + number - 1 + index
+    return f"{total // 12}-{total % 12 + 1:02d}"
+
+
+def _cents(euros):
+    return int(round(euros * 100))
+
+
+def make_assumption(category_key, label, flow_type, assumption_type, base_cents, source,
+                    start, end, growth=None, seasonal=None, sort_order=0):
+    """Eine Annahme mit den Feldern von ForecastAssumption (Beträge positiv, Richtung in flowType)"""
+    return {
+        "categoryKey": category_key,
+        "categoryLabel": label,
+        "flowType": flow_type,
+        "assumptionType": assumption_type,
+        "baseAmountCents": abs(base_cents),
+        "baseAmountSource": source,
+        "growthFactorPercent": growth,
+        "seasonalProfile": json.dumps(seasonal) if seasonal else None,
+        "startPeriodIndex": start,
+        "endPeriodIndex": end,
+        "isActive": True,
+        "sortOrder": sort_order,
+    }
+
+
+def build_assumptions(config):
+    """Alle Annahmen eines Szenarios aus den Treibern (config wie planning-scenarios-v4.json)"""
+    start = config["planStartDate"]
+    last = config["periodCount"] - 1
+    source = config.get("source", "Treiber")
+    personnel_start = month_offset(start, config["insolvenzgeldUntil"]) + 1 if config.get("insolvenzgeldUntil") else 0
+    revenue_factor = config.get("revenueFactor", 1.0)
+    assumptions = []
+
+    closures = {}
+    for name, standort in config["standorte"].items():
+        closure = min(month_offset(start, standort["closure"]), last)
+        closures[name] = closure
+        label = name.capitalize()
+        key = name.upper()
+        for line, revenue in standort.get("revenue", {}).items():
+            if not isinstance(revenue, dict):
+                revenue = {"amount": revenue}
+            # Leistungen von services_from bis zur Schließung, bezahlt lag Monate später
+            lag = revenue.get("lagMonths", standort.get("runoffLagMonths", 0))
+            services_from = month_offset(start, revenue["start"]) if revenue.get("start") else 0
+            assumptions.append(make_assumption(
+                f"{line.upper()}_{key}", f"{line.upper()} {label}", FLOW_IN, "RUN_RATE",
+                _cents(revenue["amount"] * revenue_factor), source, services_from + lag, min(closure + lag, last),
+                revenue.get("growthPercent"), revenue.get("seasonalProfile"), len(assumptions)))
+        if standort.get("personnel"):
+            assumptions.append(make_assumption(
+                f"PERSONAL_{key}", f"Personal {label}", FLOW_OUT, "RUN_RATE",
+                _cents(standort["personnel"]), source, personnel_start, closure, sort_order=len(assumptions)))
+        operating = standort.get("operating")
+        if operating:
+            if not isinstance(operating, dict):
+                operating = {"amount": operating}
+            assumptions.append(make_assumption(
+                f"BETRIEBLICH_{key}", f"Betriebskosten {label}", FLOW_OUT, "RUN_RATE",
+                _cents(operating["amount"]), source,
+                month_offset(start, operating["start"]) if operating.get("start") else 0, closure,
+                sort_order=len(assumptions)))
+
+    # Zentrale Kosten bis zur Schließung eines bestimmten Standorts, sonst bis zur letzten
+    last_closure = max(closures.values(), default=last)
+    for key, central in config.get("central", {}).items():
+        until = central.get("untilClosureOf")
+        if until is not None and until not in closures:
+            raise ScenarioConfigError(f"Zentrale Kosten {key!r}: Standort {until!r} unbekannt")
+        assumptions.append(make_assumption(
+            key.upper(), central.get("label", key), FLOW_OUT, "RUN_RATE", _cents(central["amount"]), source,
+            personnel_start if central.get("personnel") else 0, closures[until] if until else last_closure,
+            sort_order=len(assumptions)))
+
+    for item in config.get("oneTime", []):
+        flow = FLOW_IN if item["amount"] > 0 else FLOW_OUT
+        index = month_offset(start, item["month"])
+        if 0 <= index <= last:
+            assumptions.append(make_assumption(
+                item["key"], item["label"], flow, "ONE_TIME", _cents(item["amount"]), source,
+                index, index, sort_order=len(assumptions)))
+    return assumptions
+
+
+def _set_path(config, path, value):
+    node = config
+    keys = path.split(".")
+    for key in keys[:-1]:
+        if key not in node:
+            raise ScenarioConfigError(f"Raster-Parameter {path!r}: {key!r} fehlt in den Treibern")
+        node = node[key]
+    node[keys[-1]] = value
+
+
+# Kurzbezeichnungen der Raster-Parameter im Szenarionamen
+PARAMETER_LABELS = {
+    "closure": "Schließung",
+    "runoffLagMonths": "Nachlauf",
+    "revenueFactor": "Umsatz",
+    "openingBalance": "Anfangsbestand",
+}
+
+
+def _label(path, value):
+    """ "standorte.velbert.closure", "2026-06" -> "Velbert Schließung 2026-06" """
+    parts = path.split(".")
+    name = parts[-2].capitalize() if len(parts) > 1 else ""
+    return f"{name} {PARAMETER_LABELS.get(parts[-1], parts[-1])} {value}".strip()
+
+
+def scenario_grid(config):
+    """
+    (Name, Treiber) je Kombination aus config["grid"] ({"standorte.velbert.closure": ["2026-05", ...]}).
+    Die erste Kombination entspricht den Treiberwerten, wenn die Varianten mit ihnen beginnen.
+    """
+    grid = config.get("grid", {})
+    paths = list(grid)
+    for values in itertools.product(*(grid[path] for path in paths)):
+        drivers = copy.deepcopy(config)
+        for path, value in zip(paths, values):
+            _set_path(drivers, path, value)
+        name = ", ".join(_label(path, value) for path, value in zip(paths, values)) or config.get("name", "Basis")
+        yield name, drivers
+
+
+def make_scenario(name, drivers, assumptions, scenario_type="CUSTOM"):
+    """ForecastScenario-Felder plus Annahmen"""
+    return {
+        "scenario": {
+            "name": name,
+            "description": drivers.get("name"),
+            "scenarioType": scenario_type,
+            "isActive": True,
+            "periodType": "MONTHLY",
+            "periodCount": drivers["periodCount"],
+            "planStartDate": drivers["planStartDate"] + "-01",
+            "openingBalanceCents": _cents(drivers.get("openingBalance", 0)),
+            "openingBalanceSource": drivers.get("openingBalanceSource", "Planung"),
+            "reservesTotalCents": _cents(drivers.get("reservesTotal", 0)),
+        },
+        "assumptions": assumptions,
+    }
+
+
+def build_scenarios(config):
+    """
+    Alle Raster-Szenarien als CUSTOM: die Treiber nähern die Planung nur an
+    (Monatsraten statt der einzeln geplanten Beträge), keines ersetzt sie als BASE.
+    """
+    return [make_scenario(name, drivers, build_assumptions(drivers)) for name, drivers in scenario_grid(config)]
+
+
+def _round(values):
+    """Math.round() wie im TS-Forecast (halbe Cent nach oben)"""
+    return np.floor(values + 0.5)
+
+
+def evaluate(scenarios):
+    """Alle Szenarien gemeinsam: Endstände je Monat, Ein- und Auszahlungen (Cent)"""
+    count = len(scenarios)
+    periods = max(s["scenario"]["periodCount"] for s in scenarios)
+    width = max((len(s["assumptions"]) for s in scenarios), default=0)
+
+    base = np.zeros((count, width))
+    start = np.zeros((count, width), dtype=np.int64)
+    end = np.full((count, width), -1, dtype=np.int64)
+    kind = np.zeros((count, width), dtype=np.int64)
+    inflow = np.zeros((count, width), dtype=bool)
+    growth = np.zeros((count, width))
+    seasonal = np.ones((count, width, 12))
+    first_month = np.zeros(count, dtype=np.int64)
+    opening = np.zeros(count)
+
+    for s, entry in enumerate(scenarios):
+        scenario = entry["scenario"]
+        first_month[s] = int(scenario["planStartDate"][5:7]) - 1
+        opening[s] = int(scenario["openingBalanceCents"])
+        for a, assumption in enumerate(entry["assumptions"]):
+            if not assumption.get("isActive", True):
+                continue
+            base[s, a] = int(assumption["baseAmountCents"])
+            start[s, a] = assumption["startPeriodIndex"]
+            end[s, a] = min(assumption["endPeriodIndex"], scenario["periodCount"] - 1)
+            kind[s, a] = ASSUMPTION_TYPES.index(assumption["assumptionType"])
+            inflow[s, a] = assumption["flowType"] == FLOW_IN
+            growth[s, a] = float(assumption.get("growthFactorPercent") or 0)
+            profile = assumption.get("seasonalProfile")
+            if profile:
+                profile = json.loads(profile) if isinstance(profile, str) else profile
+                if len(profile) == 12:
+                    seasonal[s, a] = profile
+
+    period = np.arange(periods)
+    in_range = (period >= start[..., None]) & (period <= end[..., None])
+    elapsed = period - start[..., None]
+
+    # FIXED/RUN_RATE: Wachstum je Periode ab Start, dann Saisonfaktor des Kalendermonats
+    amount = np.where(growth[..., None] != 0, _round(base[..., None] * (1 + growth[..., None] / 100) ** elapsed),
+                      base[..., None])
+    calendar_month = (first_month[:, None] + period) % 12
+    season = np.take_along_axis(seasonal, np.broadcast_to(calendar_month[:, None, :], in_range.shape), axis=2)
+    amount = _round(amount * season)
+
+    running = (kind == _RUN_RATE) | (kind == _FIXED)
+    standard = np.where(running[..., None], amount, 0) + np.where((kind == _ONE_TIME)[..., None] & (elapsed == 0),
+                                                                  base[..., None], 0)
+    standard = np.where(in_range, standard, 0)
+    cash_in = np.where(inflow[..., None], standard, 0).sum(axis=1)
+    cash_out = np.where(inflow[..., None], 0, standard).sum(axis=1)
+
+    # PERCENTAGE_OF_REVENUE: baseAmountCents = Prozent × 100, bezogen auf die Einnahmen der Periode
+    percentage = np.where(((kind == _PERCENTAGE)[..., None]) & in_range,
+                          _round(cash_in[:, None, :] * (base[..., None] / 10000)), 0)
+    cash_in = cash_in + np.where(inflow[..., None], percentage, 0).sum(axis=1)
+    cash_out = cash_out + np.where(inflow[..., None], 0, percentage).sum(axis=1)
+
+    closing = opening[:, None] + np.cumsum(cash_in - cash_out, axis=1)
+    start_key = scenarios[0]["scenario"]["planStartDate"][:7] if scenarios else None
+    months = [month_key(start_key, index) for index in range(periods)] if scenarios else []
+    return ScenarioResults([s["scenario"]["name"] for s in scenarios], months,
+                           closing.astype(np.int64), cash_in.astype(np.int64), cash_out.astype(np.int64))
+
+
+def comparison(results):
+    """Vergleichstabelle: Endstand und Tiefststand (mit Monat) je Szenario, schlechtester Tiefststand zuerst"""
+    rows = []
+    for index, name in enumerate(results.names):
+        closing = results.closing[index]
+        low = int(closing.argmin())
+        rows.append({
+            "scenario": name,
+            "endstand": int(closing[-1]) / 100,
+            "tiefststand": int(closing[low]) / 100,
+            "tiefststandMonat": results.months[low],
+            "fehlbetrag": bool(closing[low] < 0),
+        })
+    return sorted(rows, key=lambda row: row["tiefststand"])
+
+
+def to_json_records(scenarios):
+    """BigInt-Felder als String (wie ForecastCalculationResultJSON)"""
+    out = []
+    for entry in scenarios:
+        scenario = {k: str(v) if k in BIGINT_FIELDS and v is not None else v for k, v in entry["scenario"].items()}
+        assumptions = [{k: str(v) if k in BIGINT_FIELDS and v is not None else v for k, v in assumption.items()}
+                       for assumption in entry["assumptions"]]
+        out.append({"scenario": scenario, "assumptions": assumptions})
+    return out
+
+
+def save_scenarios(path, scenarios, table):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generatedAt": datetime.now().isoformat(),
+            "count": len(scenarios),
+            "vergleich": table,
+            "scenarios": to_json_records(scenarios),
+        }, f, indent=2, ensure_ascii=False)
+
+
+def load_scenarios(path):
+    """Gespeicherte (oder aus der App exportierte) Szenarien mit Annahmen"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["scenarios"]
+    except (OSError, ValueError, KeyError) as e:
+        raise ScenarioConfigError(f"Szenarien {path} nicht lesbar: {e}")
+
+
+def load_drivers(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ScenarioConfigError(f"Treiber {path} nicht lesbar: {e}")
+    for key in ("planStartDate", "periodCount", "standorte"):
+        if key not in config:
+            raise ScenarioConfigError(f"Treiber {path}: {key!r} fehlt")
+    return config
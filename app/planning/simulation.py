@@ -0,0 +1,153 @@
+"""
+Monte-Carlo-Simulation der Zahlungszeitpunkte einer Liquiditätsplanung.
+
+Der Plan ist ein einzelner Pfad: jede Einnahme kommt genau im geplanten Monat
+in voller Höhe. Hier bekommt jede Einnahmeposition mit Zahlungsannahme
+(PaymentTiming) je Pfad und Monat
+- eine Verspätung in Tagen (Gamma-verteilt, Mittel/Streuung aus der Annahme)
+  ab dem üblichen Zahltag; rutscht die Zahlung über das Monatsende, landet sie
+  in einem späteren Monat (nach dem Planhorizont: gar nicht)
+- eine Abweichung der Höhe (Faktor ~ Normal(1, amount_sd), nicht negativ)
+Ausgaben und Positionen ohne Annahme bleiben wie geplant.
+
+Alle Pfade eines Blocks werden gemeinsam als Arrays Pfade × Monate × Positionen
+gerechnet; die Verschiebung um k Monate ist je k eine Maske und eine
+verschobene Addition. Große Pfadzahlen laufen in Blöcken (chunk_size), damit
+der Speicher begrenzt bleibt.
+"""
+
+import json
+from collections import namedtuple
+
+import numpy as np
+
+# Monatsgrenze für die Verschiebung (Planung ist monatlich, Zahltage sind Tage im Monat)
+DAYS_PER_MONTH = 30
+
+# payday: üblicher Zahltag im Monat, delay_mean/delay_sd: Verspätung in Tagen,
+# amount_sd: relative Streuung der Höhe (0.1 = 10 %)
+PaymentTiming = namedtuple("PaymentTiming", ["payday", "delay_mean", "delay_sd", "amount_sd"])
+
+# balances: Pfade × Monate (Cent), plan: geplanter kumulierter Stand je Monat (Cent)
+SimulationResult = namedtuple("SimulationResult", ["months", "balances", "plan", "lines"])
+
+QUANTILES = (0.01, 0.05, 0.5, 0.95)
+
+
+class TimingConfigError(Exception):
+    """Zahlungsannahmen unvollständig oder fehlerhaft"""
+
+
+def load_timings(path):
+    """
+    Annahmen je Positionsname oder Präfix ("hzv_" passt auf hzv_velbert, hzv_uckerath):
+
+        {"description": "...", "lines": {"hzv_": {"payday": 25, "delayMeanDays": 10,
+                                                   "delaySdDays": 12, "amountSd": 0.1}}}
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = json.load(f)["lines"]
+    except (OSError, ValueError, KeyError) as e:
+        raise TimingConfigError(f"Zahlungsannahmen {path} nicht lesbar: {e}")
+
+    timings = {}
+    for name, entry in lines.items():
+        try:
+            timings[name] = PaymentTiming(
+                int(entry["payday"]), float(entry.get("delayMeanDays", 0)),
+                float(entry.get("delaySdDays", 0)), float(entry.get("amountSd", 0)),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise TimingConfigError(f"Zahlungsannahme {name!r}: {e}")
+        if not 1 <= timings[name].payday <= DAYS_PER_MONTH:
+            raise TimingConfigError(f"Zahlungsannahme {name!r}: payday muss 1-{DAYS_PER_MONTH} sein")
+    return timings
+
+
+def timing_for(item, timings):
+    """Annahme für einen Positionspfad: exakter Name, sonst längster passender Präfix"""
+    name = item[-1]
+    if name in timings:
+        return timings[name]
+    prefixes = [prefix for prefix in timings if prefix.endswith("_") and name.startswith(prefix)]
+    return timings[max(prefixes, key=len)] if prefixes else None
+
+
+def _delays(rng, shape, mean, sd):
+    """Verspätungen in Tagen (Gamma mit Mittel/Streuung je Position, sd 0 = fest)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma_shape = np.where(sd > 0, (mean / sd) ** 2, 0.0)
+        gamma_scale = np.where((sd > 0) & (mean > 0), sd ** 2 / mean, 0.0)
+    return rng.gamma(gamma_shape, gamma_scale, size=shape) + np.where(sd > 0, 0.0, mean)
+
+
+def simulate(matrix, timings, paths=20000, opening_cents=0, seed=None, chunk_size=10000):
+    """Kumulierte Kontostände je Pfad und Monat für eine PlanMatrix"""
+    rng = np.random.default_rng(seed)
+    lines = [(column, item, timing_for(item, timings)) for column, item in enumerate(matrix.items)
+             if item[0] == "einnahmen"]
+    lines = [(column, item, timing) for column, item, timing in lines if timing is not None]
+
+    month_count = len(matrix.months)
+    columns = [column for column, _, _ in lines]
+    base = matrix.values[:, columns].astype(np.float64)
+    # Saldo = Summe aller Positionen; der nicht simulierte Teil ist fest
+    fixed = (matrix.values.sum(axis=1) - matrix.values[:, columns].sum(axis=1)).astype(np.float64)
+    payday = np.array([timing.payday for _, _, timing in lines], dtype=np.float64)
+    delay_mean = np.array([timing.delay_mean for _, _, timing in lines], dtype=np.float64)
+    delay_sd = np.array([timing.delay_sd for _, _, timing in lines], dtype=np.float64)
+    amount_sd = np.array([timing.amount_sd for _, _, timing in lines], dtype=np.float64)
+
+    balances = np.empty((paths, month_count), dtype=np.float64)
+    for start in range(0, paths, chunk_size):
+        count = min(chunk_size, paths - start)
+        shape = (count, month_count, len(lines))
+        shift = ((payday - 1 + _delays(rng, shape, delay_mean, delay_sd)) // DAYS_PER_MONTH).astype(np.int64)
+        amounts = base * np.maximum(0.0, 1.0 + amount_sd * rng.standard_normal(shape))
+
+        inflows = np.zeros((count, month_count), dtype=np.float64)
+        for k in range(min(int(shift.max(initial=0)), month_count - 1) + 1):
+            arriving = np.where(shift == k, amounts, 0.0).sum(axis=2)
+            inflows[:, k:] += arriving[:, :month_count - k]
+        balances[start:start + count] = opening_cents + np.cumsum(inflows + fixed, axis=1)
+
+    plan = opening_cents + np.cumsum(matrix.values.sum(axis=1))
+    return SimulationResult(matrix.months, balances, plan, [item for _, item, _ in lines])
+
+
+def _quantiles(values):
+    return {f"p{round(q * 100):02d}": round(float(v) / 100, 2)
+            for q, v in zip(QUANTILES, np.quantile(values, QUANTILES, axis=0))}
+
+
+def summarize(result):
+    """Bericht: je Monat Verteilung und Fehlbetrags-Wahrscheinlichkeit, dazu der Tiefststand je Pfad"""
+    balances = result.balances
+    quantiles = np.quantile(balances, QUANTILES, axis=0)
+    shortfall = (balances < 0).mean(axis=0)
+    mean = balances.mean(axis=0)
+
+    months = []
+    for index, month in enumerate(result.months):
+        entry = {"monat": month, "plan": round(float(result.plan[index]) / 100, 2),
+                 "mittel": round(float(mean[index]) / 100, 2)}
+        entry.update({f"p{round(q * 100):02d}": round(float(quantiles[i, index]) / 100, 2)
+                      for i, q in enumerate(QUANTILES)})
+        entry["wahrscheinlichkeitFehlbetrag"] = round(float(shortfall[index]), 4)
+        months.append(entry)
+
+    minimum = balances.min(axis=1)
+    worst_month = np.bincount(balances.argmin(axis=1), minlength=len(result.months)) / len(balances)
+    return {
+        "pfade": len(balances),
+        "simuliertePositionen": [".".join(item) for item in result.lines],
+        "monate": months,
+        "tiefststand": {
+            "mittel": round(float(minimum.mean()) / 100, 2),
+            **_quantiles(minimum),
+            "wahrscheinlichkeitFehlbetrag": round(float((minimum < 0).mean()), 4),
+            "monatHäufigkeit": {month: round(float(share), 4)
+                                for month, share in zip(result.months, worst_month) if share},
+        },
+    }
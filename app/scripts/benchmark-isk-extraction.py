@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Benchmarks für den ISK PDF Extraktor.
+
+Verwendung:
+    python3 scripts/benchmark-isk-extraction.py lines              # Zeilen-Klassifikator alt vs. neu
+    python3 scripts/benchmark-isk-extraction.py lines --lines 500000
+    python3 scripts/benchmark-isk-extraction.py categories         # Regel-Engine vs. Regel-Schleife
+    python3 scripts/benchmark-isk-extraction.py counterparties     # Gegenpartei-Index vs. Verzeichnisgröße
+    python3 scripts/benchmark-isk-extraction.py amounts            # Betragsspalte float vs. Cent-Bulk
+    python3 scripts/benchmark-isk-extraction.py pipeline           # Stufen bei 1/10/50 Seiten je Auszug
+    python3 scripts/benchmark-isk-extraction.py pipeline --pages 1 5 --json bench.json
+    python3 scripts/benchmark-isk-extraction.py fixtures /tmp/isk-fall/01-raw --statements 30
+    python3 scripts/benchmark-isk-extraction.py memory             # Bytes je Transaktion: Dict vs. Datensatz
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+
+from isk_extraction.amounts import parse_amount_cents, parse_amounts_cents
+from isk_extraction.counterparties import CounterpartyIndex
+from isk_extraction.lines import LINE_SKIP, classify_line
+from isk_extraction.metrics import StageTimer
+from isk_extraction.records import to_records
+from isk_extraction.rules import CategoryRuleEngine
+from isk_extraction.synthetic import generate_statement, statement_text, write_case_tree, write_statement_pdf
+
+CATEGORY_RULES_FILE = Path(__file__).with_name("isk-category-rules.json")
+COUNTERPARTIES_FILE = Path(__file__).with_name("isk-counterparties.json")
+EXTRACTOR_FILE = Path(__file__).with_name("extract-isk-pdfs.py")
+
+# Typische Seite eines Tagesauszugs (synthetisch, keine echten Patientendaten)
+SAMPLE_PAGE = """UC eBanking Version 5.2 UniCredit
+Gedruckt am 08.01.2026 09:14
+Kontonummer 400080228
+IBAN DE87 6005 0101 0400 0802 28
+Auszug Nr. 4
+Kontoauszugsdatum 08.01.2026
+Anfangsaldo (in EUR) 356.804,10
+Datum Valuta Buchungsinformationen Umsatz EUR
+08.01.2026 08.01.2026 Gutschrift HZV ABS. Q4/25 12.486,37
+HAVG Hausärztliche Vertragsgemeinschaft AG
+HAEVGID 055425 LANR 3892462
+08.01.2026 08.01.2026 Gutschrift Kassenärztliche Vereinigung Nordrhein 39.100,00
+Rate 1/2026
+08.01.2026 08.01.2026 Echtzeit-Sammelüberweisung
+Gehälter Dezember
+Referenz 20260108-0001 -88.052,96
+08.01.2026 08.01.2026 Gutschrift PVS rhein-ruhr GmbH 4.912,18
+Privatabrechnung 12/25
+08.01.2026 08.01.2026 Gutschrift DRV Befundberichtskosten 28,50
+Deutsche Rentenversicherung Rheinland
+08.01.2026 09.01.2026 Auskehrung gem. Massekreditvereinbarung -17.500,00
+Sparkasse Hilden-Ratingen-Velbert WELADED1VEL
+08.01.2026 08.01.2026 Umbuchung ISK Uckerath -2.000,00
+08.01.2026 08.01.2026 Lastschrift Telekom Deutschland GmbH -189,90
+Rechnung 12/2025 Kundennummer 4711
+08.01.2026 08.01.2026 Überweisung Medizintechnik Service GmbH -1.428,00
+Wartung EKG-Gerät Praxis Velbert
+08.01.2026 08.01.2026 Lastschrift Stadtwerke Velbert -312,45
+Endsaldo (in EUR) 305.878,19
+Seite 1 von 1"""
+
+
+# --- Zeilen-Klassifikator -------------------------------------------------
+
+def legacy_classify_line(line):
+    """Bisherige Logik aus extract_pdf_text(): Skip-Liste, re.match, re.search pro Zeile"""
+    line = line.strip()
+    if not line:
+        return LINE_SKIP
+    if any(skip in line for skip in ['Anfangsaldo (in EUR)', 'Endsaldo (in EUR)', 'Datum', 'Valuta',
+                                       'Buchungsinformationen', 'Umsatz EUR', 'Seite', 'UC eBanking',
+                                       'Version', 'UniCredit', 'Gedruckt', 'Erzeugt', 'Auszug Nr']):
+        return LINE_SKIP
+    date_match = re.match(r'^(\d{2}\.\d{2}\.\d{4})\s+(\d{2}\.\d{2}\.\d{4})\s+(.+)', line)
+    if date_match:
+        return re.search(r'(-?[\d.]+,\d{2})$', date_match.group(3))
+    return re.search(r'(-?[\d.]+,\d{2})$', line)
+
+
+def _lines_per_second(classify, lines, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            classify(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def bench_lines(args):
+    page_lines = SAMPLE_PAGE.split("\n")
+    lines = page_lines * (args.lines // len(page_lines) + 1)
+    lines = lines[:args.lines]
+
+    print(f"Zeilen-Klassifikator: {len(lines):,} Zeilen, bestes von {args.rounds} Läufen")
+    before = _lines_per_second(legacy_classify_line, lines, args.rounds)
+    after = _lines_per_second(classify_line, lines, args.rounds)
+    print(f"  vorher (Skip-Liste + re.match/re.search): {before:>12,.0f} Zeilen/s")
+    print(f"  nachher (classify_line, vorkompiliert):   {after:>12,.0f} Zeilen/s")
+    print(f"  Faktor: {after / before:.2f}x")
+
+
+# --- Kategorie-Regeln -----------------------------------------------------
+
+def _sample_transactions():
+    """Transaktionen aus SAMPLE_PAGE (Beschreibung = Folgezeilen zusammengefasst)"""
+    transactions = []
+    for line in SAMPLE_PAGE.split("\n"):
+        token = classify_line(line)
+        if token.kind == LINE_SKIP:
+            continue
+        if token.datum:
+            transactions.append({"description": token.text, "counterparty": None, "amount": 1.0})
+        elif transactions:
+            transactions[-1]["description"] += " " + token.line
+    return transactions
+
+
+def _synthetic_rules(base_rules, extra, rng):
+    """Basisregeln plus `extra` nicht matchende CONTAINS-Regeln (z.B. weitere Kreditoren)"""
+    rules = list(base_rules)
+    for i in range(extra):
+        name = "".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(rng.randint(6, 14)))
+        rules.append({
+            "name": f"Kreditor {i}", "priority": 200 + i, "matchField": "description",
+            "matchType": "CONTAINS", "matchValue": name, "suggestedCategory": "KREDITOR",
+        })
+    return rules
+
+
+def _linear_classify(rules, tx):
+    """Referenz: jede Regel einzeln prüfen (Kosten wachsen mit der Regelzahl)"""
+    desc = tx["description"].lower()
+    cp = (tx["counterparty"] or "").lower()
+    for rule in rules:
+        text = desc if rule["matchField"] == "description" else cp
+        if rule["matchType"] == "REGEX":
+            if re.search(rule["matchValue"], text, re.IGNORECASE):
+                return rule["suggestedCategory"]
+        elif rule["matchValue"].lower() in text:
+            return rule["suggestedCategory"]
+    return "SONSTIGE"
+
+
+def bench_categories(args):
+    with open(CATEGORY_RULES_FILE, encoding="utf-8") as f:
+        base_rules = json.load(f)["rules"]
+
+    rng = random.Random(42)
+    sample = _sample_transactions()
+    transactions = (sample * (args.transactions // len(sample) + 1))[:args.transactions]
+
+    print(f"Kategorisierung: {len(transactions):,} Transaktionen")
+    print(f"  {'Regeln':>8}  {'Schleife tx/s':>14}  {'Engine tx/s':>12}")
+    for extra in args.extra_rules:
+        rules = sorted(_synthetic_rules(base_rules, extra, rng), key=lambda r: r["priority"])
+        engine = CategoryRuleEngine(rules)
+
+        start = time.perf_counter()
+        expected = [_linear_classify(rules, tx) for tx in transactions]
+        linear = len(transactions) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        categories = engine.classify_batch(transactions)
+        batched = len(transactions) / (time.perf_counter() - start)
+
+        assert categories == expected, "Engine weicht von der Referenz ab"
+        print(f"  {len(rules):>8}  {linear:>14,.0f}  {batched:>12,.0f}")
+
+
+# --- Gegenparteien --------------------------------------------------------
+
+def _synthetic_counterparties(base, extra, rng):
+    """Basisverzeichnis plus `extra` Kreditoren mit Alias und IBAN"""
+    counterparties = list(base)
+    for i in range(extra):
+        name = "".join(rng.choice("BCDFGHJKLMNPRSTVWZ") for _ in range(rng.randint(6, 12)))
+        iban = "DE" + "".join(rng.choice("0123456789") for _ in range(20))
+        counterparties.append({"name": f"{name} GmbH", "aliases": [name], "ibans": [iban], "bics": []})
+    return counterparties
+
+
+def bench_counterparties(args):
+    with open(COUNTERPARTIES_FILE, encoding="utf-8") as f:
+        base = json.load(f)["counterparties"]
+
+    rng = random.Random(42)
+    sample = [tx["description"] for tx in _sample_transactions()]
+    descriptions = (sample * (args.transactions // len(sample) + 1))[:args.transactions]
+
+    print(f"Gegenpartei-Auflösung: {len(descriptions):,} Beschreibungen")
+    print(f"  {'Einträge':>8}  {'Aufbau ms':>10}  {'Beschr./s':>12}")
+    for extra in args.extra_counterparties:
+        counterparties = _synthetic_counterparties(base, extra, rng)
+
+        start = time.perf_counter()
+        index = CounterpartyIndex(counterparties)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.resolve_batch(descriptions)
+        per_second = len(descriptions) / (time.perf_counter() - start)
+        print(f"  {len(index):>8}  {build_ms:>10.1f}  {per_second:>12,.0f}")
+
+
+# --- Beträge --------------------------------------------------------------
+
+def legacy_parse_german_amount(amount_str):
+    """Bisheriger float-Parser (Fehler -> 0.0)"""
+    if not amount_str:
+        return 0.0
+    cleaned = amount_str.replace(".", "").replace(",", ".").strip()
+    try:
+        return float(cleaned)
+    except ValueError:
+        return 0.0
+
+
+def bench_amounts(args):
+    rng = random.Random(42)
+    column = []
+    for _ in range(args.amounts):
+        cents = rng.randint(-10_000_000, 10_000_000)
+        euros, rest = divmod(abs(cents), 100)
+        column.append(("-" if cents < 0 else "") + f"{euros:,}".replace(",", ".") + f",{rest:02d}")
+
+    start = time.perf_counter()
+    floats = [legacy_parse_german_amount(value) for value in column]
+    float_total = round(sum(floats), 2)
+    legacy = len(column) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scalar = [parse_amount_cents(value) for value in column]
+    single = len(column) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    cents, failures = parse_amounts_cents(column)
+    cents_total = sum(cents)
+    bulk = len(column) / (time.perf_counter() - start)
+
+    assert not failures and cents == scalar
+    print(f"Beträge: {len(column):,} Werte")
+    print(f"  float (alt):            {legacy:>12,.0f} Werte/s  Summe {float_total:,.2f}")
+    print(f"  Cent einzeln:           {single:>12,.0f} Werte/s")
+    print(f"  Cent Bulk:              {bulk:>12,.0f} Werte/s  Summe {cents_total / 100:,.2f}")
+    print(f"  Abweichung float-Summe: {round(float_total * 100) - cents_total} Cent")
+
+
+# --- Pipeline mit synthetischen Auszügen ----------------------------------
+
+def load_extractor():
+    """extract-isk-pdfs.py als Modul laden (Bindestrich im Dateinamen verhindert import)"""
+    spec = importlib.util.spec_from_file_location("extract_isk_pdfs", EXTRACTOR_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _measure(func, memory):
+    """(Ergebnis, Sekunden, Spitzenspeicher in Bytes) - Speicher in eigenem Lauf unter tracemalloc"""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def bench_pipeline_size(extractor, workdir, pages, args):
+    """Alle Stufen für Auszüge mit `pages` Seiten; liefert eine Ergebnis-Zeile je Stufe"""
+    rng = random.Random(42)
+    statements = [
+        generate_statement(rng, "400080228", number, date(2026, 1, number), transactions=pages * args.tx_per_page,
+                           pages=pages, extra_lines=args.extra_lines)
+        for number in range(1, args.statements + 1)
+    ]
+    pdf_paths = [write_statement_pdf(workdir / f"Tagesauszug #400080228 Nr {pages:03d}-{i:02d}.pdf", statement)
+                 for i, statement in enumerate(statements, 1)]
+    texts = [statement_text(statement) for statement in statements]
+    page_count = pages * len(statements)
+    expected = [tx["amountCents"] for statement in statements for tx in statement["transactions"]]
+
+    timers = []
+
+    def extract():
+        timers.append(StageTimer())
+        return [extractor.extract_pdf_text(path, timers[-1]) for path in pdf_paths]
+
+    def parse_text():
+        return [extractor.postprocess_transactions(extractor.parse_transactions(text.split("\n")), [])
+                for text in texts]
+
+    results, extract_seconds, extract_peak = _measure(extract, args.memory)
+    transactions = [tx for result in results for tx in result["transactions"]]
+    records = _annotated_records(extractor, results)
+    assert [tx["amountCents"] for tx in transactions] == expected, "Extraktion weicht vom Generator ab"
+
+    stages = [("extract_pdf_text", extract_seconds, extract_peak)]
+    # Aufteilung des ersten (ungetracten) Laufs nach Stufen aus dem StageTimer
+    stages += [(f"  {name}", seconds, None) for name, seconds in timers[0].seconds.items()]
+
+    stage_funcs = [
+        # Vergleich: gleiche PDFs ohne Tabellen-Pfad (page.extract_text() auf ganzen Seiten)
+        ("extract_pdf_text (Text-Parser)", lambda: [
+            extractor.extract_pdf_text(path, table_layout=False) for path in pdf_paths
+        ]),
+        ("parse (Text)", parse_text),
+        ("categorize_transaction", lambda: [
+            extractor.categorize_transaction(tx["description"], tx["counterparty"], tx["amount"])
+            for tx in transactions
+        ]),
+        ("extract_lanr", lambda: [extractor.extract_lanr(tx["description"]) for tx in transactions]),
+        ("group_by_month", lambda: extractor.group_by_month(records)),
+    ]
+    for name, func in stage_funcs:
+        _, seconds, peak = _measure(func, args.memory)
+        stages.append((name, seconds, peak))
+
+    return [
+        {
+            "pagesPerStatement": pages,
+            "stage": name.strip(),
+            "seconds": round(seconds, 6),
+            "pages": page_count,
+            "transactions": len(transactions),
+            "pagesPerSecond": round(page_count / seconds, 1) if seconds else None,
+            "transactionsPerSecond": round(len(transactions) / seconds, 1) if seconds else None,
+            "peakBytes": peak,
+            "_label": name,
+        }
+        for name, seconds, peak in stages
+    ]
+
+
+def bench_pipeline(args):
+    extractor = load_extractor()
+    extractor.configure_extraction()
+    extractor.get_category_engine()
+    extractor.get_counterparty_index()
+
+    print(f"Pipeline: {args.statements} Auszüge je Größe, {args.tx_per_page} Umsätze/Seite, "
+          f"{args.extra_lines} Zusatzzeilen/Umsatz")
+    print(f"  {'Seiten':>6}  {'Stufe':<24}  {'Sekunden':>9}  {'Seiten/s':>10}  {'tx/s':>12}  {'Peak KiB':>9}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            for row in bench_pipeline_size(extractor, Path(tmp), pages, args):
+                label = row.pop("_label")
+                peak = f"{row['peakBytes'] / 1024:,.0f}" if row["peakBytes"] is not None else "-"
+                print(f"  {pages:>6}  {label:<24}  {row['seconds']:>9.4f}  "
+                      f"{row['pagesPerSecond'] or 0:>10,.1f}  {row['transactionsPerSecond'] or 0:>12,.0f}  {peak:>9}")
+                rows.append(row)
+
+    if args.json:
+        # Für den Vergleich von Lauf zu Lauf (z.B. vor/nach einer Änderung)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"generatedAt": datetime.now().isoformat(), "parameters": {
+                "statements": args.statements, "txPerPage": args.tx_per_page, "extraLines": args.extra_lines,
+            }, "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"Ergebnisse: {args.json}")
+
+
+def _annotated_records(extractor, results, account_id="400080228"):
+    """Extraktionsergebnisse wie in main(): Konto/Quelle anhängen, dann kompakte Datensätze"""
+    records = []
+    for result in results:
+        result.setdefault("sourceFileHash", None)
+        txs = extractor.annotate_transactions(result, account_id, extractor.ISK_ACCOUNTS[account_id],
+                                              result["sourceFile"])
+        records.extend(to_records(txs))
+    return records
+
+
+def _collect(extractor, texts, compact):
+    """Umsätze aller Texte sammeln - als Dicts (bisher) oder als Transaction-Datensätze"""
+    collected = []
+    for i, text in enumerate(texts):
+        # Eigener Dateiname je Auszug: der String wird wie in main() von allen seinen Umsätzen geteilt
+        result = {"sourceFile": f"Tagesauszug #400080228 Nr {i:05d}.pdf", "sourceFileHash": f"{i:064x}",
+                  "transactions": extractor.postprocess_transactions(
+                      extractor.parse_transactions(text.split("\n")), [])}
+        txs = extractor.annotate_transactions(result, "400080228", extractor.ISK_ACCOUNTS["400080228"],
+                                              result["sourceFile"])
+        collected.extend(to_records(txs) if compact else txs)
+    return collected
+
+
+def bench_memory(args):
+    extractor = load_extractor()
+    extractor.configure_extraction()
+    extractor.get_category_engine()
+    extractor.get_counterparty_index()
+
+    rng = random.Random(42)
+    texts = [
+        statement_text(generate_statement(rng, "400080228", number, date(2026, 1, 1 + number % 28),
+                                          transactions=args.tx_per_statement, extra_lines=args.extra_lines))
+        for number in range(args.transactions // args.tx_per_statement)
+    ]
+
+    print(f"Speicher: {len(texts) * args.tx_per_statement:,} Transaktionen (tracemalloc, gehaltene Objekte)")
+    results = {}
+    for label, compact in (("Dict je Umsatz (bisher)", False), ("Transaction __slots__", True)):
+        tracemalloc.start()
+        collected = _collect(extractor, texts, compact)
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results[label] = held / len(collected)
+        print(f"  {label:<26} {held / 1024 / 1024:>8.1f} MiB  {held / len(collected):>7,.0f} Bytes/tx")
+        del collected
+
+    before, after = results.values()
+    print(f"  Ersparnis: {1 - after / before:.0%}")
+
+
+def write_fixtures(args):
+    paths = write_case_tree(args.raw_dir, statements=args.statements,
+                            transactions=tuple(args.transactions), pages=tuple(args.page_range),
+                            extra_lines=args.extra_lines, seed=args.seed)
+    print(f"{len(paths)} synthetische Auszüge in {args.raw_dir}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks für den ISK PDF Extraktor")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lines = sub.add_parser("lines", help="Zeilen-Klassifikator alt vs. neu")
+    lines.add_argument("--lines", type=int, default=200_000, help="Anzahl Zeilen")
+    lines.add_argument("--rounds", type=int, default=5, help="Wiederholungen (bester Lauf zählt)")
+    lines.set_defaults(func=bench_lines)
+
+    categories = sub.add_parser("categories", help="Regel-Engine vs. Regel-für-Regel bei wachsender Regelzahl")
+    categories.add_argument("--transactions", type=int, default=20_000, help="Anzahl Transaktionen")
+    categories.add_argument(
+        "--extra-rules", type=int, nargs="+", default=[0, 100, 400, 1000],
+        help="Zusätzliche synthetische Regeln je Lauf"
+    )
+    categories.set_defaults(func=bench_categories)
+
+    counterparties = sub.add_parser("counterparties", help="Gegenpartei-Index bei wachsendem Verzeichnis")
+    counterparties.add_argument("--transactions", type=int, default=20_000, help="Anzahl Beschreibungen")
+    counterparties.add_argument(
+        "--extra-counterparties", type=int, nargs="+", default=[0, 100, 1000, 5000],
+        help="Zusätzliche synthetische Gegenparteien je Lauf"
+    )
+    counterparties.set_defaults(func=bench_counterparties)
+
+    amounts = sub.add_parser("amounts", help="Betragsspalte: float-Parser vs. Cent-Parser (einzeln/Bulk)")
+    amounts.add_argument("--amounts", type=int, default=500_000, help="Anzahl Beträge")
+    amounts.set_defaults(func=bench_amounts)
+
+    pipeline = sub.add_parser("pipeline", help="Alle Stufen mit synthetischen PDFs verschiedener Größe")
+    pipeline.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50], help="Seiten je Auszug")
+    pipeline.add_argument("--statements", type=int, default=3, help="Auszüge je Größe")
+    pipeline.add_argument("--tx-per-page", type=int, default=30, help="Umsätze je Seite")
+    pipeline.add_argument("--extra-lines", type=int, default=1, help="Zusätzliche Beschreibungszeilen je Umsatz")
+    pipeline.add_argument("--no-memory", dest="memory", action="store_false",
+                          help="Ohne tracemalloc-Lauf (nur Zeiten)")
+    pipeline.add_argument("--json", type=Path, help="Ergebnisse zusätzlich als JSON schreiben")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    memory = sub.add_parser("memory", help="Speicher je Transaktion: Dicts vs. kompakte Datensätze")
+    memory.add_argument("--transactions", type=int, default=100_000, help="Anzahl Transaktionen")
+    memory.add_argument("--tx-per-statement", type=int, default=40, help="Umsätze je Auszug")
+    memory.add_argument("--extra-lines", type=int, default=1, help="Zusätzliche Beschreibungszeilen je Umsatz")
+    memory.set_defaults(func=bench_memory)
+
+    fixtures = sub.add_parser("fixtures", help="Synthetischen Kontoauszug-Ordner für extract-isk-pdfs.py erzeugen")
+    fixtures.add_argument("raw_dir", type=Path, help="Ziel (entspricht 01-raw/<Fall>/<Buchhaltung>)")
+    fixtures.add_argument("--statements", type=int, default=30, help="Auszüge je Konto")
+    fixtures.add_argument("--transactions", type=int, nargs=2, default=[3, 25], metavar=("MIN", "MAX"),
+                          help="Umsätze je Auszug")
+    fixtures.add_argument("--page-range", type=int, nargs=2, default=[1, 3], metavar=("MIN", "MAX"),
+                          help="Seiten je Auszug")
+    fixtures.add_argument("--extra-lines", type=int, default=0, help="Zusätzliche Beschreibungszeilen je Umsatz")
+    fixtures.add_argument("--seed", type=int, default=7)
+    fixtures.set_defaults(func=write_fixtures)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
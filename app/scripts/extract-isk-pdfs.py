@@ -1,24 +1,89 @@
 #!/usr/bin/env python3
 """
-ISK PDF Extraktor - BW-Bank Tagesauszüge
+ISK PDF Extraktor - BW-Bank Tagesauszüge (und weitere registrierte Bankformate)
 Extrahiert Transaktionen aus BW-Bank ISK PDFs und speichert sie als JSON.
+Das Bankformat wird je PDF an der ersten Seite erkannt (isk_extraction/formats.py),
+Ordner mit Auszügen verschiedener Banken laufen daher in einem Durchgang.
 
 Verwendung:
     python3 scripts/extract-isk-pdfs.py
+    python3 scripts/extract-isk-pdfs.py --workers 8    # parallel über alle PDFs
+    python3 scripts/extract-isk-pdfs.py --no-cache     # alle PDFs neu parsen
+    python3 scripts/extract-isk-pdfs.py --columnar parquet   # zusätzlich typisierte Spaltenablage
+    python3 scripts/extract-isk-pdfs.py --metrics --profile-slowest 3   # Stufen-Zeiten + cProfile
+    python3 scripts/extract-isk-pdfs.py --watch              # danach neue Auszüge laufend einarbeiten
+    python3 scripts/extract-isk-pdfs.py --sqlite             # zusätzlich direkt in prisma/dev.db laden
+    python3 scripts/extract-isk-pdfs.py --variance-threshold 5000   # Plan/Ist-Abweichungen erst ab 5.000 EUR
+    python3 scripts/extract-isk-pdfs.py --timeout 60 --memory-limit 1024   # engere Grenzen je PDF
+    python3 scripts/extract-isk-pdfs.py --cases --workers 0   # alle aktiven Fälle aus isk-cases.json, ein Pool
 """
 
+import argparse
+import cProfile
 import os
 import re
 import json
+import sqlite3
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 import pdfplumber
 
+from isk_extraction.amounts import cents_to_euro, parse_amounts_cents
+from isk_extraction.cache import ExtractionCache, file_sha256, write_json_atomic
+from isk_extraction.cases import Case, CaseConfigError, account_label, load_cases
+from isk_extraction.columnar import FORMATS as COLUMNAR_FORMATS, write_partition, write_schema
+from isk_extraction.counterparties import CounterpartyIndex
+from isk_extraction.fingerprints import DUPLICATE_MODES, DedupeIndex, fingerprint_transactions
+from isk_extraction.formats import (BankFormat, FirstPage, iter_page_texts, matches_filename, read_first_page,
+                                    register_format, set_balance, sniff_format)
+from isk_extraction.ledger import LedgerLoadError, load_transactions
+from isk_extraction.layout import (COLUMN_TOLERANCE, detect_table_layout, find_header_row, is_table_end,
+                                   page_rows, row_text, row_token)
+from isk_extraction.lines import LINE_SKIP, LINE_START, classify_lines
+from isk_extraction.records import Transaction, by_date, to_records
+from isk_extraction.reconcile import STATUS_OK, reconcile_statements, statement_row
+from isk_extraction.rollups import HzvRollup
+from isk_extraction.metrics import (NULL_TIMER, AllocationPeak, StageTimer, build_report, peak_rss_bytes,
+                                    write_report)
+from isk_extraction.rules import CategoryRuleEngine
+from isk_extraction.variance import (DEFAULT_THRESHOLD_CENTS, DEFAULT_THRESHOLD_PERCENT, ActualCells, compare,
+                                     load_actuals, load_plan_cells, save_report)
+from isk_extraction.sparkasse import SPARKASSE
+from isk_extraction.supervisor import REASON_ERROR, Limits, Quarantine, supervised_map
+from isk_extraction.watch import StatementWatcher
+
 # Pfade
 CASES_ROOT = Path("/Users/david/Projekte/AI Terminal/Inso-Liquiplanung/Cases")
 CASE_DIR = CASES_ROOT / "Hausärztliche Versorgung PLUS eG"
 RAW_DIR = CASE_DIR / "01-raw/Hausärztliche Versorgung PLUS eG - DR/02 Hausärztliche Versorgung PLUS eG - Buchhaltung"
 OUTPUT_DIR = CASE_DIR / "02-extracted"
+PLAN_FILE = CASE_DIR / "06-review" / "PLANUNG-V4.0-IV-TAUGLICH.json"
+DEV_DB = Path(__file__).resolve().parents[1] / "prisma" / "dev.db"
+CASE_NUMBER = "70d IN 362/25"
+PDF_TIMEOUT_SECONDS = 300
+PDF_MEMORY_LIMIT_MB = 2048
+
+# Bei jeder Änderung an der Parse-Logik erhöhen - invalidiert den Extraktions-Cache
+EXTRACTOR_VERSION = "10"
+
+# Fälle und Konten für Batch-Läufe (--cases)
+CASES_FILE = Path(__file__).with_name("isk-cases.json")
+
+# Kategorie-Regeln (Form wie ClassificationRule), per --category-rules überschreibbar
+CATEGORY_RULES_FILE = Path(__file__).with_name("isk-category-rules.json")
+# Gegenparteien (Export Counterparty/Creditor), per --counterparties überschreibbar
+COUNTERPARTIES_FILE = Path(__file__).with_name("isk-counterparties.json")
+
+_category_rules_file = CATEGORY_RULES_FILE
+_counterparties_file = COUNTERPARTIES_FILE
+_category_engine = None
+_counterparty_index = None
 
 # ISK Konten
 ISK_ACCOUNTS = {
@@ -34,6 +99,9 @@ ISK_ACCOUNTS = {
     }
 }
 
+# Ein Fall im Lauf: Konten mit PDFs, Inhalts-Hashes und fallbezogene Zustände
+CaseRun = namedtuple("CaseRun", ["case", "accounts", "pdfs", "digests", "size", "cache", "dedupe", "quarantine"])
+
 # LANR → Arzt Mapping
 LANR_MAPPING = {
     "3892462": {"name": "Dr. van Suntum", "haevgid": "055425", "standort": "Velbert"},
@@ -47,16 +115,9 @@ LANR_MAPPING = {
 }
 
 
-def parse_german_amount(amount_str):
-    """Parse German number format (1.234,56) to float"""
-    if not amount_str:
-        return 0.0
-    # Remove thousands separator and convert decimal comma
-    cleaned = amount_str.replace(".", "").replace(",", ".").strip()
-    try:
-        return float(cleaned)
-    except ValueError:
-        return 0.0
+def default_case(case_number=CASE_NUMBER, plan_file=PLAN_FILE):
+    """Der bisher fest eingestellte Fall - ohne --cases"""
+    return Case(CASE_DIR.name, case_number, CASE_DIR, RAW_DIR, ISK_ACCOUNTS, OUTPUT_DIR, plan_file)
 
 
 def extract_lanr(description):
@@ -76,197 +137,302 @@ def extract_lanr(description):
     return None
 
 
-def categorize_transaction(description, counterparty, amount):
-    """Kategorisiere Transaktion basierend auf Beschreibung"""
-    desc_lower = description.lower()
-    cp_lower = (counterparty or "").lower()
+def configure_extraction(category_rules_file=None, counterparties_file=None):
+    """Regel-/Stammdatendateien setzen - im Hauptprozess und als Initializer der Pool-Worker"""
+    global _category_rules_file, _counterparties_file, _category_engine, _counterparty_index
+    _category_rules_file = Path(category_rules_file or CATEGORY_RULES_FILE)
+    _counterparties_file = Path(counterparties_file or COUNTERPARTIES_FILE)
+    _category_engine = None
+    _counterparty_index = None
 
-    # HZV
-    if "hzv" in desc_lower or "havg" in cp_lower or "havg" in desc_lower:
-        return "HZV"
 
-    # KV
-    if "kassenärztliche" in cp_lower or "kvno" in cp_lower or ("rate" in desc_lower and "/20" in desc_lower):
-        return "KV"
+def get_category_engine():
+    """Kompilierte Kategorie-Regeln (einmal pro Prozess geladen)"""
+    global _category_engine
+    if _category_engine is None:
+        _category_engine = CategoryRuleEngine.from_file(_category_rules_file)
+    return _category_engine
 
-    # PVS
-    if "pvs" in cp_lower or "pvs" in desc_lower or "privatabrechnung" in desc_lower or "igel" in desc_lower:
-        return "PVS"
 
-    # DRV/Gutachten
-    if "drv" in cp_lower or "drv" in desc_lower or "rentenversicherung" in desc_lower or "befundberichtsko" in desc_lower:
-        return "GUTACHTEN"
+def get_counterparty_index():
+    """Gegenpartei-Index (einmal pro Prozess aufgebaut)"""
+    global _counterparty_index
+    if _counterparty_index is None:
+        _counterparty_index = CounterpartyIndex.from_file(_counterparties_file)
+    return _counterparty_index
 
-    # Kreis/Amt
-    if "kreis" in cp_lower or "landesoberkasse" in cp_lower:
-        return "GUTACHTEN"
 
-    # Sammelüberweisung (Auszahlung)
-    if "sammelüberweisung" in desc_lower or "echtzeit-sammelüberweisung" in desc_lower:
-        return "SAMMELUEBERWEISUNG"
+def configuration_digest():
+    """Hash über Regeln und Stammdaten - Änderungen daran invalidieren den Cache"""
+    return "-".join(file_sha256(path)[:12] for path in (_category_rules_file, _counterparties_file))
 
-    # Auskehrung Sparkasse
-    if "auskehrung" in desc_lower or "massekreditvereinbarung" in desc_lower:
-        return "AUSKEHRUNG_SPK"
 
-    # Interne Umbuchung
-    if "umbuchung" in desc_lower:
-        return "INTERN"
+def categorize_transaction(description, counterparty, amount):
+    """Kategorisiere Transaktion basierend auf Beschreibung (Regeln aus isk-category-rules.json)"""
+    return get_category_engine().classify(description, counterparty, amount)
 
-    # Sonstige
-    return "SONSTIGE"
 
+def postprocess_transactions(transactions, parse_errors, timer=NULL_TIMER):
+    """
+    Beträge (als Spalte) in Cent umrechnen, dann Gegenpartei, Kategorie und LANR
+    ergänzen. Buchungen ohne gültigen Betrag landen in parse_errors statt still
+    zu verschwinden; echte 0,00-Buchungen entfallen wie bisher.
+    """
+    transactions = list(transactions)
+    with timer.stage("amounts"):
+        amount_texts = [tx.pop("amountText") for tx in transactions]
+        amounts_cents, _ = parse_amounts_cents(amount_texts)
 
-def extract_pdf_text(pdf_path):
-    """Extrahiere Transaktionen aus einem BW-Bank PDF mit Text-Parsing"""
+    processed = []
+    for tx, amount_text, amount_cents in zip(transactions, amount_texts, amounts_cents):
+        if amount_cents is None:
+            parse_errors.append({
+                "date": tx["date"],
+                "description": tx["description"],
+                "amountText": amount_text,
+                "error": "Kein Betrag gefunden" if amount_text is None else "Ungültiger Betrag",
+            })
+            continue
+        if amount_cents == 0:
+            continue
+        tx["amount"] = cents_to_euro(amount_cents)
+        tx["amountCents"] = amount_cents
+        processed.append(tx)
 
-    transactions = []
-    metadata = {
-        "sourceFile": pdf_path.name,
-        "extractedAt": datetime.now().isoformat(),
-        "account": {},
-        "balances": {},
-        "summary": {}
-    }
+    with timer.stage("counterparties"):
+        matches = get_counterparty_index().resolve_batch([tx["description"] for tx in processed])
+        for tx, match in zip(processed, matches):
+            if match:
+                tx["counterparty"] = match.name
+                tx["counterpartyMatch"] = {"pattern": match.pattern, "via": match.via}
+
+    with timer.stage("categorize"):
+        categories = get_category_engine().classify_batch(processed)
+        for tx, category in zip(processed, categories):
+            tx["category"] = category
+
+    with timer.stage("lanr"):
+        for tx in processed:
+            # Extract LANR for HZV
+            lanr_info = extract_lanr(tx["description"])
+            if lanr_info:
+                tx["lanr"] = lanr_info["lanr"]
+                tx["haevgid"] = lanr_info["haevgid"]
+                tx["arzt"] = lanr_info["arzt"]
+                tx["standort"] = lanr_info["standort"]
+
+    timer.count("transactions", len(processed))
+    return processed
+
+
+def parse_statement_header(text, metadata):
+    """Kopfdaten (Konto, IBAN, Auszug, Anfangssaldo) - stehen auf der ersten Seite"""
+    konto_match = re.search(r'Kontonummer\s+(\d+)', text)
+    if konto_match:
+        metadata["account"]["kontonummer"] = konto_match.group(1)
+
+    iban_match = re.search(r'IBAN\s+(DE\d{2}\s*\d{4}\s*\d{4}\s*\d{4}\s*\d{4}\s*\d{2})', text)
+    if iban_match:
+        metadata["account"]["iban"] = iban_match.group(1)
+
+    auszug_match = re.search(r'Auszug Nr\.\s*(\d+)', text)
+    if auszug_match:
+        metadata["statementNumber"] = int(auszug_match.group(1))
+
+    datum_match = re.search(r'Kontoauszugsdatum\s+(\d{2}\.\d{2}\.\d{4})', text)
+    if datum_match:
+        metadata["statementDate"] = datum_match.group(1)
+
+    anfang_match = re.search(r'Anfangssaldo\s+(-?[\d.,]+)\s*EUR', text)
+    if anfang_match:
+        set_balance(metadata, "opening", anfang_match.group(1))
+
+
+def parse_statement_footer(text, metadata):
+    """Endsaldo - steht auf der letzten Seite"""
+    end_match = re.search(r'Endsaldo\s+(-?[\d.,]+)\s*EUR', text)
+    if end_match:
+        set_balance(metadata, "closing", end_match.group(1))
+
+
+def iter_statement_lines(pdf, metadata, timer=NULL_TIMER, first_page=None):
+    """
+    Liefert die Textzeilen Seite für Seite, ohne das Dokument als Ganzes zu halten.
+    Kopfdaten werden von der ersten, der Endsaldo von der letzten Seite gelesen.
+    first_page: bereits gelesene erste Seite (FirstPage aus der Format-Erkennung).
+    """
+    text = ""
+    for page_no, text in iter_page_texts(pdf, first_page, timer):
+        if page_no == 0:
+            parse_statement_header(text, metadata)
+        yield from text.split("\n")
+
+    parse_statement_footer(text, metadata)
+
+
+def iter_table_tokens(pdf, metadata, timer=NULL_TIMER, first_page=None):
+    """
+    Schneller Pfad für das BW-Bank Tabellenlayout: je Seite nur die Wörter der
+    Umsatztabelle, Datum/Valuta/Betrag nach Spalte (LineTokens wie classify_lines).
+    Die Spalten kommen einmal aus der Tabellen-Kopfzeile von Seite 1, der
+    Tabellenbereich der Folgeseiten einmal von Seite 2 - ab Seite 3 wird zugeschnitten.
+    Ohne erkennbare Tabelle auf Seite 1 übernimmt der Text-Parser.
+    """
+    layout = None
+    continuation_top = None
+    footer_lines = []
+    for page_no, page in enumerate(pdf.pages):
+        start = time.perf_counter()
+        if page_no == 0 and first_page is not None:
+            rows = first_page.rows
+        else:
+            bbox = None
+            if continuation_top is not None:
+                bbox = (layout.x0 - COLUMN_TOLERANCE, continuation_top, page.width, page.height)
+            rows = page_rows(page, bbox)
+        page.close()
+        extract_seconds = time.perf_counter() - start
+        if page_no == 0 and first_page is not None:
+            extract_seconds += first_page.seconds
+        timer.add("extractText", extract_seconds)
+
+        header = find_header_row(rows)
+        if page_no == 0:
+            layout = detect_table_layout(rows[header], rows[header + 1:]) if header is not None else None
+            if layout is None:
+                # Zeilen der ersten Seite liegen schon vor (Lesezeit erfasst), der Text-Parser macht weiter
+                metadata["layout"] = "text"
+                first_page = FirstPage(rows, "\n".join(row_text(row) for row in rows), pdf.metadata or {}, 0)
+                yield from classify_lines(iter_statement_lines(pdf, metadata, timer, first_page))
+                return
+            metadata["layout"] = "table"
+            parse_statement_header("\n".join(row_text(row) for row in rows[:header]), metadata)
+        elif page_no == 1 and header is not None:
+            continuation_top = min(word["top"] for word in rows[header])
+
+        timer.record_page(page_no + 1, extract_seconds, len(rows))
+        timer.count("lines", len(rows))
+
+        for row in rows[header + 1 if header is not None else 0:]:
+            # Ab dem Endsaldo nur noch Fußzeilen
+            if footer_lines or is_table_end(row):
+                footer_lines.append(row_text(row))
+            else:
+                yield row_token(row, layout)
+
+    parse_statement_footer("\n".join(footer_lines), metadata)
+
+
+def parse_transactions(lines):
+    """Transaktions-Zustandsautomat über Textzeilen"""
+    return parse_tokens(classify_lines(lines))
+
+
+def parse_tokens(tokens):
+    """Transaktions-Zustandsautomat: liefert Rohtransaktionen, sobald sie vollständig sind"""
+    # Pattern: DD.MM.YYYY DD.MM.YYYY description amount
+    # The amount is at the end of the line
+    current_tx = None
+    description_lines = []
+
+    for token in tokens:
+        if token.kind == LINE_SKIP:
+            continue
 
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            full_text += text + "\n"
+        if token.kind == LINE_START:
+            # Save previous transaction if exists
+            if current_tx:
+                current_tx["description"] = " ".join(description_lines).strip()
+                yield current_tx
+
+            # Start new transaction - amount pattern: -?1.234,56 or -?1234,56
+            # Der Betrag bleibt Text, umgerechnet wird spaltenweise in postprocess_transactions()
+            description_part = token.text.strip()
+
+            current_tx = {
+                "date": token.datum,
+                "valueDate": token.valuta,
+                "amount": None,
+                "amountCents": None,
+                "amountText": token.amount,
+                "counterparty": None
+            }
+            description_lines = [description_part] if description_part else []
 
-        # Extract metadata from header
-        konto_match = re.search(r'Kontonummer\s+(\d+)', full_text)
-        if konto_match:
-            metadata["account"]["kontonummer"] = konto_match.group(1)
+        elif current_tx is not None:
+            # Continuation with amount at the end of the line
+            if token.amount and current_tx["amountText"] is None:
+                line_text = token.text.strip()
+                current_tx["amountText"] = token.amount
+                if line_text:
+                    description_lines.append(line_text)
+            else:
+                # Add to description
+                description_lines.append(token.line)
 
-        iban_match = re.search(r'IBAN\s+(DE\d{2}\s*\d{4}\s*\d{4}\s*\d{4}\s*\d{4}\s*\d{2})', full_text)
-        if iban_match:
-            metadata["account"]["iban"] = iban_match.group(1)
+    # Don't forget the last transaction
+    if current_tx:
+        current_tx["description"] = " ".join(description_lines).strip()
+        yield current_tx
 
-        auszug_match = re.search(r'Auszug Nr\.\s*(\d+)', full_text)
-        if auszug_match:
-            metadata["statementNumber"] = int(auszug_match.group(1))
 
-        datum_match = re.search(r'Kontoauszugsdatum\s+(\d{2}\.\d{2}\.\d{4})', full_text)
-        if datum_match:
-            metadata["statementDate"] = datum_match.group(1)
+def sniff_bwbank(first_page):
+    """UC eBanking Tagesauszug: Tabellen-Kopfzeile Datum/Valuta/Buchungsinformationen/Umsatz auf Seite 1"""
+    return find_header_row(first_page.rows) is not None
 
-        anfang_match = re.search(r'Anfangssaldo\s+([\d.,]+)\s*EUR', full_text)
-        if anfang_match:
-            metadata["balances"]["opening"] = parse_german_amount(anfang_match.group(1))
 
-        end_match = re.search(r'Endsaldo\s+([\d.,]+)\s*EUR', full_text)
-        if end_match:
-            metadata["balances"]["closing"] = parse_german_amount(end_match.group(1))
+def parse_bwbank(pdf, first_page, metadata, timer=NULL_TIMER, table_layout=True):
+    """BW-Bank über das Tabellenlayout, sonst (oder mit table_layout=False) mit Text-Parsing"""
+    if table_layout:
+        tokens = iter_table_tokens(pdf, metadata, timer, first_page)
+    else:
+        metadata["layout"] = "text"
+        tokens = classify_lines(iter_statement_lines(pdf, metadata, timer, first_page))
+    return parse_tokens(tokens)
 
-        # Parse transactions line by line
-        # Pattern: DD.MM.YYYY DD.MM.YYYY description amount
-        # The amount is at the end of the line
-        lines = full_text.split('\n')
 
-        current_tx = None
-        description_lines = []
+def is_bwbank_file(name):
+    """Tagesauszüge heißen "... #<Kontonummer> ...pdf" """
+    return "#" in name
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
 
-            # Skip header/footer lines
-            if any(skip in line for skip in ['Anfangsaldo (in EUR)', 'Endsaldo (in EUR)', 'Datum', 'Valuta',
-                                               'Buchungsinformationen', 'Umsatz EUR', 'Seite', 'UC eBanking',
-                                               'Version', 'UniCredit', 'Gedruckt', 'Erzeugt', 'Auszug Nr']):
-                continue
+# Prüfreihenfolge: BW-Bank zuerst, das ist der Normalfall
+register_format(BankFormat("bwbank", "BW Bank", sniff_bwbank, parse_bwbank, is_bwbank_file))
+register_format(SPARKASSE)
 
-            # Check if line starts with a date (DD.MM.YYYY)
-            date_match = re.match(r'^(\d{2}\.\d{2}\.\d{4})\s+(\d{2}\.\d{2}\.\d{4})\s+(.+)', line)
-
-            if date_match:
-                # Save previous transaction if exists
-                if current_tx:
-                    current_tx["description"] = " ".join(description_lines).strip()
-                    transactions.append(current_tx)
-
-                # Start new transaction
-                datum = date_match.group(1)
-                valuta = date_match.group(2)
-                rest = date_match.group(3)
-
-                # Try to extract amount from the end of the line
-                # Amount pattern: -?1.234,56 or -?1234,56
-                amount_match = re.search(r'(-?[\d.]+,\d{2})$', rest)
-                if amount_match:
-                    amount_str = amount_match.group(1)
-                    description_part = rest[:rest.rfind(amount_str)].strip()
-                    amount = parse_german_amount(amount_str)
-                else:
-                    description_part = rest
-                    amount = 0.0
-
-                current_tx = {
-                    "date": datum,
-                    "valueDate": valuta,
-                    "amount": amount,
-                    "counterparty": None
-                }
-                description_lines = [description_part] if description_part else []
-
-            elif current_tx is not None:
-                # Check if this line has an amount at the end (continuation with amount)
-                amount_match = re.search(r'(-?[\d.]+,\d{2})$', line)
-                if amount_match and current_tx["amount"] == 0.0:
-                    amount_str = amount_match.group(1)
-                    line_text = line[:line.rfind(amount_str)].strip()
-                    current_tx["amount"] = parse_german_amount(amount_str)
-                    if line_text:
-                        description_lines.append(line_text)
-                else:
-                    # Add to description
-                    description_lines.append(line)
-
-        # Don't forget the last transaction
-        if current_tx:
-            current_tx["description"] = " ".join(description_lines).strip()
-            transactions.append(current_tx)
-
-    # Post-process transactions
-    processed = []
-    for tx in transactions:
-        if tx["amount"] == 0.0:
-            continue
 
-        desc = tx["description"]
-
-        # Extract counterparty - usually after IBAN pattern or specific names
-        counterparty = None
-
-        # Common counterparties
-        if "HAVG" in desc:
-            counterparty = "HAVG Hausärztliche Vertragsgemeinschaft AG"
-        elif "PVS rhein-ruhr" in desc:
-            counterparty = "PVS rhein-ruhr GmbH"
-        elif "DRV" in desc or "Rentenversicherung" in desc:
-            counterparty = "Deutsche Rentenversicherung"
-        elif "Kreis Mettmann" in desc:
-            counterparty = "Kreis Mettmann"
-        elif "Landesoberkasse" in desc:
-            counterparty = "Landesoberkasse"
-        elif "Sparkasse" in desc or "WELADED1VEL" in desc:
-            counterparty = "Sparkasse Hilden-Ratingen-Velbert"
-
-        tx["counterparty"] = counterparty
-        tx["category"] = categorize_transaction(desc, counterparty, tx["amount"])
-
-        # Extract LANR for HZV
-        lanr_info = extract_lanr(desc)
-        if lanr_info:
-            tx["lanr"] = lanr_info["lanr"]
-            tx["haevgid"] = lanr_info["haevgid"]
-            tx["arzt"] = lanr_info["arzt"]
-            tx["standort"] = lanr_info["standort"]
+def extract_pdf_text(pdf_path, timer=NULL_TIMER, table_layout=True):
+    """
+    Extrahiere Transaktionen aus einem Kontoauszug-PDF. Das Format erkennt die
+    erste Seite (UnknownFormatError, wenn keins passt - weitere Seiten werden dann
+    nicht gelesen); table_layout=False erzwingt bei BW-Bank das Text-Parsing.
+    """
 
-        processed.append(tx)
+    metadata = {
+        "sourceFile": pdf_path.name,
+        "extractedAt": datetime.now().isoformat(),
+        "account": {},
+        "balances": {},
+        "summary": {},
+        "parseErrors": []
+    }
+
+    with timer.stage("open"):
+        pdf = pdfplumber.open(pdf_path)
+
+    with pdf:
+        # Seiten -> Zeilen -> Transaktionen als Stream, Nachbearbeitung als Batch
+        start = time.perf_counter()
+        extract_before = timer.elapsed("extractText")
+        first_page = read_first_page(pdf)
+        bank_format = sniff_format(first_page)
+        metadata["format"] = bank_format.name
+        raw_transactions = list(bank_format.parse(pdf, first_page, metadata, timer, table_layout))
+        # Zeilen-Parsing = Stream-Zeit ohne die darin enthaltene Textextraktion
+        extract_seconds = timer.elapsed("extractText") - extract_before
+        timer.add("parseLines", time.perf_counter() - start - extract_seconds)
+
+        processed = postprocess_transactions(raw_transactions, metadata["parseErrors"], timer)
 
     metadata["transactions"] = processed
     metadata["summary"]["transactionCount"] = len(processed)
@@ -288,49 +454,602 @@ def find_pdfs(account_folder):
         # Skip other non-statement PDFs
         if "Massekreditvertrag" in pdf_file.name or "Abrechnung" in pdf_file.name:
             continue
-        # Only include statement PDFs (contain #number)
-        if "#" in pdf_file.name and pdf_file.name.endswith(".pdf"):
+        # Only include statement PDFs (named like one of the registered formats, e.g. #number)
+        if matches_filename(pdf_file.name) and pdf_file.name.endswith(".pdf"):
             pdfs.append(pdf_file)
 
     return sorted(pdfs)
 
 
-def main():
-    print("=" * 60)
-    print("ISK PDF Extraktor - BW-Bank Tagesauszüge")
-    print("=" * 60)
+def extract_pdf_job(pdf_path, collect_metrics=False):
+    """
+    Prozess-Pool Worker: liefert (Ergebnis, Fehler, Metriken).
+    Fehler ist None oder der Traceback-Text, Metriken nur mit collect_metrics.
+    """
+    timer = StageTimer() if collect_metrics else NULL_TIMER
+    memory = AllocationPeak() if collect_metrics else nullcontext()
+    start = time.perf_counter()
+    with memory:
+        try:
+            result, error = extract_pdf_text(pdf_path, timer), None
+        except Exception:
+            result, error = None, traceback.format_exc()
+
+    metrics = None
+    if collect_metrics:
+        metrics = {
+            "file": pdf_path.name,
+            "seconds": round(time.perf_counter() - start, 6),
+            # Spitze dieses PDFs; workerPeakRssBytes gilt für den Worker-Prozess bis hierher
+            "peakAllocBytes": memory.bytes,
+            "workerPeakRssBytes": peak_rss_bytes(),
+            "failed": error is not None,
+            **timer.as_dict(),
+        }
+    return result, error, metrics
+
+
+def _extract_all(pdf_paths, workers, collect_metrics, limits=None):
+    """Liefert (Ergebnis, Fehler, Metriken, Versuche) je PDF in Eingabe-Reihenfolge"""
+    job = partial(extract_pdf_job, collect_metrics=collect_metrics)
+    if limits:
+        # Jedes PDF in einem überwachten Worker: Zeit-/Speicherlimit, Wiederholung
+        yield from supervised_map(job, pdf_paths, workers, limits, initializer=configure_extraction,
+                                  initargs=(_category_rules_file, _counterparties_file))
+        return
+
+    if workers <= 1:
+        for pdf_path in pdf_paths:
+            result, error, metrics = job(pdf_path)
+            yield result, error, metrics, {"attempts": 1, "reason": REASON_ERROR if error else None}
+        return
+
+    # pool.map liefert in Eingabe-Reihenfolge -> Ausgabe identisch zum seriellen Lauf
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure_extraction,
+                             initargs=(_category_rules_file, _counterparties_file)) as pool:
+        for result, error, metrics in pool.map(job, pdf_paths):
+            yield result, error, metrics, {"attempts": 1, "reason": REASON_ERROR if error else None}
+
+
+def run_extraction(pdf_paths, workers=1, cache=None, collect_metrics=False, digests=None,
+                   limits=None, quarantine=None):
+    """
+    Extrahiere PDFs seriell oder im Prozess-Pool - Ergebnisse immer in Eingabe-Reihenfolge.
+    Mit Cache werden nur neue oder geänderte PDFs tatsächlich geparst.
+    Mit limits läuft jedes PDF überwacht (Zeit-/Speicherlimit, eine Wiederholung);
+    mit quarantine werden dort gelistete PDFs übersprungen und neue Fehlschläge eingetragen.
+    cache und quarantine können auch Listen mit einem Eintrag je PDF sein (Batch über mehrere Fälle).
+    Liefert (Ergebnis, Fehler, Metriken) je PDF; Ergebnisse tragen den Inhalts-Hash der Datei.
+    """
+    digests = digests or [file_sha256(pdf_path) for pdf_path in pdf_paths]
+    caches = cache if isinstance(cache, list) else [cache] * len(pdf_paths)
+    quarantines = quarantine if isinstance(quarantine, list) else [quarantine] * len(pdf_paths)
+    keys = [c.key_for(p, d) if c else None for c, p, d in zip(caches, pdf_paths, digests)]
+    quarantined = [q.get(d) if q else None for q, d in zip(quarantines, digests)]
+    cached = [c.get(key) if c and entry is None else None for c, key, entry in zip(caches, keys, quarantined)]
+
+    todo = [p for p, hit, q in zip(pdf_paths, cached, quarantined) if hit is None and q is None]
+    fresh = _extract_all(todo, workers, collect_metrics, limits)
+
+    for pdf_path, digest, key, hit, entry, cache, quarantine in zip(pdf_paths, digests, keys, cached, quarantined,
+                                                                     caches, quarantines):
+        if hit is not None:
+            # Gleicher Inhalt kann unter anderem Dateinamen liegen
+            hit["sourceFile"] = pdf_path.name
+            hit["sourceFileHash"] = digest
+            yield hit, None, {"file": pdf_path.name, "cached": True} if collect_metrics else None
+            continue
+        if entry is not None:
+            yield None, f"In Quarantäne seit {entry['quarantinedAt']}: {entry['error']}", None
+            continue
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+        result, error, metrics, attempt = next(fresh)
+        if error is not None:
+            if quarantine is not None:
+                quarantine.add(digest, pdf_path.name, error, attempt["attempts"], attempt["reason"])
+            yield result, error, metrics
+            continue
+        if cache:
+            cache.put(key, pdf_path, result)
+        result["sourceFileHash"] = digest
+        yield result, error, metrics
 
-    all_results = {}
 
-    for account_id, account_info in ISK_ACCOUNTS.items():
-        print(f"\n--- {account_info['name']} ({account_id}) ---")
+def group_by_month(transactions):
+    """Transaktionen nach Buchungsmonat (YYYY-MM) gruppieren - ungültige Daten fallen heraus"""
+    by_month = {}
+    for tx in transactions:
+        date_str = tx.date
+        if date_str:
+            try:
+                dt = datetime.strptime(date_str, "%d.%m.%Y")
+                month_key = dt.strftime("%Y-%m")
+                if month_key not in by_month:
+                    by_month[month_key] = []
+                by_month[month_key].append(tx)
+            except:
+                pass
+    return by_month
+
+
+def annotate_transactions(result, account_id, account_info, source_file):
+    """Konto, Quelldatei (Name + Inhalts-Hash) und Fingerprint an jede Transaktion hängen"""
+    transactions = result.get("transactions", [])
+    for tx in transactions:
+        tx["iskAccount"] = account_id
+        tx["iskName"] = account_info["name"]
+        tx["sourceFile"] = source_file
+        tx["sourceFileHash"] = result["sourceFileHash"]
+    return fingerprint_transactions(transactions, account_id)
+
+
+def check_duplicates(dedupe, transactions, result, source_file, mode):
+    """Umsätze gegen den Duplikat-Index prüfen - liefert (behaltene Umsätze, Duplikate)"""
+    if dedupe is None:
+        return transactions, []
+    kept, duplicates = dedupe.filter(transactions, result["sourceFileHash"], source_file, mode)
+    if duplicates:
+        first = duplicates[0]["duplicateOf"]["sourceFile"]
+        action = "entfernt" if mode == "drop" else "markiert"
+        print(f"    DUPLIKAT: {len(duplicates)} Umsätze bereits aus {first} bekannt ({action})")
+    return kept, duplicates
+
+
+def month_file_path(case, account_id, month):
+    return case.output_dir / f"ISK_{account_label(case.accounts[account_id])}_{month}.json"
+
+
+def build_month_output(case, account_id, account_info, month, txs):
+    """Inhalt einer Monatsdatei ISK_<Standort>_<YYYY-MM>.json"""
+    # Calculate totals - in Cent, damit keine float-Rundungsfehler auflaufen
+    total_in = sum(t.amount_cents for t in txs if t.amount_cents > 0)
+    total_out = sum(t.amount_cents for t in txs if t.amount_cents < 0)
+
+    return {
+        "sourceFile": month_file_path(case, account_id, month).name,
+        "extractedAt": datetime.now().isoformat(),
+        "extractionMethod": "pdfplumber text extraction",
+        "account": {
+            "name": account_info["name"],
+            "kontonummer": account_id,
+            "iban": account_info["iban"],
+            "bank": account_info.get("bank", "BW Bank")
+        },
+        "period": {
+            "month": month,
+            "from": f"{month}-01",
+            "to": f"{month}-31"
+        },
+        "summary": {
+            "transactionCount": len(txs),
+            "totalInflows": cents_to_euro(total_in),
+            "totalOutflows": cents_to_euro(total_out),
+            "netChange": cents_to_euro(total_in + total_out)
+        },
+        "transactions": [tx.to_dict() for tx in sorted(txs, key=by_date)]
+    }
 
-        account_folder = RAW_DIR / account_info["folder"] / "Kontoauszüge"
-        pdfs = find_pdfs(account_folder)
 
+def account_month_files(case, account_id):
+    """Bestehende Monatsdateien eines Kontos: {Monat: Pfad}"""
+    pattern = re.compile(rf"ISK_{re.escape(account_label(case.accounts[account_id]))}_(\d{{4}}-\d{{2}})\.json")
+    months = {}
+    if case.output_dir.exists():
+        for path in case.output_dir.iterdir():
+            match = pattern.fullmatch(path.name)
+            if match:
+                months[match.group(1)] = path
+    return months
+
+
+def merge_into_month_files(case, account_id, account_info, source_files, transactions, columnar=None,
+                           columnar_dir=None):
+    """
+    Transaktionen neuer Auszüge in die Monatsdateien einarbeiten. Umsätze der
+    Quelldateien source_files werden aus allen Monatsdateien des Kontos entfernt,
+    auch aus Monaten, die ein korrigierter Auszug nicht mehr abdeckt.
+    Liefert (Monat, Datei, neue Umsätze) je geschriebenem Monat.
+    """
+    columnar_dir = columnar_dir or case.columnar_dir
+    by_month = group_by_month(transactions)
+    existing_files = account_month_files(case, account_id)
+    written = []
+    for month in sorted(set(by_month) | set(existing_files)):
+        txs = by_month.get(month, [])
+        output_file = month_file_path(case, account_id, month)
+        existing = []
+        if month in existing_files:
+            with open(output_file, encoding="utf-8") as f:
+                existing = json.load(f)["transactions"]
+
+        kept = []
+        for tx in existing:
+            if tx.get("sourceFile") not in source_files:
+                # Monatsdateien älterer Extraktor-Versionen haben nur EUR-Beträge
+                tx.setdefault("amountCents", round(tx["amount"] * 100))
+                kept.append(Transaction.from_dict(tx))
+        if not txs and len(kept) == len(existing):
+            continue
+
+        output = build_month_output(case, account_id, account_info, month, kept + txs)
+        # Atomar, weil Importer die Datei jederzeit lesen können
+        write_json_atomic(output_file, output, indent=2)
+        if columnar:
+            write_partition(columnar_dir, account_id, month, output["transactions"], columnar)
+        written.append((month, output_file, len(txs)))
+    return written
+
+
+def write_duplicates(case, duplicates, mode, replace_sources=None):
+    """
+    duplicates.json schreiben. replace_sources=None: nur die Duplikate dieses Laufs;
+    sonst an die bestehende Datei anhängen, bisherige Einträge dieser Quelldateien ersetzen.
+    """
+    entries = []
+    if replace_sources is not None and case.duplicates_file.exists():
+        try:
+            with open(case.duplicates_file, encoding="utf-8") as f:
+                entries = json.load(f)["transactions"]
+        except (OSError, ValueError, KeyError):
+            entries = []
+        entries = [tx for tx in entries if tx.get("sourceFile") not in replace_sources]
+    entries.extend(duplicates)
+    write_json_atomic(case.duplicates_file, {
+        "generatedAt": datetime.now().isoformat(),
+        "mode": mode,
+        "count": len(entries),
+        "transactions": entries,
+    }, indent=2)
+
+
+def refresh_month_aggregates(case, months, args):
+    """HZV-Rollups und Ist-Zellen des Plan-/Ist-Abgleichs der geänderten Monate neu aufbauen"""
+    rollup = HzvRollup.load(case.rollup_file)
+    rollup.drop_months(months)
+    actuals = load_actuals(case.variance_file)
+    actuals.drop_months(months)
+    for month in months:
+        for account_id in case.accounts:
+            month_file = month_file_path(case, account_id, month)
+            if month_file.exists():
+                with open(month_file, encoding="utf-8") as f:
+                    transactions = json.load(f)["transactions"]
+                rollup.add_dicts(transactions)
+                actuals.add_dicts(transactions)
+    rollup.save(case.rollup_file, case.case_number)
+    print_variance(write_variance(case, actuals, args), case.variance_file)
+
+
+def write_variance(case, actuals, args):
+    """Plan-/Ist-Abgleich je (Monat, Kategorie, Standort) schreiben; ohne Planungsdatei None"""
+    if case.plan_file is None or not case.plan_file.exists():
+        return None
+    plan_cells, plan_lines, months = load_plan_cells(case.plan_file)
+    threshold_cents = round(args.variance_threshold * 100)
+    rows = compare(actuals, plan_cells, plan_lines, months, threshold_cents, args.variance_percent)
+    save_report(case.variance_file, case.case_number, case.plan_file, rows, actuals,
+                threshold_cents, args.variance_percent)
+    return rows
+
+
+def print_variance(rows, report_file):
+    if rows is None:
+        return
+    flagged = [row for row in rows if row["flagged"]]
+    print(f"\nPlan/Ist: {len(rows)} Zellen, {len(flagged)} über der Schwelle ({report_file.name})")
+    for row in flagged:
+        percent = f" ({row['abweichungProzent']:+.1f} %)" if row["abweichungProzent"] is not None else ""
+        print(f"  {row['month']} {row['category']} {row['standort']}: IST {row['ist']:,.2f} / "
+              f"PLAN {row['plan']:,.2f} EUR, Abweichung {row['abweichung']:+,.2f}{percent}")
+
+
+def print_reconciliation(reconciliation, report_file):
+    summary = reconciliation["summary"]
+    print(f"\nSaldenabgleich: {summary['ok']}/{summary['statements']} Auszüge OK, "
+          f"{summary['mismatches']} Differenzen, {summary['missingBalances']} ohne Saldo, "
+          f"{summary['chainIssues']} Lücken/Brüche ({report_file.name})")
+    for statement in reconciliation["statements"]:
+        if statement["status"] != STATUS_OK:
+            difference = statement["differenceCents"]
+            detail = f"{cents_to_euro(difference):,.2f} EUR" if difference is not None else "Saldo fehlt"
+            print(f"  {statement['status']}: {statement['sourceFile']} ({detail})")
+    for issue in reconciliation["chain"]:
+        print(f"  {issue['issue']}: Konto {issue['account']} "
+              f"{ {k: v for k, v in issue.items() if k not in ('account', 'issue')} }")
+
+
+def load_into_ledger(db_path, transactions, case):
+    """Bulk-Upsert in ledger_entries mit Zusammenfassung (markierte Duplikate werden nicht geladen)"""
+    rows = [tx for tx in transactions if tx.duplicate_of is None]
+    try:
+        stats = load_transactions(db_path, rows, case.case_number, case.accounts)
+    except (LedgerLoadError, sqlite3.Error) as e:
+        raise SystemExit(f"Ledger-Import fehlgeschlagen: {e}")
+
+    print(f"Ledger ({db_path.name}): {stats['rows']} Zeilen, {stats['inserted']} neu, "
+          f"{stats['updated']} aktualisiert in {stats['seconds'] * 1000:.0f} ms")
+    if stats["unmatchedAccounts"]:
+        print(f"  WARNUNG kein Bankkonto gefunden für: {', '.join(stats['unmatchedAccounts'])}")
+    return stats
+
+
+def watch_statements(args, runs, limits):
+    """Kontoauszug-Ordner aller Fälle überwachen und neue Auszüge einzeln einarbeiten (bis Ctrl+C)"""
+    folders = {
+        run.case.statement_folder(info): (index, account_id, info)
+        for index, run in enumerate(runs) for account_id, info, _ in run.accounts
+    }
+    watcher = StatementWatcher(folders, find_pdfs, interval=args.poll_interval,
+                               use_notifications=not args.polling)
+    watcher.baseline([pdf for run in runs for pdf in run.pdfs])
+    print(f"\nWatch-Modus ({watcher.mode}) - Beenden mit Ctrl+C")
+
+    try:
+        for batch in watcher.batches():
+            start = time.perf_counter()
+            owners = [folders[next(folder for folder in folders if folder in pdf_path.parents)] for pdf_path in batch]
+            results = run_extraction(batch, 1, [runs[index].cache for index, _, _ in owners], limits=limits,
+                                     quarantine=[runs[index].quarantine for index, _, _ in owners])
+            by_account = {}
+            duplicates = {}
+            for pdf_path, (index, account_id, account_info), (result, error, _) in zip(batch, owners, results):
+                if error:
+                    print(f"  FEHLER bei {pdf_path.name}: {error.strip().splitlines()[-1]}")
+                    continue
+                dedupe = runs[index].dedupe
+                txs = annotate_transactions(result, account_id, account_info, pdf_path.name)
+                if dedupe:
+                    # Geänderter Auszug ersetzt seine alte Fassung, ist also kein Duplikat davon
+                    dedupe.forget_file(pdf_path.name)
+                txs, file_duplicates = check_duplicates(dedupe, txs, result, pdf_path.name, args.duplicates)
+                if dedupe:
+                    sources, entries = duplicates.setdefault(index, (set(), []))
+                    sources.add(pdf_path.name)
+                    entries.extend(file_duplicates)
+                txs = to_records(txs)
+                account = by_account.setdefault((index, account_id), (account_info, set(), []))
+                account[1].add(pdf_path.name)
+                account[2].extend(txs)
+                print(f"  Neu: {pdf_path.name}: {len(txs)} Transaktionen")
+
+            changed_months = {}
+            for (index, account_id), (account_info, source_files, txs) in by_account.items():
+                case = runs[index].case
+                months = changed_months.setdefault(index, set())
+                for month, output_file, count in merge_into_month_files(case, account_id, account_info, source_files,
+                                                                        txs, args.columnar, args.columnar_dir):
+                    print(f"  Aktualisiert: {output_file.name} (+{count})")
+                    months.add(month)
+                if args.sqlite:
+                    load_into_ledger(args.sqlite, txs, case)
+            for index, (sources, entries) in duplicates.items():
+                write_duplicates(runs[index].case, entries, args.duplicates, replace_sources=sources)
+            for index, months in changed_months.items():
+                if months:
+                    refresh_month_aggregates(runs[index].case, months, args)
+            for index in sorted({index for index, _, _ in owners}):
+                run = runs[index]
+                if run.cache:
+                    run.cache.finalize(evict_unused=False)
+                if run.dedupe:
+                    run.dedupe.save()
+                run.quarantine.save()
+            print(f"  {len(batch)} PDF(s) in {time.perf_counter() - start:.2f}s eingearbeitet")
+    except KeyboardInterrupt:
+        print("\nWatch-Modus beendet")
+    finally:
+        watcher.stop()
+
+
+def profile_slowest(file_metrics, pdf_paths, count, profile_dir):
+    """Die langsamsten frisch geparsten PDFs erneut unter cProfile laufen lassen"""
+    by_name = {pdf_path.name: pdf_path for pdf_path in pdf_paths}
+    slowest = sorted((m for m in file_metrics if not m.get("cached") and not m.get("failed")),
+                     key=lambda m: m["seconds"], reverse=True)[:count]
+
+    os.makedirs(profile_dir, exist_ok=True)
+    dumps = []
+    for entry in slowest:
+        profiler = cProfile.Profile()
+        profiler.runcall(extract_pdf_text, by_name[entry["file"]])
+        dump_path = profile_dir / (Path(entry["file"]).stem + ".prof")
+        profiler.dump_stats(dump_path)
+        entry["profile"] = str(dump_path)
+        dumps.append(dump_path)
+    return dumps
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ISK PDF Extraktor - BW-Bank Tagesauszüge")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Anzahl paralleler Prozesse (1 = seriell, 0 = alle CPU-Kerne)"
+    )
+    parser.add_argument(
+        "--cases", type=Path, nargs="?", const=CASES_FILE, metavar="CONFIG",
+        help=f"Alle aktiven Fälle und Konten aus der Konfiguration in einem Lauf (Standard: {CASES_FILE.name})"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path,
+        help="Verzeichnis des Extraktions-Caches (Default: 02-extracted/.extract-cache des Falls)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Cache ignorieren und alle PDFs neu parsen"
+    )
+    parser.add_argument(
+        "--columnar", choices=COLUMNAR_FORMATS,
+        help="Zusätzlich spaltenorientierte Ausgabe je Konto und Monat (ndjson oder parquet)"
+    )
+    parser.add_argument(
+        "--columnar-dir", type=Path,
+        help="Zielverzeichnis der Spaltenablage (Default: 02-extracted/columnar, nicht mit --cases)"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true",
+        help="Stufen-Zeiten je PDF/Seite messen und nach 02-extracted/extraction-metrics.json schreiben"
+    )
+    parser.add_argument(
+        "--profile-slowest", type=int, default=0, metavar="N",
+        help="Die N langsamsten PDFs zusätzlich unter cProfile laufen lassen (impliziert --metrics)"
+    )
+    parser.add_argument(
+        "--duplicates", choices=DUPLICATE_MODES, default="drop",
+        help="Umsätze, die schon aus einem anderen Auszug bekannt sind: entfernen (Standard) oder nur markieren"
+    )
+    parser.add_argument(
+        "--dedupe-index", type=Path,
+        help="Persistenter Fingerprint-Index (Standard: 02-extracted/.dedupe-index.json, nicht mit --cases)"
+    )
+    parser.add_argument(
+        "--no-dedupe", action="store_true",
+        help="Keine Duplikat-Prüfung über Auszüge hinweg"
+    )
+    parser.add_argument(
+        "--sqlite", type=Path, nargs="?", const=DEV_DB, metavar="DB",
+        help=f"Transaktionen zusätzlich per Upsert in ledger_entries laden (Standard-DB: {DEV_DB})"
+    )
+    parser.add_argument(
+        "--case-number",
+        help=f"Aktenzeichen des Falls für den Ledger-Import (Standard: {CASE_NUMBER}, mit --cases aus der Konfiguration)"
+    )
+    parser.add_argument(
+        "--plan", type=Path,
+        help=f"Planung (JSON mit monate) für den Plan-/Ist-Abgleich (Standard: {PLAN_FILE.name}, "
+             "mit --cases planFile aus der Konfiguration)"
+    )
+    parser.add_argument(
+        "--variance-threshold", type=float, default=DEFAULT_THRESHOLD_CENTS / 100, metavar="EUR",
+        help=f"Plan/Ist: Abweichungen ab diesem Betrag markieren (Standard: {DEFAULT_THRESHOLD_CENTS / 100:.0f})"
+    )
+    parser.add_argument(
+        "--variance-percent", type=float, default=DEFAULT_THRESHOLD_PERCENT, metavar="PROZENT",
+        help=f"Plan/Ist: und ab dieser Abweichung vom Planwert (Standard: {DEFAULT_THRESHOLD_PERCENT:.0f})"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Nach dem Lauf die Kontoauszug-Ordner überwachen und neue Auszüge in die Monatsdateien einarbeiten"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=2.0, metavar="SEKUNDEN",
+        help="Watch-Modus: Abgleich-Intervall beim Polling bzw. Wartezeit bis eine neue Datei als fertig gilt"
+    )
+    parser.add_argument(
+        "--polling", action="store_true",
+        help="Watch-Modus: immer pollen, auch wenn watchdog installiert ist"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=PDF_TIMEOUT_SECONDS, metavar="SEKUNDEN",
+        help=f"Zeitlimit je PDF, danach wird der Worker beendet (Standard: {PDF_TIMEOUT_SECONDS}, 0 = ohne)"
+    )
+    parser.add_argument(
+        "--memory-limit", type=int, default=PDF_MEMORY_LIMIT_MB, metavar="MB",
+        help=f"Speicherlimit (RSS) je Worker-Prozess, darüber wird der Worker beendet "
+             f"(Standard: {PDF_MEMORY_LIMIT_MB}, 0 = ohne)"
+    )
+    parser.add_argument(
+        "--retry-quarantined", action="store_true",
+        help="PDFs aus der Quarantäne (02-extracted/failures.json) erneut versuchen"
+    )
+    parser.add_argument(
+        "--category-rules", type=Path, default=CATEGORY_RULES_FILE,
+        help="JSON-Datei mit Kategorie-Regeln (Default: scripts/isk-category-rules.json)"
+    )
+    parser.add_argument(
+        "--counterparties", type=Path, default=COUNTERPARTIES_FILE,
+        help="JSON-Datei mit Gegenparteien (Default: scripts/isk-counterparties.json)"
+    )
+    args = parser.parse_args()
+    if args.cases:
+        # Diese Pfade/Werte gehören zu genau einem Fall
+        for option in ("columnar_dir", "dedupe_index", "case_number", "plan"):
+            if getattr(args, option) is not None:
+                parser.error(f"--{option.replace('_', '-')} ist mit --cases nicht möglich")
+    return args
+
+
+def collect_accounts(case):
+    """Auszug-PDFs je Konto eines Falls: [(Kontonummer, Kontodaten, PDFs)]"""
+    return [(account_id, info, find_pdfs(case.statement_folder(info))) for account_id, info in case.accounts.items()]
+
+
+def prepare_case_run(args, case, caches, cache_version):
+    """PDFs, Inhalts-Hashes, Cache, Duplikat-Index und Quarantäne eines Falls"""
+    os.makedirs(case.output_dir, exist_ok=True)
+    accounts = collect_accounts(case)
+    pdfs = [pdf for _, _, account_pdfs in accounts for pdf in account_pdfs]
+    digests = [file_sha256(pdf_path) for pdf_path in pdfs]
+
+    # Ein Cache je Verzeichnis - bei gemeinsamem --cache-dir teilen sich die Fälle einen
+    cache = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or case.cache_dir
+        cache = caches.setdefault(cache_dir, ExtractionCache(cache_dir, cache_version))
+
+    dedupe = None if args.no_dedupe else DedupeIndex(args.dedupe_index or case.dedupe_index_file)
+    if dedupe:
+        # Quellen, die es nicht mehr (unter diesem Namen) gibt, zählen nicht mehr als Erstquelle
+        dedupe.prune({(digest, pdf_path.name) for digest, pdf_path in zip(digests, pdfs)})
+
+    quarantine = Quarantine(case.failures_file)
+    if args.retry_quarantined:
+        quarantine.clear()
+    quarantine.prune(set(digests))
+
+    size = sum(pdf_path.stat().st_size for pdf_path in pdfs)
+    return CaseRun(case, accounts, pdfs, digests, size, cache, dedupe, quarantine)
+
+
+def process_case(args, run, results, workers, run_start, collect_metrics):
+    """Ergebnisse eines Falls (in PDF-Reihenfolge aus results) auswerten und nach 02-extracted schreiben"""
+    case = run.case
+    run_timer = StageTimer() if collect_metrics else NULL_TIMER
+    columnar_dir = args.columnar_dir or case.columnar_dir
+    dedupe = run.dedupe
+    quarantine = run.quarantine
+
+    all_results = {}
+    file_metrics = []
+    duplicates = []
+    statement_rows = []
+    rollup = HzvRollup()
+    actuals = ActualCells()
+
+    for account_id, account_info, pdfs in run.accounts:
+        print(f"\n--- {account_info['name']} ({account_id}) ---")
         print(f"Gefunden: {len(pdfs)} PDFs")
 
         account_transactions = []
 
         for pdf_path in pdfs:
-            try:
-                result = extract_pdf_text(pdf_path)
-                tx_count = len(result.get('transactions', []))
-                print(f"  {pdf_path.name}: {tx_count} Transaktionen")
-
-                # Add account info to each transaction
-                for tx in result.get("transactions", []):
-                    tx["iskAccount"] = account_id
-                    tx["iskName"] = account_info["name"]
-                    tx["sourceFile"] = pdf_path.name
-                    account_transactions.append(tx)
-
-            except Exception as e:
-                print(f"  FEHLER bei {pdf_path.name}: {e}")
-                import traceback
-                traceback.print_exc()
+            result, error, metrics = next(results)
+            if metrics:
+                file_metrics.append(metrics)
+            if error:
+                print(f"  FEHLER bei {pdf_path.name}: {error.strip().splitlines()[-1]}")
+                if "\n" in error.strip():
+                    print(error)
+                continue
+
+            tx_count = len(result.get('transactions', []))
+            print(f"  {pdf_path.name}: {tx_count} Transaktionen")
+            for parse_error in result.get("parseErrors", []):
+                print(f"    WARNUNG {parse_error['error']}: {parse_error.get('amountText')!r} "
+                      f"({parse_error.get('date') or parse_error.get('field')})")
+
+            statement_rows.append(statement_row(result, account_id, pdf_path.name))
+
+            # Add account info to each transaction
+            txs = annotate_transactions(result, account_id, account_info, pdf_path.name)
+            txs, file_duplicates = check_duplicates(dedupe, txs, result, pdf_path.name, args.duplicates)
+            duplicates.extend(file_duplicates)
+            # Ab hier kompakte Datensätze statt Dicts - JSON erst bei der Ausgabe
+            records = to_records(txs)
+            account_transactions.extend(records)
+            with run_timer.stage("rollups"):
+                rollup.add(records)
+            with run_timer.stage("variance"):
+                actuals.add(records)
 
         all_results[account_id] = {
             "account": account_info,
@@ -338,66 +1057,138 @@ def main():
             "transactions": account_transactions
         }
 
+    quarantine.save()
+    if len(quarantine):
+        print(f"\nQuarantäne: {len(quarantine)} PDF(s) in {case.failures_file}")
+        for entry in quarantine.files.values():
+            print(f"  {entry['sourceFile']}: {entry['reason']} nach {entry['attempts']} Versuch(en) - {entry['error']}")
+
+    with run_timer.stage("reconcile"):
+        reconciliation = reconcile_statements(statement_rows)
+    write_json_atomic(case.reconciliation_file, reconciliation, indent=2)
+    print_reconciliation(reconciliation, case.reconciliation_file)
+
+    if dedupe:
+        dedupe.save()
+        write_duplicates(case, duplicates, args.duplicates)
+        print(f"Duplikate: {len(duplicates)} ({args.duplicates}), Index mit {len(dedupe)} Fingerprints")
+
+    if args.columnar:
+        write_schema(columnar_dir, args.columnar)
+
     # Group by month and save
     for account_id, data in all_results.items():
-        by_month = {}
-        for tx in data["transactions"]:
-            date_str = tx.get("date", "")
-            if date_str:
-                try:
-                    dt = datetime.strptime(date_str, "%d.%m.%Y")
-                    month_key = dt.strftime("%Y-%m")
-                    if month_key not in by_month:
-                        by_month[month_key] = []
-                    by_month[month_key].append(tx)
-                except:
-                    pass
-
-        account_name = "Uckerath" if account_id == "400080156" else "Velbert"
+        by_month = group_by_month(data["transactions"])
 
         for month, txs in sorted(by_month.items()):
-            # Calculate totals
-            total_in = sum(t["amount"] for t in txs if t["amount"] > 0)
-            total_out = sum(t["amount"] for t in txs if t["amount"] < 0)
-
-            output = {
-                "sourceFile": f"ISK_{account_name}_{month}.json",
-                "extractedAt": datetime.now().isoformat(),
-                "extractionMethod": "pdfplumber text extraction",
-                "account": {
-                    "name": data["account"]["name"],
-                    "kontonummer": account_id,
-                    "iban": data["account"]["iban"],
-                    "bank": "BW Bank"
-                },
-                "period": {
-                    "month": month,
-                    "from": f"{month}-01",
-                    "to": f"{month}-31"
-                },
-                "summary": {
-                    "transactionCount": len(txs),
-                    "totalInflows": round(total_in, 2),
-                    "totalOutflows": round(total_out, 2),
-                    "netChange": round(total_in + total_out, 2)
-                },
-                "transactions": sorted(txs, key=lambda x: x.get("date", ""))
-            }
+            output = build_month_output(case, account_id, data["account"], month, txs)
 
             # Save JSON
-            output_file = OUTPUT_DIR / f"ISK_{account_name}_{month}.json"
-            with open(output_file, "w", encoding="utf-8") as f:
+            output_file = month_file_path(case, account_id, month)
+            with run_timer.stage("writeJson"), open(output_file, "w", encoding="utf-8") as f:
                 json.dump(output, f, ensure_ascii=False, indent=2)
 
             print(f"\nGespeichert: {output_file.name}")
+            if args.columnar:
+                with run_timer.stage("writeColumnar"):
+                    partition = write_partition(columnar_dir, account_id, month,
+                                                output["transactions"], args.columnar)
+                print(f"  Spaltenablage: {partition.relative_to(columnar_dir)}")
             print(f"  Transaktionen: {len(txs)}")
-            print(f"  Einnahmen: {total_in:,.2f} EUR")
-            print(f"  Ausgaben: {total_out:,.2f} EUR")
+            print(f"  Einnahmen: {output['summary']['totalInflows']:,.2f} EUR")
+            print(f"  Ausgaben: {output['summary']['totalOutflows']:,.2f} EUR")
+
+    with run_timer.stage("rollups"):
+        rollup.save(case.rollup_file, case.case_number)
+    print(f"\nHZV-Rollups: {len(rollup)} Zellen (Monat/Standort/LANR/Kategorie) in {case.rollup_file.name}")
+
+    with run_timer.stage("variance"):
+        variance = write_variance(case, actuals, args)
+    print_variance(variance, case.variance_file)
+
+    if args.sqlite:
+        print()
+        with run_timer.stage("loadLedger"):
+            load_into_ledger(args.sqlite, [tx for data in all_results.values() for tx in data["transactions"]], case)
+
+    if collect_metrics:
+        wall_seconds = time.perf_counter() - run_start
+        if args.profile_slowest:
+            dumps = profile_slowest(file_metrics, run.pdfs, args.profile_slowest, case.profile_dir)
+            print(f"\ncProfile: {len(dumps)} Dumps in {case.profile_dir}")
+        write_report(case.metrics_file, build_report(file_metrics, run_timer, workers, wall_seconds))
+        print(f"Metriken: {case.metrics_file}")
+
+
+def main():
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    collect_metrics = args.metrics or args.profile_slowest > 0
+    run_start = time.perf_counter()
+    configure_extraction(args.category_rules, args.counterparties)
+
+    print("=" * 60)
+    print("ISK PDF Extraktor - BW-Bank Tagesauszüge")
+    print("=" * 60)
+
+    # Einmal im Hauptprozess, damit Regeln, die hier nicht greifen können, auffallen
+    for name, reason in get_category_engine().skipped:
+        print(f"WARNUNG Kategorie-Regel {name!r} übersprungen: {reason}")
+
+    try:
+        cases = (load_cases(args.cases) if args.cases
+                 else [default_case(args.case_number or CASE_NUMBER, args.plan or PLAN_FILE)])
+    except CaseConfigError as e:
+        raise SystemExit(str(e))
+
+    # Geänderte Regeln/Stammdaten ändern die Ergebnisse -> eigener Cache-Bereich
+    cache_version = f"{EXTRACTOR_VERSION}-{configuration_digest()}"
+    caches = {}
+    runs = [prepare_case_run(args, case, caches, cache_version) for case in cases]
+
+    # Große Fälle zuerst: ihre PDFs stehen vorn in der gemeinsamen Warteschlange
+    runs.sort(key=lambda run: run.size, reverse=True)
+    if len(runs) > 1:
+        print(f"{len(runs)} Fälle, {sum(len(run.pdfs) for run in runs)} PDFs:")
+        for run in runs:
+            print(f"  {run.case.name} ({run.case.case_number}): {len(run.pdfs)} PDFs, {run.size / 1e6:.1f} MB")
+
+    if workers > 1:
+        print(f"Parallele Extraktion mit {workers} Prozessen")
+
+    for run in runs:
+        if len(run.quarantine):
+            print(f"Quarantäne: {len(run.quarantine)} PDF(s) werden übersprungen ({run.case.failures_file})")
+
+    # Jedes PDF überwacht (eine Wiederholung), ohne Grenzen wie bisher direkt im Pool
+    limits = Limits(args.timeout, args.memory_limit, 1) if args.timeout or args.memory_limit else None
+
+    # PDFs aller Fälle und Konten in einer Warteschlange, damit der Pool über Fall-/Kontogrenzen verteilt
+    all_pdfs = [pdf for run in runs for pdf in run.pdfs]
+    results = run_extraction(
+        all_pdfs, workers,
+        [run.cache for run in runs for _ in run.pdfs], collect_metrics,
+        [digest for run in runs for digest in run.digests], limits,
+        [run.quarantine for run in runs for _ in run.pdfs],
+    )
+
+    for run in runs:
+        if len(runs) > 1:
+            print(f"\n{'=' * 60}\nFall: {run.case.name} ({run.case.case_number}) -> {run.case.output_dir}")
+        process_case(args, run, results, workers, run_start, collect_metrics)
+
+    for cache_dir, cache in caches.items():
+        stats = cache.finalize()
+        print(f"\nCache: {stats['hits']} Treffer, {stats['misses']} neu geparst, "
+              f"{stats['evictions']} entfernt ({cache_dir / 'manifest.json'})")
 
     print("\n" + "=" * 60)
     print("Extraktion abgeschlossen!")
     print("=" * 60)
 
+    if args.watch:
+        watch_statements(args, runs, limits)
+
 
 if __name__ == "__main__":
     main()
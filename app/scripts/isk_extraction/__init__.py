@@ -0,0 +1,6 @@
+"""
+Hilfsmodule für den ISK PDF Extraktor (scripts/extract-isk-pdfs.py).
+
+Das Skript selbst bleibt der Einstiegspunkt; hier liegen die Bausteine,
+die unabhängig vom PDF-Parsing wiederverwendbar sind.
+"""
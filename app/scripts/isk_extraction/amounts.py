@@ -0,0 +1,83 @@
+"""
+Exakte Betragsverarbeitung in Cent.
+
+Deutsche Beträge ("1.234,56", "-88.052,96", "+5,00") werden ohne Umweg über
+float in ganze Cent umgerechnet - wie amountCents in der App. Ungültige
+Eingaben werden gemeldet statt stillschweigend zu 0 zu werden.
+
+    parse_amount_cents("1.234,56")              -> 123456
+    parse_amounts_cents(["1,00", "x", "-2,50"]) -> ([100, None, -250], [(1, "x")])
+"""
+
+import re
+
+# Vorzeichen, Tausenderpunkte nur in korrekten 3er-Gruppen, genau zwei Nachkommastellen
+AMOUNT_RE = re.compile(r'[-+]?(?:\d{1,3}(?:\.\d{3})+|\d+),\d{2}')
+
+# Eine ganze Spalte, zeilenweise verbunden - validiert in einem einzigen Regex-Lauf
+_COLUMN_RE = re.compile(r'(?:%s\n)*' % AMOUNT_RE.pattern)
+
+_DROP_SEPARATORS = str.maketrans("", "", ".,")
+
+
+class AmountParseError(ValueError):
+    """Betrag entspricht nicht dem deutschen Format -?1.234,56"""
+
+    def __init__(self, value):
+        super().__init__(f"Ungültiger Betrag: {value!r}")
+        self.value = value
+
+
+def parse_amount_cents(value):
+    """Deutscher Betrag -> int Cent; wirft AmountParseError bei ungültiger Eingabe"""
+    text = value.strip() if isinstance(value, str) else None
+    if not text or not AMOUNT_RE.fullmatch(text):
+        raise AmountParseError(value)
+    return int(text.translate(_DROP_SEPARATORS))
+
+
+def parse_amounts_cents(values):
+    """
+    Bulk-Variante für eine ganze Spalte.
+
+    Liefert (cents, failures): cents enthält None an ungültigen Positionen,
+    failures die Liste (index, rohwert) aller Fehler.
+    """
+    values = list(values)
+    if not values:
+        return [], []
+
+    # Schneller Pfad: Spalte einmal validieren und in einem Rutsch umrechnen
+    try:
+        joined = "\n".join(values) + "\n"
+    except TypeError:
+        joined = None
+    if joined is not None and _COLUMN_RE.fullmatch(joined):
+        cents = list(map(int, joined.translate(_DROP_SEPARATORS).split()))
+        if len(cents) == len(values):
+            return cents, []
+
+    # Langsamer Pfad nur bei fehlerhaften Werten: Fehler einzeln lokalisieren
+    fullmatch = AMOUNT_RE.fullmatch
+    cents = []
+    failures = []
+    for index, value in enumerate(values):
+        text = value.strip() if isinstance(value, str) else None
+        if text and fullmatch(text):
+            cents.append(int(text.translate(_DROP_SEPARATORS)))
+        else:
+            cents.append(None)
+            failures.append((index, value))
+    return cents, failures
+
+
+def cents_to_euro(cents):
+    """int Cent -> float EUR für Ausgabeformate, die Euro erwarten"""
+    return cents / 100
+
+
+def format_cents(cents):
+    """int Cent -> deutscher Betrag ("-1.234,56")"""
+    sign = "-" if cents < 0 else ""
+    euros, rest = divmod(abs(cents), 100)
+    return f"{sign}{euros:,}".replace(",", ".") + f",{rest:02d}"
@@ -0,0 +1,79 @@
+"""
+Aho-Corasick Automat für die Suche vieler Literale in einem Durchgang.
+
+Die Kosten eines Scans wachsen mit der Textlänge, nicht mit der Anzahl der
+Muster. Der Automat wird beim Aufbau zu einer vollständigen Übergangstabelle
+(DFA) aufgelöst, damit der Scan pro Zeichen nur einen Dict-Lookup braucht.
+"""
+
+from collections import deque
+
+
+class Automaton:
+    """Multi-Pattern Matcher: add() Muster, build(), dann find_all() / iter_matches()"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._out = [[]]
+        self._delta = None
+        self.pattern_count = 0
+
+    def add(self, pattern, value):
+        """Registriert ein Muster; value wird bei jedem Treffer zurückgegeben"""
+        if not pattern:
+            raise ValueError("Leeres Muster ist nicht erlaubt")
+        if self._delta is not None:
+            raise RuntimeError("Automat ist bereits gebaut")
+
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), value))
+        self.pattern_count += 1
+
+    def build(self):
+        goto = self._goto
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+
+        # Breitensuche: Fail-Links und Ausgaben entlang der Fail-Kette vererben
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            queue.extend(goto[state].values())
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[fail[nxt]]
+
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        # Zustände ohne Ausgabe als None, damit der Scan nur einen Truth-Test braucht
+        self._out = [tuple(out) if out else None for out in self._out]
+        self._delta = delta
+        return self
+
+    def iter_matches(self, text):
+        """Liefert (start, end, value) für jeden Treffer; end ist exklusiv"""
+        delta = self._delta
+        out = self._out
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state] is not None:
+                for length, value in out[state]:
+                    yield i + 1 - length, i + 1, value
+
+    def find_all(self, text):
+        return list(self.iter_matches(text))
@@ -0,0 +1,126 @@
+"""
+Persistenter Extraktions-Cache.
+
+Kontoauszüge ändern sich nach Ausstellung nicht mehr. Das Ergebnis von
+extract_pdf_text() wird deshalb unter dem SHA-256 des Dateiinhalts plus
+Extraktor-Version abgelegt. Ein erneuter Lauf parst nur neue oder geänderte PDFs.
+
+Layout:
+    <cache_dir>/manifest.json          Einträge + Statistik des letzten Laufs
+    <cache_dir>/<version>/<sha256>.json
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 des Dateiinhalts (unabhängig vom Dateinamen)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Schreibt JSON über eine temporäre Datei, damit abgebrochene Läufe nichts zerstören"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+
+class ExtractionCache:
+    """Content-addressierter Cache für geparste PDF-Ergebnisse"""
+
+    def __init__(self, cache_dir, extractor_version):
+        self.cache_dir = Path(cache_dir)
+        self.version = str(extractor_version)
+        self.entry_dir = self.cache_dir / self.version
+        self.entry_dir.mkdir(parents=True, exist_ok=True)
+
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        self.entries = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                # Defektes Manifest -> Cache gilt als leer, Dateien werden neu geschrieben
+                self.entries = {}
+
+        self.used_keys = set()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def key_for(self, pdf_path, digest=None):
+        return f"{self.version}:{digest or file_sha256(pdf_path)}"
+
+    def _entry_path(self, key):
+        version, sha = key.split(":", 1)
+        return self.cache_dir / version / f"{sha}.json"
+
+    def get(self, key):
+        """Liefert das gecachte Ergebnis oder None (zählt Hit/Miss)"""
+        self.used_keys.add(key)
+        entry_path = self._entry_path(key)
+        if key in self.entries and entry_path.exists():
+            try:
+                with open(entry_path, encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                self.stats["hits"] += 1
+                self.entries[key]["lastUsedAt"] = datetime.now().isoformat()
+                return result
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key, pdf_path, result):
+        self.used_keys.add(key)
+        write_json_atomic(self._entry_path(key), result)
+        now = datetime.now().isoformat()
+        self.entries[key] = {
+            "sourceFile": Path(pdf_path).name,
+            "extractorVersion": self.version,
+            "cachedAt": now,
+            "lastUsedAt": now,
+        }
+
+    def finalize(self, evict_unused=True):
+        """
+        Räumt veraltete Einträge auf und schreibt das Manifest.
+
+        Entfernt werden Einträge anderer Extraktor-Versionen und - bei einem
+        vollständigen Lauf - Einträge, deren PDF nicht mehr (unverändert) existiert.
+        """
+        for key in list(self.entries):
+            stale_version = not key.startswith(self.version + ":")
+            if stale_version or (evict_unused and key not in self.used_keys):
+                entry_path = self._entry_path(key)
+                if entry_path.exists():
+                    entry_path.unlink()
+                del self.entries[key]
+                self.stats["evictions"] += 1
+
+        # Verzeichnisse alter Extraktor-Versionen komplett entfernen
+        for child in self.cache_dir.iterdir():
+            if child.is_dir() and child.name != self.version:
+                shutil.rmtree(child, ignore_errors=True)
+
+        manifest = {
+            "extractorVersion": self.version,
+            "updatedAt": datetime.now().isoformat(),
+            "lastRun": dict(self.stats, entries=len(self.entries)),
+            "entries": self.entries,
+        }
+        write_json_atomic(self.manifest_path, manifest, indent=2)
+        return manifest["lastRun"]
@@ -0,0 +1,132 @@
+"""
+Fälle und Konten für Batch-Läufe über mehrere Insolvenzverfahren.
+
+Ein Fall bündelt Aktenzeichen, Rohdaten-Ordner, Ausgabeordner (02-extracted)
+und die Bankkonten, deren Auszüge unter <rawDir>/<folder>/Kontoauszüge liegen.
+Die Konfiguration ist JSON wie die Regel- und Stammdatendateien:
+
+    {
+      "casesRoot": "/Users/.../Cases",
+      "cases": [
+        {
+          "name": "Hausärztliche Versorgung PLUS eG",
+          "caseNumber": "70d IN 362/25",
+          "caseDir": "Hausärztliche Versorgung PLUS eG",
+          "rawDir": "01-raw/...",
+          "active": true,
+          "accounts": {"400080156": {"name": "ISK Uckerath", "iban": "...", "folder": "..."}}
+        }
+      ]
+    }
+
+caseDir ist relativ zu casesRoot, rawDir, outputDir und planFile relativ zu
+caseDir; outputDir ist standardmäßig 02-extracted. Mit planFile (Planung mit
+monate) wird nach der Extraktion der Plan-/Ist-Abgleich geschrieben. Fälle mit "active": false werden
+übersprungen.
+"""
+
+import json
+from pathlib import Path
+
+OUTPUT_FOLDER = "02-extracted"
+STATEMENT_FOLDER = "Kontoauszüge"
+
+
+class CaseConfigError(Exception):
+    """Fall-Konfiguration unvollständig oder fehlerhaft"""
+
+
+class Case:
+    """Ein Fall mit seinen Konten und den Ausgabepfaden in 02-extracted"""
+
+    def __init__(self, name, case_number, case_dir, raw_dir, accounts, output_dir=None, plan_file=None):
+        self.name = name
+        self.case_number = case_number
+        self.case_dir = Path(case_dir)
+        self.raw_dir = Path(raw_dir)
+        self.accounts = accounts
+        self.output_dir = Path(output_dir) if output_dir else self.case_dir / OUTPUT_FOLDER
+        self.plan_file = Path(plan_file) if plan_file else None
+
+    def __repr__(self):
+        return f"Case({self.name!r}, {self.case_number!r})"
+
+    def statement_folder(self, account_info):
+        return self.raw_dir / account_info["folder"] / STATEMENT_FOLDER
+
+    @property
+    def cache_dir(self):
+        return self.output_dir / ".extract-cache"
+
+    @property
+    def columnar_dir(self):
+        return self.output_dir / "columnar"
+
+    @property
+    def metrics_file(self):
+        return self.output_dir / "extraction-metrics.json"
+
+    @property
+    def profile_dir(self):
+        return self.output_dir / "profiles"
+
+    @property
+    def dedupe_index_file(self):
+        return self.output_dir / ".dedupe-index.json"
+
+    @property
+    def duplicates_file(self):
+        return self.output_dir / "duplicates.json"
+
+    @property
+    def reconciliation_file(self):
+        return self.output_dir / "reconciliation.json"
+
+    @property
+    def failures_file(self):
+        return self.output_dir / "failures.json"
+
+    @property
+    def rollup_file(self):
+        return self.output_dir / "hzv-rollups.json"
+
+    @property
+    def variance_file(self):
+        return self.output_dir / "plan-ist-abweichung.json"
+
+
+def account_label(account_info):
+    """Standort-Teil der Monatsdateien (ISK_<label>_<YYYY-MM>.json): "ISK Uckerath" -> "Uckerath" """
+    label = account_info.get("label") or account_info["name"].removeprefix("ISK ")
+    return label.replace(" ", "_")
+
+
+def _case_from_config(entry, cases_root):
+    for key in ("name", "caseNumber", "rawDir", "accounts"):
+        if key not in entry:
+            raise CaseConfigError(f"Fall {entry.get('name', '?')!r}: Feld {key!r} fehlt")
+    for account_id, info in entry["accounts"].items():
+        missing = [key for key in ("name", "iban", "folder") if key not in info]
+        if missing:
+            raise CaseConfigError(f"Fall {entry['name']!r}, Konto {account_id}: {', '.join(missing)} fehlt")
+
+    case_dir = cases_root / entry.get("caseDir", entry["name"])
+    output_dir = case_dir / entry["outputDir"] if entry.get("outputDir") else None
+    plan_file = case_dir / entry["planFile"] if entry.get("planFile") else None
+    return Case(entry["name"], entry["caseNumber"], case_dir, case_dir / entry["rawDir"],
+                entry["accounts"], output_dir, plan_file)
+
+
+def load_cases(path):
+    """Aktive Fälle aus der JSON-Konfiguration"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CaseConfigError(f"Fall-Konfiguration {path} nicht lesbar: {e}")
+
+    cases_root = Path(data.get("casesRoot", Path(path).parent))
+    cases = [_case_from_config(entry, cases_root) for entry in data.get("cases", []) if entry.get("active", True)]
+    if not cases:
+        raise CaseConfigError(f"Keine aktiven Fälle in {path}")
+    return cases
@@ -0,0 +1,123 @@
+"""
+Spaltenorientierte Ausgabe der ISK-Transaktionen.
+
+Ergänzt die formatierten Monats-JSONs um eine typisierte, partitionierte
+Ablage, die Auswertungen und Import-Skripte streamen oder memory-mappen können:
+
+    <root>/_schema.json
+    <root>/<konto>/<YYYY-MM>.ndjson
+    <root>/<konto>/<YYYY-MM>.parquet
+
+Konto und Monat stecken nur im Pfad, iskAccount und date stehen zusätzlich als
+typisierte Spalten in jeder Datei (keine Hive-Partitionierung, deren
+Typ-Inferenz mit der Spalte iskAccount kollidieren würde).
+
+NDJSON braucht keine Zusatzpakete. Parquet setzt pyarrow voraus und wird nur
+importiert, wenn das Format gewählt ist.
+"""
+
+import json
+from datetime import date
+from pathlib import Path
+
+FORMATS = ("ndjson", "parquet")
+
+# Spalte -> Typ (date = ISO-Datum, int64 = Cent, string = nullable Text)
+SCHEMA = (
+    ("date", "date"),
+    ("valueDate", "date"),
+    ("amountCents", "int64"),
+    ("category", "string"),
+    ("counterparty", "string"),
+    ("lanr", "string"),
+    ("iskAccount", "string"),
+    ("sourceFile", "string"),
+    ("description", "string"),
+    ("fingerprint", "string"),
+)
+
+
+def german_to_iso_date(value):
+    """"31.12.2025" -> "2025-12-31" (None bleibt None)"""
+    if not value:
+        return None
+    day, month, year = value.split(".")
+    return f"{year}-{month}-{day}"
+
+
+def to_columns(transactions):
+    """Transaktions-Dicts -> Dict Spaltenname -> Liste (Daten als ISO-Strings)"""
+    columns = {name: [] for name, _ in SCHEMA}
+    for tx in transactions:
+        for name, kind in SCHEMA:
+            value = tx.get(name)
+            columns[name].append(german_to_iso_date(value) if kind == "date" else value)
+    return columns
+
+
+def partition_path(root, account_id, month, fmt):
+    return Path(root) / str(account_id) / f"{month}.{fmt}"
+
+
+def _write_ndjson(path, columns, count):
+    names = [name for name, _ in SCHEMA]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({name: columns[name][i] for name in names},
+                               ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+
+
+def _write_parquet(path, columns):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet-Ausgabe benötigt pyarrow (pip install pyarrow) - alternativ --columnar ndjson")
+
+    types = {"date": pa.date32(), "int64": pa.int64(), "string": pa.string()}
+    arrays = []
+    for name, kind in SCHEMA:
+        values = columns[name]
+        if kind == "date":
+            values = [date.fromisoformat(v) if v else None for v in values]
+        arrays.append(pa.array(values, type=types[kind]))
+    table = pa.Table.from_arrays(arrays, names=[name for name, _ in SCHEMA])
+    pq.write_table(table, path)
+
+
+def write_partition(root, account_id, month, transactions, fmt="ndjson"):
+    """Schreibt eine Partition (Konto x Monat) und liefert den Dateipfad"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Spaltenformat: {fmt}")
+
+    path = partition_path(root, account_id, month, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    columns = to_columns(transactions)
+    if fmt == "parquet":
+        _write_parquet(path, columns)
+    else:
+        _write_ndjson(path, columns, len(transactions))
+    return path
+
+
+def write_schema(root, fmt):
+    """_schema.json mit Spaltentypen und Partitionierung für Lader"""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    schema = {
+        "format": fmt,
+        "layout": "<iskAccount>/<YYYY-MM>." + fmt,
+        "columns": [{"name": name, "type": kind} for name, kind in SCHEMA],
+    }
+    with open(root / "_schema.json", "w", encoding="utf-8") as f:
+        json.dump(schema, f, ensure_ascii=False, indent=2)
+
+
+def read_partition(path):
+    """Liest eine NDJSON-Partition zeilenweise (Generator) - für Parquet pyarrow.parquet nutzen"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,102 @@
+"""
+Gegenpartei-Index für Buchungstexte.
+
+Wird einmal aus einer exportierten Gegenpartei-Liste (Counterparty/Creditor
+Stammdaten) aufgebaut:
+
+    {"name": "...", "shortName": "...", "type": "PAYER",
+     "aliases": ["HAVG"], "ibans": ["DE12 ..."], "bics": ["WELADED1VEL"]}
+
+Eine Beschreibung wird mit einem Automaten-Scan über alle Namen/Aliase/BICs
+und einem Dict-Lookup je gefundener IBAN aufgelöst - die Laufzeit hängt nicht
+von der Größe des Verzeichnisses ab.
+
+Auflösungsreihenfolge:
+    1. IBAN im Text, die im Verzeichnis steht (eindeutig)
+    2. Alias/BIC - bei mehreren Treffern gewinnt der Eintrag, der in der Liste
+       zuerst steht (wie die bisherige if/elif-Kette)
+Aliase und BICs werden exakt (case-sensitive) verglichen.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+from .automaton import Automaton
+
+CounterpartyMatch = namedtuple("CounterpartyMatch", ["name", "pattern", "via", "counterparty"])
+
+# Länderkennung + Prüfziffer, danach Blöcke mit optionalen Leerzeichen
+IBAN_CANDIDATE_RE = re.compile(r'\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]){10,30}')
+
+
+def normalize_iban(iban):
+    return re.sub(r'\s+', '', iban).upper()
+
+
+class CounterpartyIndex:
+    """Index über Namen, Aliase, BICs (Automat) und IBANs (Hash)"""
+
+    def __init__(self, counterparties):
+        self.counterparties = list(counterparties)
+        self._automaton = Automaton()
+        self._by_iban = {}
+
+        for rank, cp in enumerate(self.counterparties):
+            if not cp.get("name"):
+                raise ValueError(f"Gegenpartei #{rank}: name fehlt")
+            for alias in cp.get("aliases", []):
+                self._automaton.add(alias, (rank, alias, "alias"))
+            for bic in cp.get("bics", []):
+                self._automaton.add(bic, (rank, bic, "bic"))
+            for iban in cp.get("ibans", []):
+                # Erste Zuordnung einer IBAN gewinnt
+                self._by_iban.setdefault(normalize_iban(iban), rank)
+
+        self._automaton.build()
+        self._iban_lengths = sorted({len(iban) for iban in self._by_iban})
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["counterparties"] if isinstance(data, dict) else data)
+
+    def __len__(self):
+        return len(self.counterparties)
+
+    def _match(self, rank, pattern, via):
+        cp = self.counterparties[rank]
+        return CounterpartyMatch(cp["name"], pattern, via, cp)
+
+    def _resolve_iban(self, description):
+        if not self._by_iban:
+            return None
+        for candidate in IBAN_CANDIDATE_RE.finditer(description):
+            compact = candidate.group(0).replace(" ", "")
+            # Der Kandidat kann in folgenden Text hineinlaufen - bekannte Längen probieren
+            for length in self._iban_lengths:
+                rank = self._by_iban.get(compact[:length])
+                if rank is not None:
+                    return self._match(rank, compact[:length], "iban")
+        return None
+
+    def resolve(self, description):
+        """CounterpartyMatch(name, pattern, via, counterparty) oder None"""
+        if not description:
+            return None
+
+        match = self._resolve_iban(description)
+        if match:
+            return match
+
+        best = None
+        for _, _, value in self._automaton.iter_matches(description):
+            if best is None or value[0] < best[0]:
+                best = value
+        return self._match(*best) if best else None
+
+    def resolve_batch(self, descriptions):
+        resolve = self.resolve
+        return [resolve(description) for description in descriptions]
+
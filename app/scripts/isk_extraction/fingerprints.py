@@ -0,0 +1,142 @@
+"""
+Stabile Transaktions-Fingerprints und persistenter Duplikat-Index.
+
+Fingerprint = SHA-256 über Konto, Buchungs-/Valutadatum, Betrag in Cent und
+normalisierte Beschreibung (NFKC, casefold, nur Wortzeichen, einfache
+Leerzeichen) plus laufende Nummer gleicher Umsätze innerhalb eines Auszugs.
+So bleiben zwei echte, identische Gebühren am selben Tag verschieden, während
+derselbe Umsatz in einem überlappenden oder doppelt abgelegten Auszug denselben
+Fingerprint bekommt.
+
+Der Index merkt sich je Fingerprint die erste Quelle (Inhalts-Hash + Dateiname)
+über Läufe hinweg; ein Treffer aus einer anderen Quelle ist ein Duplikat.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from .cache import write_json_atomic
+
+DUPLICATE_MODES = ("drop", "flag")
+
+INDEX_VERSION = 1
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize_description(text):
+    """Beschreibung ohne Groß-/Kleinschreibung, Satzzeichen und Umbruch-Unterschiede"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def transaction_fingerprint(account_id, tx, occurrence=0):
+    key = "|".join((
+        str(account_id),
+        tx.get("date") or "",
+        tx.get("valueDate") or "",
+        str(tx["amountCents"]),
+        normalize_description(tx.get("description")),
+        str(occurrence),
+    ))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def fingerprint_transactions(transactions, account_id):
+    """Setzt tx["fingerprint"] für alle Umsätze eines Auszugs (gleiche Umsätze durchnummeriert)"""
+    seen = Counter()
+    for tx in transactions:
+        base = transaction_fingerprint(account_id, tx)
+        tx["fingerprint"] = transaction_fingerprint(account_id, tx, seen[base]) if seen[base] else base
+        seen[base] += 1
+    return transactions
+
+
+class DedupeIndex:
+    """
+    Fingerprint -> erste Quelle, als JSON neben den Monatsdateien.
+
+    sources: Inhalts-Hash -> Dateiname (ein Hash unter zweitem Namen = doppelt abgelegter Auszug)
+    fingerprints: Fingerprint -> Inhalts-Hash der Quelle, die den Umsatz zuerst geliefert hat
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sources = {}
+        self.fingerprints = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.sources = data["sources"]
+                    self.fingerprints = data["fingerprints"]
+            except (OSError, ValueError, KeyError):
+                # Defekter Index -> neu aufbauen
+                self.sources, self.fingerprints = {}, {}
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def prune(self, live_sources):
+        """
+        Quellen entfernen, die es nicht mehr (unter diesem Namen) gibt - live_sources: {(hash, name)}.
+        Nur bei vollständigen Läufen, damit ersetzte Auszüge nicht als Duplikate ihrer Vorgänger gelten.
+        """
+        for source_hash, entry in list(self.sources.items()):
+            if (source_hash, entry["sourceFile"]) not in live_sources:
+                del self.sources[source_hash]
+        self._drop_orphans()
+
+    def forget_file(self, source_file):
+        """Alle Einträge einer Datei vergessen (z.B. geänderter Auszug im Watch-Modus)"""
+        for source_hash, entry in list(self.sources.items()):
+            if entry["sourceFile"] == source_file:
+                del self.sources[source_hash]
+        self._drop_orphans()
+
+    def _drop_orphans(self):
+        self.fingerprints = {fp: h for fp, h in self.fingerprints.items() if h in self.sources}
+
+    def filter(self, transactions, source_hash, source_file, mode="drop"):
+        """
+        Umsätze eines Auszugs gegen den Index prüfen und neue eintragen.
+        Liefert (behaltene Umsätze, Duplikate); Duplikate tragen "duplicateOf".
+        """
+        known = self.sources.get(source_hash)
+        if known is None:
+            self.sources[source_hash] = {
+                "sourceFile": source_file,
+                "indexedAt": datetime.now().isoformat(),
+                "transactions": len(transactions),
+            }
+        duplicate_file = known is not None and known["sourceFile"] != source_file
+
+        kept, duplicates = [], []
+        for tx in transactions:
+            if duplicate_file:
+                first_hash, first = source_hash, known
+            else:
+                first_hash = self.fingerprints.setdefault(tx["fingerprint"], source_hash)
+                first = None if first_hash == source_hash else self.sources[first_hash]
+
+            if first is not None:
+                tx["duplicateOf"] = {"sourceFile": first["sourceFile"], "sourceFileHash": first_hash}
+                duplicates.append(tx)
+                if mode == "drop":
+                    continue
+            kept.append(tx)
+        return kept, duplicates
+
+    def save(self):
+        write_json_atomic(self.path, {
+            "version": INDEX_VERSION,
+            "updatedAt": datetime.now().isoformat(),
+            "sources": self.sources,
+            "fingerprints": self.fingerprints,
+        })
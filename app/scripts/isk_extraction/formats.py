@@ -0,0 +1,113 @@
+"""
+Bankformate der Kontoauszüge: Erkennung an der ersten Seite, dann der passende Parser.
+
+Jedes Format registriert sich mit
+- sniff(first_page): erkennt das Format allein an Seite 1 (Zeilen, Text und
+  PDF-Metadaten in FirstPage) - liest selbst nichts weiter
+- parse(pdf, first_page, metadata, timer, table_layout): Rohtransaktionen als
+  Dicts (date, valueDate, amountText, description, ...) wie parse_tokens();
+  Kopf-/Saldo-Daten landen in metadata. Seite 1 wird aus first_page übernommen.
+- filename(name): ob ein PDF dieses Namens ein Auszug des Formats sein kann (find_pdfs)
+
+Die Registrierungsreihenfolge ist die Prüfreihenfolge. Ein PDF wird genau
+einmal bis Seite 1 gelesen; erkennt kein Format die Seite, endet die Extraktion
+mit UnknownFormatError, bevor weitere Seiten angefasst werden. Damit können
+Auszüge verschiedener Banken im selben Ordner und im selben Lauf liegen.
+"""
+
+import time
+from collections import namedtuple
+
+from .amounts import AmountParseError, cents_to_euro, parse_amount_cents
+from .layout import page_rows, row_text
+
+BankFormat = namedtuple("BankFormat", ["name", "bank", "sniff", "parse", "filename"])
+
+# Seite 1, einmal gelesen: Wortzeilen (page_rows), Text daraus, pdf.metadata, Lesezeit
+FirstPage = namedtuple("FirstPage", ["rows", "text", "info", "seconds"])
+
+_FORMATS = {}
+
+
+class UnknownFormatError(Exception):
+    """Kein registriertes Format erkennt die erste Seite"""
+
+
+def register_format(bank_format):
+    """Format anhängen (oder gleichnamiges ersetzen, Position bleibt)"""
+    _FORMATS[bank_format.name] = bank_format
+    return bank_format
+
+
+def registered_formats():
+    return list(_FORMATS.values())
+
+
+def get_format(name):
+    try:
+        return _FORMATS[name]
+    except KeyError:
+        raise UnknownFormatError(f"Format nicht registriert: {name!r}") from None
+
+
+def matches_filename(name):
+    """Ob irgendein Format Dateien dieses Namens einliest"""
+    return any(bank_format.filename(name) for bank_format in _FORMATS.values())
+
+
+def read_first_page(pdf):
+    """Seite 1 als FirstPage - Zeilen über page_rows, ohne pdfplumbers Zeichenobjekte"""
+    start = time.perf_counter()
+    rows = []
+    if pdf.pages:
+        page = pdf.pages[0]
+        rows = page_rows(page)
+        # Layout-Cache freigeben, die Parser arbeiten mit den Zeilen weiter
+        page.close()
+    text = "\n".join(row_text(row) for row in rows)
+    return FirstPage(rows, text, pdf.metadata or {}, time.perf_counter() - start)
+
+
+def sniff_format(first_page):
+    """Erstes Format, dessen Sniffer die Seite erkennt - sonst UnknownFormatError"""
+    for bank_format in _FORMATS.values():
+        if bank_format.sniff(first_page):
+            return bank_format
+    first_line = first_page.text.split("\n", 1)[0][:60]
+    raise UnknownFormatError(
+        f"Unbekanntes Auszugsformat (geprüft: {', '.join(_FORMATS) or '-'}; Seite 1 beginnt mit {first_line!r})"
+    )
+
+
+def iter_page_texts(pdf, first_page, timer):
+    """
+    (Seitennummer ab 0, Text) Seite für Seite; Seite 1 kommt aus first_page.
+    Jede Seite wird nach dem Lesen geschlossen, Zeiten gehen in extractText.
+    """
+    for page_no, page in enumerate(pdf.pages):
+        start = time.perf_counter()
+        if page_no == 0 and first_page is not None:
+            text = first_page.text
+        else:
+            text = page.extract_text() or ""
+        page.close()
+        extract_seconds = time.perf_counter() - start
+        if page_no == 0 and first_page is not None:
+            extract_seconds += first_page.seconds
+        timer.add("extractText", extract_seconds)
+
+        line_count = text.count("\n") + 1
+        timer.record_page(page_no + 1, extract_seconds, line_count)
+        timer.count("lines", line_count)
+        yield page_no, text
+
+
+def set_balance(metadata, key, amount_text):
+    """Saldo als Cent (und EUR für bestehende Auswertungen) - Formatfehler werden gemeldet"""
+    try:
+        cents = parse_amount_cents(amount_text)
+    except AmountParseError as e:
+        metadata["parseErrors"].append({"field": key, "amountText": amount_text, "error": str(e)})
+        return
+    metadata["balances"][key] = cents_to_euro(cents)
+    metadata["balances"][key + "Cents"] = cents
@@ -0,0 +1,171 @@
+"""
+Tabellen-Layout des BW-Bank/UC eBanking Tagesauszugs.
+
+Statt den Volltext jeder Seite zu zerlegen, werden die Wörter der Umsatztabelle
+über ihre x-Position den Spalten Datum/Valuta/Buchungsinformationen/Umsatz
+zugeordnet. Die Spalten ergeben sich einmal je Dokument aus der Kopfzeile der
+Tabelle auf Seite 1; Folgeseiten werden auf den Tabellenbereich zugeschnitten.
+Zeilen werden als LineToken geliefert, also genau wie vom Zeilen-Klassifikator -
+der Transaktions-Zustandsautomat bleibt derselbe.
+
+Die Wörter entstehen direkt aus pdfminers Zeichen (LTChar) der Seite: pdfplumber
+würde aus jedem Zeichen erst ein Objekt mit allen Attributen bauen (der größte
+Posten von extract_text/extract_words), hier werden nur Text und Position gelesen
+und Zeichen außerhalb des Tabellenbereichs gleich übergangen.
+
+Fehlt die Kopfzeile auf Seite 1 (oder passen die Spalten nicht), fällt die
+Extraktion auf den Text-Parser zurück.
+"""
+
+import re
+from collections import namedtuple
+
+from pdfminer.layout import LTChar, LTContainer
+
+from .lines import LINE_CONTINUATION, LINE_SKIP, LINE_START, SKIP_RE, LineToken, split_trailing_amount
+
+HEADER_WORDS = ("Datum", "Valuta", "Buchungsinformationen", "Umsatz")
+
+# Erste Zeile nach der Tabelle (nur auf der letzten Seite)
+TABLE_END = "Endsaldo"
+
+# Wörter gehören zur selben Zeile, wenn ihre Oberkante höchstens so weit abweicht (pt)
+ROW_TOLERANCE = 3
+# Größerer Abstand zwischen zwei Zeichen beginnt ein neues Wort (wie x_tolerance bei pdfplumber)
+WORD_GAP = 3
+# Spielraum an Spaltengrenzen (pt)
+COLUMN_TOLERANCE = 2
+# Mindestabstand zwischen den Kopfzeilen-Wörtern - bei Fließtext ist es nur ein Leerzeichen
+MIN_COLUMN_GAP = 6
+
+DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}")
+
+TableLayout = namedtuple("TableLayout", ["x0", "valuta_x0", "info_x0", "amount_x0"])
+
+_SKIP_TOKEN = LineToken(LINE_SKIP, "", None, None, "", None)
+
+
+def group_rows(words):
+    """Wörter/Zeichen (Dicts mit x0, top) zu Zeilen, von oben nach unten, je Zeile nach x sortiert"""
+    rows = []
+    current, current_top = [], None
+    for word in sorted(words, key=lambda w: (round(w["top"]), w["x0"])):
+        if current and word["top"] - current_top > ROW_TOLERANCE:
+            rows.append(sorted(current, key=lambda w: w["x0"]))
+            current = []
+        if not current:
+            current_top = word["top"]
+        current.append(word)
+    if current:
+        rows.append(sorted(current, key=lambda w: w["x0"]))
+    return rows
+
+
+def _iter_chars(objects):
+    for obj in objects:
+        if isinstance(obj, LTChar):
+            yield obj
+        elif isinstance(obj, LTContainer):
+            yield from _iter_chars(obj)
+
+
+def _split_words(chars):
+    """Zeichen einer Zeile (nach x sortiert) zu Wörtern - Leerzeichen und Lücken trennen"""
+    words = []
+    current = None
+    for char in chars:
+        if char["text"].isspace():
+            current = None
+        elif current is not None and char["x0"] - current["x1"] <= WORD_GAP:
+            current["text"] += char["text"]
+            current["x1"] = char["x1"]
+        else:
+            current = char
+            words.append(current)
+    return words
+
+
+def page_rows(page, bbox=None):
+    """
+    Zeilen (Wortlisten) einer pdfplumber-Seite; bbox (x0, top, x1, bottom) wie bei
+    page.crop() - Zeichen außerhalb werden übersprungen. Wörter sind Dicts mit
+    text, x0, x1, top in pdfplumber-Koordinaten.
+    """
+    mb_x0, mb_top = page.mediabox[:2]
+    height = page.height
+    left, upper, right, lower = bbox or (float("-inf"), float("-inf"), float("inf"), float("inf"))
+
+    chars = []
+    for char in _iter_chars(page.layout):
+        x0 = char.x0 + mb_x0
+        top = height - char.y1 + mb_top
+        if x0 < left or x0 > right or top < upper or top > lower:
+            continue
+        chars.append({"text": char.get_text(), "x0": x0, "x1": char.x1 + mb_x0, "top": top})
+    return [_split_words(row) for row in group_rows(chars)]
+
+
+def row_text(row):
+    return " ".join(word["text"] for word in row)
+
+
+def find_header_row(rows):
+    """Index der Tabellen-Kopfzeile (Datum Valuta Buchungsinformationen Umsatz) oder None"""
+    for index, row in enumerate(rows):
+        texts = [word["text"] for word in row]
+        if all(name in texts for name in HEADER_WORDS):
+            return index
+    return None
+
+
+def detect_table_layout(header_row, rows=()):
+    """
+    Spaltengrenzen aus der Kopfzeile - None, wenn die Kopfzeile keine Spalten bildet
+    oder ein Betrag in `rows` (Tabellenzeilen der ersten Seite) außerhalb der Umsatz-Spalte steht
+    """
+    words = {word["text"]: word for word in header_row}
+    header = [words[name] for name in HEADER_WORDS]
+    if any(right["x0"] - left["x1"] < MIN_COLUMN_GAP for left, right in zip(header, header[1:])):
+        return None
+    layout = TableLayout(*(word["x0"] for word in header))
+
+    for row in rows:
+        if is_table_end(row):
+            break
+        head, amount = split_trailing_amount(row[-1]["text"])
+        if amount and not head and row[-1]["x1"] <= layout.amount_x0 - COLUMN_TOLERANCE:
+            return None
+    return layout
+
+
+def is_table_end(row):
+    return row[0]["text"] == TABLE_END
+
+
+def row_token(row, layout):
+    """Eine Tabellenzeile als LineToken (Datum/Valuta/Betrag nach Spalte, Rest als Text)"""
+    line = row_text(row)
+    if SKIP_RE.search(line):
+        return _SKIP_TOKEN
+
+    words = row
+    datum = valuta = None
+    if (len(words) >= 3
+            and words[0]["x0"] < layout.valuta_x0 - COLUMN_TOLERANCE
+            and words[1]["x0"] < layout.info_x0 - COLUMN_TOLERANCE
+            and DATE_RE.fullmatch(words[0]["text"]) and DATE_RE.fullmatch(words[1]["text"])):
+        # Wie beim Text-Parser beginnt ein Umsatz nur, wenn nach dem Datumspaar noch etwas steht
+        datum, valuta = words[0]["text"], words[1]["text"]
+        words = words[2:]
+
+    amount = None
+    if words and words[-1]["x1"] > layout.amount_x0 - COLUMN_TOLERANCE:
+        head, trailing = split_trailing_amount(words[-1]["text"])
+        if trailing and not head:
+            amount = trailing
+            words = words[:-1]
+
+    text = row_text(words)
+    if datum:
+        return LineToken(LINE_START, line, datum, valuta, text, amount)
+    return LineToken(LINE_CONTINUATION, line, None, None, text, amount)
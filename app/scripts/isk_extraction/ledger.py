@@ -0,0 +1,158 @@
+"""
+Bulk-Loader: extrahierte Transaktionen direkt in ledger_entries (SQLite, dev.db-Schema).
+
+Eine Transaktion, ein vorbereitetes INSERT ... ON CONFLICT(id) DO UPDATE,
+ausgeführt per executemany in Batches. Die id wird aus dem Fingerprint
+abgeleitet ("isk-<fingerprint>"), damit wiederholte Läufe dieselbe Zeile
+aktualisieren statt sie doppelt anzulegen - ohne Schemaänderung.
+
+Beim Update werden nur Quelldaten (Datum, Betrag, Text, Herkunft) erneuert;
+Review, Kategorie-Tags, Alt/Neu-Zuordnung und Vorschläge bleiben unangetastet.
+Datumswerte werden wie von Prisma als Millisekunden seit Epoch (UTC) gespeichert.
+"""
+
+import calendar
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ID_PREFIX = "isk-"
+BATCH_SIZE = 5000
+CREATED_BY = "extract-isk-pdfs"
+
+UPSERT_SQL = """
+INSERT INTO ledger_entries (
+    id, caseId, transactionDate, amountCents, description, note,
+    valueType, legalBucket, allocationSource, allocationNote,
+    importSource, importFileHash, importRowNumber,
+    bookingSource, bookingSourceId, bankAccountId,
+    reviewStatus, createdAt, createdBy, updatedAt
+) VALUES (
+    ?, ?, ?, ?, ?, ?,
+    'IST', 'MASSE', 'BANK_STATEMENT', ?,
+    ?, ?, ?,
+    'BANK_ACCOUNT', ?, ?,
+    'UNREVIEWED', ?, ?, ?
+)
+ON CONFLICT(id) DO UPDATE SET
+    transactionDate = excluded.transactionDate,
+    amountCents = excluded.amountCents,
+    description = excluded.description,
+    note = excluded.note,
+    importSource = excluded.importSource,
+    importFileHash = excluded.importFileHash,
+    importRowNumber = excluded.importRowNumber,
+    bankAccountId = COALESCE(ledger_entries.bankAccountId, excluded.bankAccountId),
+    updatedAt = excluded.updatedAt
+"""
+
+
+class LedgerLoadError(Exception):
+    """Datenbank passt nicht (Schema fehlt, Fall unbekannt)"""
+
+
+def date_to_epoch_ms(value):
+    """ "31.12.2025" -> Millisekunden UTC-Mitternacht (wie new Date("2025-12-31") in den TS-Importern)"""
+    day, month, year = value.split(".")
+    return calendar.timegm((int(year), int(month), int(day), 0, 0, 0)) * 1000
+
+
+def _now_ms():
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def find_case_id(conn, case_number):
+    row = conn.execute("SELECT id FROM cases WHERE caseNumber = ?", (case_number,)).fetchone()
+    if row is None:
+        raise LedgerLoadError(f"Fall nicht gefunden: {case_number}")
+    return row[0]
+
+
+def find_bank_account_ids(conn, case_id, accounts):
+    """
+    Bankkonto-IDs je ISK-Konto in einer Abfrage: exakte IBAN, dann Kontonummer
+    (letzte 10 Stellen), dann Kontoname - wie findBankAccountByIban() im TS-Importer.
+    """
+    rows = conn.execute("SELECT id, iban, accountName FROM bank_accounts WHERE caseId = ?", (case_id,)).fetchall()
+    resolved = {}
+    for account_id, info in accounts.items():
+        iban = info["iban"].replace(" ", "")
+        match = (
+            next((r[0] for r in rows if r[1] == iban), None)
+            or next((r[0] for r in rows if r[1] and iban[-10:] in r[1]), None)
+            or next((r[0] for r in rows if r[2] == info["name"]), None)
+        )
+        resolved[account_id] = match
+    return resolved
+
+
+def _row(tx, case_id, bank_account_ids, accounts, now, row_number):
+    account_id = tx.account_id
+    month = tx.date[6:10] + "-" + tx.date[3:5]
+    return (
+        ID_PREFIX + tx.fingerprint,
+        case_id,
+        date_to_epoch_ms(tx.date),
+        tx.amount_cents,
+        tx.description[:500],
+        tx.counterparty,
+        f"Imported from {tx.isk_name} {month}",
+        tx.source_file,
+        tx.source_file_hash,
+        row_number,
+        accounts[account_id]["iban"].replace(" ", ""),
+        bank_account_ids.get(account_id),
+        now,
+        CREATED_BY,
+        now,
+    )
+
+
+def load_transactions(db_path, transactions, case_number, accounts, batch_size=BATCH_SIZE):
+    """
+    Upsert aller Transaktionen (Transaction-Datensätze) in einer DB-Transaktion.
+    Liefert {"rows", "inserted", "updated", "seconds", "unmatchedAccounts"}.
+    """
+    start = time.perf_counter()
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise LedgerLoadError(f"Datenbank nicht gefunden: {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ledger_entries'"
+        ).fetchone()
+        if not has_table:
+            raise LedgerLoadError(f"Tabelle ledger_entries fehlt in {db_path} (npx prisma db push)")
+
+        conn.execute("PRAGMA foreign_keys = ON")
+        case_id = find_case_id(conn, case_number)
+        bank_account_ids = find_bank_account_ids(conn, case_id, accounts)
+        now = _now_ms()
+
+        # Zeilennummer je Quelldatei (importRowNumber), Reihenfolge wie im Auszug
+        row_numbers = {}
+        rows = []
+        for tx in transactions:
+            row_numbers[tx.source_code] = row_numbers.get(tx.source_code, 0) + 1
+            rows.append(_row(tx, case_id, bank_account_ids, accounts, now, row_numbers[tx.source_code]))
+
+        count_sql = "SELECT COUNT(*) FROM ledger_entries WHERE caseId = ?"
+        with conn:
+            before = conn.execute(count_sql, (case_id,)).fetchone()[0]
+            for offset in range(0, len(rows), batch_size):
+                conn.executemany(UPSERT_SQL, rows[offset:offset + batch_size])
+            after = conn.execute(count_sql, (case_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+    inserted = after - before
+    return {
+        "rows": len(rows),
+        "inserted": inserted,
+        "updated": len(rows) - inserted,
+        "seconds": time.perf_counter() - start,
+        "unmatchedAccounts": sorted(a for a, bank_id in bank_account_ids.items() if bank_id is None),
+    }
@@ -0,0 +1,85 @@
+"""
+Zeilen-Klassifikator für BW-Bank/UniCredit Tagesauszüge.
+
+Jede Textzeile wird in einem Durchgang als Kopf-/Fußzeile (überspringen),
+Transaktionsbeginn (Datum + Valuta) oder Folgezeile eingeordnet. Alle Muster
+sind vorkompiliert: Skip-Marker in einer Alternation, das Datumspaar als
+verankerter Ausdruck. Der Betrag am Zeilenende wird von rechts abgetrennt,
+statt die ganze Zeile mit re.search(...$) abzusuchen.
+"""
+
+import re
+from collections import namedtuple
+
+# Kopf-/Fußzeilen des UC eBanking Layouts ('Endsaldo' auch ohne "(in EUR)", sonst
+# hängt die Saldo-Zeile an der Beschreibung des letzten Umsatzes)
+SKIP_MARKERS = (
+    'Anfangsaldo (in EUR)', 'Endsaldo', 'Datum', 'Valuta',
+    'Buchungsinformationen', 'Umsatz EUR', 'Seite', 'UC eBanking',
+    'Version', 'UniCredit', 'Gedruckt', 'Erzeugt', 'Auszug Nr',
+)
+
+LINE_SKIP = "skip"
+LINE_START = "start"
+LINE_CONTINUATION = "continuation"
+
+SKIP_RE = re.compile("|".join(re.escape(marker) for marker in SKIP_MARKERS))
+
+# Datumspaar am Zeilenanfang (Buchungsdatum, Valuta), danach muss Text folgen
+DATE_PAIR_RE = re.compile(r'(\d{2}\.\d{2}\.\d{4})\s+(\d{2}\.\d{2}\.\d{4})\s+(?=.)')
+
+_DIGITS = "0123456789"
+_AMOUNT_CHARS = "0123456789."
+
+LineToken = namedtuple("LineToken", ["kind", "line", "datum", "valuta", "text", "amount"])
+
+_SKIP_TOKEN = LineToken(LINE_SKIP, "", None, None, "", None)
+
+
+def split_trailing_amount(text):
+    """
+    Trennt einen Betrag (-?1.234,56) am Ende ab: liefert (text_davor, betrag) oder (text, None).
+
+    Entspricht re.search(r'(-?[\d.]+,\d{2})$', text), arbeitet aber von rechts und
+    kostet damit nur so viel wie der Betrag lang ist.
+    """
+    if len(text) < 4 or text[-3] != "," or text[-2] not in _DIGITS or text[-1] not in _DIGITS:
+        return text, None
+
+    head = text[:-3].rstrip(_AMOUNT_CHARS)
+    if len(head) == len(text) - 3:
+        return text, None
+    if head.endswith("-"):
+        head = head[:-1]
+    return head, text[len(head):]
+
+
+def classify_line(line):
+    """
+    Klassifiziert eine Zeile des Auszugs.
+
+    Liefert ein LineToken mit:
+        kind    LINE_SKIP, LINE_START oder LINE_CONTINUATION
+        line    die bereinigte Zeile
+        datum   Buchungsdatum (nur LINE_START)
+        valuta  Valutadatum (nur LINE_START)
+        text    Zeilentext ohne Datumspaar und ohne Betrag
+        amount  Betrag am Zeilenende als String ("-1.234,56") oder None
+    """
+    line = line.strip()
+    if not line or SKIP_RE.search(line):
+        return _SKIP_TOKEN
+
+    date_match = DATE_PAIR_RE.match(line)
+    if date_match:
+        text, amount = split_trailing_amount(line[date_match.end():])
+        return LineToken(LINE_START, line, date_match.group(1), date_match.group(2), text, amount)
+
+    text, amount = split_trailing_amount(line)
+    return LineToken(LINE_CONTINUATION, line, None, None, text, amount)
+
+
+def classify_lines(lines):
+    """Klassifiziert einen Zeilen-Stream (Generator)"""
+    for line in lines:
+        yield classify_line(line)
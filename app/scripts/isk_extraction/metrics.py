@@ -0,0 +1,148 @@
+"""
+Instrumentierung der Extraktions-Pipeline.
+
+StageTimer sammelt pro PDF die Zeit je Stufe (open, extractText, parseLines,
+amounts, counterparties, categorize, lanr), Seitenzeiten und Zähler. Ohne
+--metrics wird NULL_TIMER verwendet, der nichts aufzeichnet.
+
+Speicher: AllocationPeak misst je PDF die Spitze der Python-Allokationen
+(tracemalloc, pro Auftrag zurückgesetzt). ru_maxrss ist dagegen der
+Höchststand des ganzen Worker-Prozesses über alle bisher bearbeiteten PDFs
+und steht deshalb nur als workerPeakRssBytes bei der Datei; der Bericht
+nimmt davon das Maximum als Spitze des ganzen Laufs.
+"""
+
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+
+def peak_rss_bytes():
+    """Höchststand des Arbeitsspeichers dieses Prozesses (ru_maxrss: Linux KiB, macOS Bytes)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AllocationPeak:
+    """Spitze der Python-Allokationen (Bytes über dem Stand beim Start) während des with-Blocks"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def __enter__(self):
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc_info):
+        self.bytes = max(0, tracemalloc.get_traced_memory()[1] - self.base)
+        if self.started:
+            tracemalloc.stop()
+        return False
+
+
+class StageTimer:
+    """Zeiten und Zähler für ein PDF (oder für globale Schritte in main)"""
+
+    def __init__(self):
+        self.seconds = {}
+        self.counters = {}
+        self.pages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def elapsed(self, name):
+        return self.seconds.get(name, 0.0)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_page(self, number, extract_seconds, line_count):
+        self.pages.append({"page": number, "extractText": round(extract_seconds, 6), "lines": line_count})
+
+    def as_dict(self):
+        return {
+            "stages": {name: round(seconds, 6) for name, seconds in self.seconds.items()},
+            "counters": dict(self.counters),
+            "pages": self.pages,
+        }
+
+
+class _NullTimer:
+    """Platzhalter ohne Aufzeichnung"""
+
+    def stage(self, name):
+        return nullcontext()
+
+    def add(self, name, seconds):
+        pass
+
+    def elapsed(self, name):
+        return 0.0
+
+    def count(self, name, n=1):
+        pass
+
+    def record_page(self, number, extract_seconds, line_count):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def build_report(file_metrics, global_timer, workers, wall_seconds):
+    """Fasst die Metriken aller PDFs zum Bericht zusammen (langsamste Dateien zuerst)"""
+    totals = {"files": len(file_metrics), "cachedFiles": 0, "pages": 0, "lines": 0, "transactions": 0,
+              "seconds": 0.0, "stages": {}}
+    peak = 0
+    for entry in file_metrics:
+        if entry.get("cached"):
+            totals["cachedFiles"] += 1
+            continue
+        totals["seconds"] += entry["seconds"]
+        totals["pages"] += len(entry["pages"])
+        totals["lines"] += entry["counters"].get("lines", 0)
+        totals["transactions"] += entry["counters"].get("transactions", 0)
+        for name, seconds in entry["stages"].items():
+            totals["stages"][name] = totals["stages"].get(name, 0.0) + seconds
+        peak = max(peak, entry.get("workerPeakRssBytes", 0))
+
+    totals["seconds"] = round(totals["seconds"], 6)
+    totals["stages"] = {name: round(seconds, 6) for name, seconds in totals["stages"].items()}
+    parsed_seconds = totals["seconds"] or None
+    throughput = {
+        "pagesPerSecond": round(totals["pages"] / parsed_seconds, 2) if parsed_seconds else None,
+        "transactionsPerSecond": round(totals["transactions"] / parsed_seconds, 2) if parsed_seconds else None,
+    }
+
+    return {
+        "generatedAt": datetime.now().isoformat(),
+        "workers": workers,
+        "wallSeconds": round(wall_seconds, 6),
+        "peakRssBytes": max(peak, peak_rss_bytes()),
+        "totals": totals,
+        "throughput": throughput,
+        "global": global_timer.as_dict()["stages"],
+        "files": sorted(file_metrics, key=lambda entry: entry.get("seconds", 0.0), reverse=True),
+    }
+
+
+def write_report(path, report):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,102 @@
+"""
+Saldenabgleich aller Auszüge eines Falls in einem Durchlauf.
+
+Je Auszug: Anfangssaldo + Summe der Umsätze == Endsaldo (in Cent).
+Je Konto, sortiert nach Auszugsnummer: Endsaldo == Anfangssaldo des nächsten
+Auszugs, fortlaufende Nummern ohne Lücken und Doppelungen.
+
+Gerechnet wird spaltenweise über alle Auszüge (eine Liste je Feld), nicht
+Auszug für Auszug mit erneutem PDF-Zugriff - die Salden stammen aus dem
+ohnehin geparsten Kopf/Fuß.
+"""
+
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+STATUS_OK = "OK"
+STATUS_MISMATCH = "MISMATCH"
+STATUS_MISSING_BALANCE = "MISSING_BALANCE"
+
+CHAIN_BREAK = "CHAIN_BREAK"
+CHAIN_GAP = "GAP"
+CHAIN_DUPLICATE = "DUPLICATE_NUMBER"
+
+
+def statement_row(result, account_id, source_file):
+    """Kennzahlen eines extrahierten Auszugs (Umsätze vor Duplikat-Filter)"""
+    balances = result.get("balances", {})
+    transactions = result.get("transactions", [])
+    return {
+        "account": account_id,
+        "sourceFile": source_file,
+        "statementNumber": result.get("statementNumber"),
+        "statementDate": result.get("statementDate"),
+        "openingCents": balances.get("openingCents"),
+        "closingCents": balances.get("closingCents"),
+        "sumCents": sum(tx["amountCents"] for tx in transactions),
+        "transactionCount": len(transactions),
+        "parseErrors": len(result.get("parseErrors", [])),
+    }
+
+
+def reconcile_statements(rows):
+    """Abgleich aller Auszüge - liefert den Bericht (statements, chain, summary)"""
+    rows = sorted(rows, key=lambda r: (r["account"], r["statementNumber"] is None, r["statementNumber"] or 0))
+
+    opening = [r["openingCents"] for r in rows]
+    closing = [r["closingCents"] for r in rows]
+    sums = [r["sumCents"] for r in rows]
+
+    # Auszugsweise Differenz: None, wenn ein Saldo fehlt
+    differences = [
+        None if o is None or c is None else o + s - c
+        for o, s, c in zip(opening, sums, closing)
+    ]
+
+    statements = []
+    for row, difference in zip(rows, differences):
+        if difference is None:
+            status = STATUS_MISSING_BALANCE
+        else:
+            status = STATUS_OK if difference == 0 else STATUS_MISMATCH
+        statements.append(dict(row, differenceCents=difference, status=status))
+
+    # Verkettung je Konto: Paare aufeinanderfolgender Auszüge
+    chain = []
+    for account, group in groupby(statements, key=itemgetter("account")):
+        numbered = [s for s in group if s["statementNumber"] is not None]
+        for prev, nxt in zip(numbered, numbered[1:]):
+            gap = nxt["statementNumber"] - prev["statementNumber"]
+            if gap == 0:
+                chain.append({"account": account, "issue": CHAIN_DUPLICATE,
+                              "statementNumber": nxt["statementNumber"],
+                              "files": [prev["sourceFile"], nxt["sourceFile"]]})
+                continue
+            if gap > 1:
+                chain.append({"account": account, "issue": CHAIN_GAP,
+                              "after": prev["statementNumber"], "before": nxt["statementNumber"],
+                              "missing": list(range(prev["statementNumber"] + 1, nxt["statementNumber"]))})
+            if prev["closingCents"] is not None and nxt["openingCents"] is not None \
+                    and prev["closingCents"] != nxt["openingCents"]:
+                chain.append({"account": account, "issue": CHAIN_BREAK,
+                              "from": prev["statementNumber"], "to": nxt["statementNumber"],
+                              "closingCents": prev["closingCents"], "openingCents": nxt["openingCents"],
+                              "differenceCents": nxt["openingCents"] - prev["closingCents"]})
+
+    counts = {status: 0 for status in (STATUS_OK, STATUS_MISMATCH, STATUS_MISSING_BALANCE)}
+    for statement in statements:
+        counts[statement["status"]] += 1
+
+    return {
+        "generatedAt": datetime.now().isoformat(),
+        "summary": {
+            "statements": len(statements),
+            "ok": counts[STATUS_OK],
+            "mismatches": counts[STATUS_MISMATCH],
+            "missingBalances": counts[STATUS_MISSING_BALANCE],
+            "chainIssues": len(chain),
+        },
+        "statements": statements,
+        "chain": chain,
+    }
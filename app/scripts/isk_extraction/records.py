@@ -0,0 +1,149 @@
+"""
+Kompakte Transaktions-Datensätze für die im Hauptprozess gesammelten Umsätze.
+
+Pro Auszug liefert die Extraktion weiterhin Dicts (Cache- und Prozess-Format).
+Sobald Umsätze über alle Auszüge gesammelt werden, werden sie zu Transaction-
+Objekten mit __slots__: Kategorie, Konto und Quelldatei als kleine Ganzzahl-
+Codes in gemeinsamen Tabellen, wiederkehrende Strings (Datum, Gegenpartei,
+Arzt, Standort) internalisiert. Erst bei der Ausgabe entsteht mit to_dict()
+wieder die bisherige JSON-Form.
+"""
+
+import sys
+from operator import attrgetter
+
+
+class CodeTable:
+    """Wert <-> fortlaufender Ganzzahl-Code"""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+# Gemeinsam für alle Datensätze eines Prozesses
+CATEGORIES = CodeTable()
+ACCOUNTS = CodeTable()       # (Kontonummer, Kontoname)
+SOURCES = CodeTable()        # (Dateiname, Inhalts-Hash)
+COUNTERPARTY_MATCHES = CodeTable()  # (pattern, via)
+
+_NO_CODE = -1
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+
+class Transaction:
+    """Ein Umsatz; Feldnamen wie im JSON, nur in snake_case"""
+
+    __slots__ = (
+        "date", "value_date", "amount_cents", "counterparty", "description",
+        "counterparty_match_code", "category_code", "lanr", "haevgid", "arzt", "standort",
+        "account_code", "source_code", "fingerprint", "duplicate_of",
+    )
+
+    @classmethod
+    def from_dict(cls, tx):
+        """Aus der JSON-Form (extrahiertes oder aus einer Monatsdatei gelesenes Dict)"""
+        record = cls()
+        record.date = _intern(tx["date"])
+        record.value_date = _intern(tx.get("valueDate"))
+        record.amount_cents = tx["amountCents"]
+        record.counterparty = _intern(tx.get("counterparty"))
+        record.description = tx["description"]
+
+        match = tx.get("counterpartyMatch")
+        record.counterparty_match_code = (
+            COUNTERPARTY_MATCHES.code((match["pattern"], match["via"])) if match else _NO_CODE
+        )
+        record.category_code = CATEGORIES.code(tx["category"])
+
+        # LANR-Felder gibt es nur gemeinsam (extract_lanr)
+        record.lanr = _intern(tx.get("lanr"))
+        record.haevgid = _intern(tx.get("haevgid"))
+        record.arzt = _intern(tx.get("arzt"))
+        record.standort = _intern(tx.get("standort"))
+
+        record.account_code = ACCOUNTS.code((tx["iskAccount"], tx["iskName"]))
+        record.source_code = SOURCES.code((tx["sourceFile"], tx.get("sourceFileHash")))
+        record.fingerprint = tx.get("fingerprint")
+        duplicate = tx.get("duplicateOf")
+        record.duplicate_of = (duplicate["sourceFile"], duplicate["sourceFileHash"]) if duplicate else None
+        return record
+
+    @property
+    def category(self):
+        return CATEGORIES.values[self.category_code]
+
+    @property
+    def account_id(self):
+        return ACCOUNTS.values[self.account_code][0]
+
+    @property
+    def isk_name(self):
+        return ACCOUNTS.values[self.account_code][1]
+
+    @property
+    def source_file(self):
+        return SOURCES.values[self.source_code][0]
+
+    @property
+    def source_file_hash(self):
+        return SOURCES.values[self.source_code][1]
+
+    def to_dict(self):
+        """Bisherige JSON-Form (gleiche Schlüssel und Reihenfolge wie die Monatsdateien)"""
+        tx = {
+            "date": self.date,
+            "valueDate": self.value_date,
+            "amount": self.amount_cents / 100,
+            "amountCents": self.amount_cents,
+            "counterparty": self.counterparty,
+            "description": self.description,
+        }
+        if self.counterparty_match_code != _NO_CODE:
+            pattern, via = COUNTERPARTY_MATCHES.values[self.counterparty_match_code]
+            tx["counterpartyMatch"] = {"pattern": pattern, "via": via}
+        tx["category"] = CATEGORIES.values[self.category_code]
+        if self.lanr is not None:
+            tx["lanr"] = self.lanr
+            tx["haevgid"] = self.haevgid
+            tx["arzt"] = self.arzt
+            tx["standort"] = self.standort
+
+        account_id, isk_name = ACCOUNTS.values[self.account_code]
+        source_file, source_file_hash = SOURCES.values[self.source_code]
+        tx["iskAccount"] = account_id
+        tx["iskName"] = isk_name
+        tx["sourceFile"] = source_file
+        if source_file_hash is not None:
+            tx["sourceFileHash"] = source_file_hash
+        if self.fingerprint is not None:
+            tx["fingerprint"] = self.fingerprint
+        if self.duplicate_of is not None:
+            tx["duplicateOf"] = {"sourceFile": self.duplicate_of[0], "sourceFileHash": self.duplicate_of[1]}
+        return tx
+
+
+by_date = attrgetter("date")
+
+
+def to_records(transactions):
+    return [Transaction.from_dict(tx) for tx in transactions]
+
+
+def to_dicts(records):
+    return [record.to_dict() for record in records]
@@ -0,0 +1,129 @@
+"""
+HZV-Rollups je (Monat, Standort, LANR, Kategorie), gebaut während der Extraktion.
+
+Jeder Umsatz mit LANR (extract_lanr) geht beim Sammeln einmal in seine Zelle:
+Summe in Cent, Anzahl, erster und letzter Buchungstag. Auswertungen je Arzt,
+Standort und Monat lesen danach nur die kleine Rollup-Datei statt aller
+Monatsdateien. Die Datei trägt Status und Zeitstempel wie AggregationCache
+in der App (status, lastAggregatedAt).
+
+Im Watch-Modus werden nur die Monate neu aufgebaut, deren Monatsdateien sich
+geändert haben - ein ersetzter Auszug darf nicht doppelt zählen.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .amounts import cents_to_euro
+from .cache import write_json_atomic
+
+STATUS_CURRENT = "CURRENT"
+
+KEY_FIELDS = ("month", "standort", "lanr", "category")
+
+
+def _iso_date(value):
+    """ "31.12.2025" -> "2025-12-31" (sortierbar)"""
+    return f"{value[6:10]}-{value[3:5]}-{value[0:2]}"
+
+
+class HzvRollup:
+    """
+    cells: (Monat, Standort, LANR, Kategorie) -> [Summe Cent, Anzahl, erster Tag, letzter Tag]
+    doctors: LANR -> (HAEVGID, Arzt) für die Ausgabe
+    """
+
+    def __init__(self):
+        self.cells = {}
+        self.doctors = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, records):
+        """Transaction-Datensätze einarbeiten; ohne LANR und markierte Duplikate zählen nicht"""
+        for tx in records:
+            if tx.lanr is not None and tx.duplicate_of is None:
+                self._add(tx.date, tx.standort, tx.lanr, tx.haevgid, tx.arzt, tx.category, tx.amount_cents)
+
+    def add_dicts(self, transactions):
+        """Wie add(), für Umsätze in JSON-Form (Monatsdateien)"""
+        for tx in transactions:
+            if tx.get("lanr") is not None and "duplicateOf" not in tx:
+                self._add(tx["date"], tx.get("standort"), tx["lanr"], tx.get("haevgid"), tx.get("arzt"),
+                          tx["category"], tx.get("amountCents", round(tx["amount"] * 100)))
+
+    def _add(self, date, standort, lanr, haevgid, arzt, category, amount_cents):
+        day = _iso_date(date)
+        key = (day[:7], standort, lanr, category)
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [amount_cents, 1, day, day]
+            self.doctors.setdefault(lanr, (haevgid, arzt))
+            return
+        cell[0] += amount_cents
+        cell[1] += 1
+        if day < cell[2]:
+            cell[2] = day
+        if day > cell[3]:
+            cell[3] = day
+
+    def drop_months(self, months):
+        """Zellen dieser Monate verwerfen (vor dem Neuaufbau aus den Monatsdateien)"""
+        months = set(months)
+        self.cells = {key: cell for key, cell in self.cells.items() if key[0] not in months}
+
+    def rows(self):
+        rows = []
+        for key in sorted(self.cells, key=lambda k: (k[0], k[1] or "", k[2], k[3])):
+            month, standort, lanr, category = key
+            amount_cents, count, first_date, last_date = self.cells[key]
+            haevgid, arzt = self.doctors.get(lanr, (None, None))
+            rows.append({
+                "month": month,
+                "standort": standort,
+                "lanr": lanr,
+                "haevgid": haevgid,
+                "arzt": arzt,
+                "category": category,
+                "amount": cents_to_euro(amount_cents),
+                "amountCents": amount_cents,
+                "count": count,
+                "firstDate": first_date,
+                "lastDate": last_date,
+            })
+        return rows
+
+    def save(self, path, case_number):
+        rows = self.rows()
+        write_json_atomic(path, {
+            "caseNumber": case_number,
+            "status": STATUS_CURRENT,
+            "lastAggregatedAt": datetime.now().isoformat(),
+            "key": list(KEY_FIELDS),
+            "count": len(rows),
+            "totals": {
+                "amountCents": sum(row["amountCents"] for row in rows),
+                "transactionCount": sum(row["count"] for row in rows),
+            },
+            "rollups": rows,
+        }, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Bestehende Rollup-Datei; fehlt sie oder ist sie unlesbar, leer"""
+        rollup = cls()
+        path = Path(path)
+        if not path.exists():
+            return rollup
+        try:
+            with open(path, encoding="utf-8") as f:
+                rows = json.load(f)["rollups"]
+        except (OSError, ValueError, KeyError):
+            return rollup
+        for row in rows:
+            key = tuple(row[field] for field in KEY_FIELDS)
+            rollup.cells[key] = [row["amountCents"], row["count"], row["firstDate"], row["lastDate"]]
+            rollup.doctors.setdefault(row["lanr"], (row.get("haevgid"), row.get("arzt")))
+        return rollup
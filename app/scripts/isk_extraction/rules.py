@@ -0,0 +1,177 @@
+"""
+Datengetriebene Kategorisierung von ISK-Transaktionen.
+
+Die Regeln haben die Form der App-Tabelle ClassificationRule (name, priority,
+isActive, matchField, matchType, matchValue, suggestedCategory) und können
+damit aus der Datenbank exportiert oder von Hand gepflegt werden.
+
+Alle Literal-Regeln (CONTAINS, STARTS_WITH, ENDS_WITH, EQUALS) eines Feldes
+werden in einen Aho-Corasick Automaten kompiliert - die Kosten pro Transaktion
+wachsen mit der Textlänge, nicht mit der Zahl der Regeln. REGEX und
+AMOUNT_RANGE werden nur geprüft, wenn sie die bisher beste Priorität schlagen.
+
+Wie in der App gilt: niedrigere priority gewinnt, bei Gleichstand die Regel,
+die in der Datei zuerst steht. Vergleiche sind case-insensitive. matchField
+der App (bezeichnung, counterpartyHint) wird auf die Felder der ISK-Umsätze
+abgebildet; Regeln auf Feldern, die es hier nicht gibt (standort, arzt, ...),
+oder mit unlesbarem matchValue werden übersprungen und in skipped vermerkt.
+"""
+
+import json
+import re
+
+from .automaton import Automaton
+
+DEFAULT_CATEGORY = "SONSTIGE"
+
+MATCH_FIELDS = ("description", "counterparty")
+# matchField der App (Felder von NormalizedImportContext) -> Feld der ISK-Umsätze
+FIELD_ALIASES = {"bezeichnung": "description", "counterpartyHint": "counterparty"}
+LITERAL_MATCH_TYPES = ("CONTAINS", "STARTS_WITH", "ENDS_WITH", "EQUALS")
+MATCH_TYPES = LITERAL_MATCH_TYPES + ("REGEX", "AMOUNT_RANGE")
+
+
+def parse_amount_range(match_value):
+    """
+    Wie matchAmountRange() in der App: "100-500", ">100", "<500", ">=100", "<=500"
+    (EUR, mit Vorzeichen: Auszahlungen sind negativ). Liefert (low, high,
+    low_inclusive, high_inclusive); anderes Format: ValueError.
+    """
+    value = match_value.strip()
+    for operator in (">=", "<=", ">", "<"):
+        if value.startswith(operator):
+            threshold = float(value[len(operator):])
+            if operator[0] == ">":
+                return threshold, float("inf"), operator == ">=", False
+            return float("-inf"), threshold, False, operator == "<="
+    if "-" in value and not value.startswith("-"):
+        low, high = value.split("-")[:2]
+        return float(low), float(high), True, True
+    raise ValueError(f"Betragsbereich {match_value!r} nicht im Format der App")
+
+
+def in_amount_range(amount, amount_range):
+    low, high, low_inclusive, high_inclusive = amount_range
+    return ((amount >= low if low_inclusive else amount > low)
+            and (amount <= high if high_inclusive else amount < high))
+
+
+class CategoryRuleEngine:
+    """Kompilierte Regelmenge: classify() für eine, classify_batch() für viele Transaktionen"""
+
+    def __init__(self, rules, default_category=DEFAULT_CATEGORY):
+        self.default_category = default_category
+        self.rules = []
+        self._automata = {field: Automaton() for field in MATCH_FIELDS}
+        self._regex_rules = []
+        self._amount_rules = []
+        # (Regelname, Grund) der Regeln, die hier nicht anwendbar sind
+        self.skipped = []
+
+        active = [rule for rule in rules if rule.get("isActive", True)]
+        # Stabile Sortierung: Priorität, dann Reihenfolge in der Datei
+        active.sort(key=lambda rule: rule.get("priority", 100))
+
+        for rule in active:
+            reason = self._add_rule(rule, len(self.rules))
+            if reason:
+                self.skipped.append((rule.get("name"), reason))
+
+        for automaton in self._automata.values():
+            automaton.build()
+
+    def _add_rule(self, rule, rank):
+        """Regel kompilieren; liefert den Grund, falls sie nicht anwendbar ist"""
+        match_type = rule.get("matchType")
+        match_field = rule.get("matchField", "description")
+        match_field = FIELD_ALIASES.get(match_field, match_field)
+        match_value = rule.get("matchValue")
+        if match_type not in MATCH_TYPES:
+            return f"unbekannter matchType {match_type}"
+        if match_type != "AMOUNT_RANGE" and match_field not in MATCH_FIELDS:
+            return f"matchField {rule.get('matchField')} gibt es für ISK-Umsätze nicht"
+        if not match_value:
+            return "matchValue fehlt"
+        if not rule.get("suggestedCategory"):
+            return "suggestedCategory fehlt"
+
+        if match_type in LITERAL_MATCH_TYPES:
+            self._automata[match_field].add(match_value.lower(), (rank, match_type))
+        elif match_type == "REGEX":
+            try:
+                pattern = re.compile(match_value, re.IGNORECASE)
+            except re.error as e:
+                return f"ungültiger REGEX: {e}"
+            self._regex_rules.append((rank, match_field, pattern))
+        else:
+            try:
+                self._amount_rules.append((rank, parse_amount_range(match_value)))
+            except ValueError as e:
+                return str(e)
+        self.rules.append(rule)
+        return None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rules = data["rules"] if isinstance(data, dict) else data
+        return cls(rules)
+
+    def _best_literal_rank(self, field, text, best):
+        """Niedrigster Rang einer Literal-Regel, die auf text matcht (oder best)"""
+        if not text:
+            return best
+        length = len(text)
+        for start, end, (rank, match_type) in self._automata[field].iter_matches(text):
+            if rank >= best:
+                continue
+            if (match_type == "CONTAINS"
+                    or (match_type == "STARTS_WITH" and start == 0)
+                    or (match_type == "ENDS_WITH" and end == length)
+                    or (match_type == "EQUALS" and start == 0 and end == length)):
+                best = rank
+        return best
+
+    def match(self, description, counterparty=None, amount=None):
+        """Liefert die gewinnende Regel oder None"""
+        texts = {
+            "description": (description or "").lower(),
+            "counterparty": (counterparty or "").lower(),
+        }
+
+        best = len(self.rules)
+        for field in MATCH_FIELDS:
+            best = self._best_literal_rank(field, texts[field], best)
+
+        for rank, field, pattern in self._regex_rules:
+            if rank >= best:
+                break
+            if pattern.search(texts[field]):
+                best = rank
+                break
+
+        if amount is not None:
+            for rank, amount_range in self._amount_rules:
+                if rank >= best:
+                    break
+                if in_amount_range(amount, amount_range):
+                    best = rank
+                    break
+
+        return self.rules[best] if best < len(self.rules) else None
+
+    def classify(self, description, counterparty=None, amount=None):
+        rule = self.match(description, counterparty, amount)
+        return rule["suggestedCategory"] if rule else self.default_category
+
+    def classify_batch(self, transactions):
+        """Kategorien für eine Liste von Transaktionen (description/counterparty/amount)"""
+        match = self.match
+        default = self.default_category
+        categories = []
+        for tx in transactions:
+            rule = match(tx.get("description"), tx.get("counterparty"), tx.get("amount"))
+            categories.append(rule["suggestedCategory"] if rule else default)
+        return categories
+
@@ -0,0 +1,180 @@
+"""
+Sparkassen-Kontoauszug (PDF aus dem Online-Banking, Layout der Finanz Informatik).
+
+    Sparkasse Hilden-Ratingen-Velbert
+    Kontoauszug 3/2025 Blatt 1/2
+    Konto 1234567890 IBAN DE12 3345 0000 1234 5678 90
+    Datum Erläuterung Betrag EUR
+    Kontostand am 28.02.2025, Auszug Nr. 2 12.345,67
+    03.03.2025 Lastschrift 123,45-
+    AOK Rheinland/Hamburg
+    04.03.2025 05.03.2025 Gutschrift 4.567,89+
+    ...
+    Übertrag auf Blatt 2 16.790,11+
+    ...
+    Übertrag von Blatt 1 16.790,11+
+    ...
+    Kontostand am 31.03.2025 um 20:15 Uhr 10.000,00+
+
+Umsätze beginnen mit dem Buchungstag (optional gefolgt vom Wertstellungstag),
+der Betrag steht am Ende der ersten Zeile, das Vorzeichen vor oder hinter dem
+Betrag (+/- oder S/H). Kopf- und Fußzeilen werden nicht über Marker im Text
+erkannt, sondern über die Position: Umsätze stehen nur zwischen der Tabellen-
+Kopfzeile und dem Seitenende (Übertrag auf Blatt N mit Betrag) bzw. dem
+Schluss-Kontostand. Sonst würde "Sparkasse ..." oder "Übertrag auf
+Tagesgeldkonto" im Verwendungszweck als Kopf- oder Fußzeile verschwinden.
+"""
+
+import re
+
+from .formats import BankFormat, iter_page_texts, set_balance
+
+TABLE_HEADER = "Datum Erläuterung"
+
+# Buchungstag, optional Wertstellung, danach Text
+BOOKING_RE = re.compile(r'(\d{2}\.\d{2}\.\d{4})\s+(?:(\d{2}\.\d{2}\.\d{4})\s+)?(?=\S)')
+# Betrag am Zeilenende, Vorzeichen davor oder dahinter (S = Soll, H = Haben)
+AMOUNT_RE = re.compile(r'(?:^|\s)([-+])?((?:\d{1,3}(?:\.\d{3})+|\d+),\d{2})\s?([-+SH])?$')
+
+OPENING_RE = re.compile(r'Kontostand am (\d{2}\.\d{2}\.\d{4}), Auszug Nr\.\s*\d+')
+CLOSING_RE = re.compile(r'Kontostand am (\d{2}\.\d{2}\.\d{4}) um')
+
+# Übertragszeilen: vollständige Zeile mit Blattnummer und Betrag, "auf" beendet die Seite
+CARRY_OVER_RE = re.compile(r'Übertrag (auf|von) Blatt \d+')
+
+FILENAME_RE = re.compile(r'Konto_\d+-Auszug_\d{4}_\d+')
+
+
+def split_signed_amount(line):
+    """ "Lastschrift 123,45-" -> ("Lastschrift", "-123,45"); ohne Betrag (line, None)"""
+    match = AMOUNT_RE.search(line)
+    if not match:
+        return line, None
+    sign = match.group(1) or match.group(3)
+    amount = match.group(2)
+    if sign in ("-", "S"):
+        amount = "-" + amount
+    return line[:match.start()].rstrip(), amount
+
+
+def parse_header(text, metadata):
+    """Kontonummer, IBAN und Auszugsnummer aus dem Seitenkopf vor der Tabelle"""
+    konto_match = re.search(r'Konto(?:nummer)?\s+(\d{6,})', text)
+    if konto_match:
+        metadata["account"]["kontonummer"] = konto_match.group(1)
+
+    iban_match = re.search(r'IBAN\s+(DE\d{2}(?:\s*\d{4}){4}\s*\d{2})', text)
+    if iban_match:
+        metadata["account"]["iban"] = iban_match.group(1)
+
+    auszug_match = re.search(r'Kontoauszug\s+(\d+)/\d{4}', text)
+    if auszug_match:
+        metadata["statementNumber"] = int(auszug_match.group(1))
+
+
+def carry_over(line):
+    """ "Übertrag auf Blatt 2 16.790,11+" -> "auf", "Übertrag von Blatt 1 ..." -> "von", sonst None"""
+    if not line.startswith("Übertrag"):
+        return None
+    text, amount = split_signed_amount(line)
+    match = CARRY_OVER_RE.fullmatch(text)
+    return match.group(1) if match and amount else None
+
+
+def parse_balance_line(line, metadata):
+    """Kontostand-Zeile: Anfangs- oder Schlusssaldo; True, wenn die Tabelle damit endet"""
+    _, amount = split_signed_amount(line)
+    closing = CLOSING_RE.match(line)
+    if closing:
+        metadata["statementDate"] = closing.group(1)
+        if amount:
+            set_balance(metadata, "closing", amount)
+        return True
+    if OPENING_RE.match(line) and amount:
+        set_balance(metadata, "opening", amount)
+    return False
+
+
+def iter_table_lines(pages, metadata):
+    """Nur die Zeilen der Umsatztabelle; Kopf von Seite 1 und Kontostände gehen in metadata"""
+    finished = False
+    for page_no, text in pages:
+        header_lines = []
+        in_table = False
+        for line in text.split("\n"):
+            line = line.strip()
+            if finished or not line:
+                continue
+            if not in_table:
+                if line.startswith(TABLE_HEADER):
+                    in_table = True
+                    if page_no == 0:
+                        parse_header("\n".join(header_lines), metadata)
+                else:
+                    header_lines.append(line)
+                continue
+            if line.startswith("Kontostand am"):
+                finished = parse_balance_line(line, metadata)
+                continue
+            direction = carry_over(line)
+            if direction == "auf":
+                in_table = False
+            elif direction is None:
+                yield line
+
+
+def parse_lines(lines):
+    """Transaktions-Zustandsautomat: ein Umsatz je Buchungstag-Zeile, Folgezeilen sind Verwendungszweck"""
+    current_tx = None
+    description_lines = []
+
+    for line in lines:
+        booking = BOOKING_RE.match(line)
+        if booking:
+            if current_tx:
+                current_tx["description"] = " ".join(description_lines).strip()
+                yield current_tx
+
+            text, amount = split_signed_amount(line[booking.end():])
+            current_tx = {
+                "date": booking.group(1),
+                "valueDate": booking.group(2) or booking.group(1),
+                "amount": None,
+                "amountCents": None,
+                "amountText": amount,
+                "counterparty": None
+            }
+            description_lines = [text] if text else []
+
+        elif current_tx is not None:
+            text, amount = split_signed_amount(line)
+            if amount and current_tx["amountText"] is None:
+                # Betrag erst auf einer Folgezeile
+                current_tx["amountText"] = amount
+                line = text
+            if line:
+                description_lines.append(line)
+
+    if current_tx:
+        current_tx["description"] = " ".join(description_lines).strip()
+        yield current_tx
+
+
+def sniff(first_page):
+    """Tabellenkopf "Datum Erläuterung" und ein Kontostand auf Seite 1"""
+    return "Kontostand am" in first_page.text and any(
+        line.startswith(TABLE_HEADER) for line in first_page.text.split("\n")
+    )
+
+
+def parse(pdf, first_page, metadata, timer, table_layout=True):
+    metadata["layout"] = "text"
+    return parse_lines(iter_table_lines(iter_page_texts(pdf, first_page, timer), metadata))
+
+
+def matches_filename(name):
+    """Dateinamen des Sparkassen-Exports: Konto_<Kontonummer>-Auszug_<Jahr>_<Nr>.pdf"""
+    return FILENAME_RE.match(name) is not None
+
+
+SPARKASSE = BankFormat("sparkasse", "Sparkasse", sniff, parse, matches_filename)
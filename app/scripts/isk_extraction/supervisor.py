@@ -0,0 +1,234 @@
+"""
+Überwachte Worker-Prozesse für die PDF-Extraktion.
+
+Jedes PDF läuft in einem langlebigen Worker-Prozess unter Aufsicht:
+- Zeitlimit je PDF: hängt pdfplumber, wird der Worker beendet und neu gestartet
+- Speicherlimit je Worker: der Aufseher fragt regelmäßig den Arbeitsspeicher
+  (RSS) jedes beschäftigten Workers ab und beendet ihn wie beim Zeitlimit,
+  wenn er das Limit überschreitet (funktioniert auch auf macOS). Zusätzlich
+  RLIMIT_AS, wo das Betriebssystem es durchsetzt (Linux): Überschreitung
+  endet dort schon als MemoryError im Job
+- abgestürzte Worker (Segfault, OOM-Killer) werden ersetzt
+Fehlgeschlagene PDFs werden `retries`-mal erneut versucht, danach als
+endgültig fehlgeschlagen gemeldet. Ergebnisse kommen in Eingabe-Reihenfolge.
+
+Endgültig fehlgeschlagene PDFs landen in der Quarantäne (failures.json, nach
+Inhalts-Hash) und werden in späteren Läufen übersprungen, bis sich die Datei
+ändert oder die Quarantäne ausdrücklich aufgehoben wird.
+"""
+
+import json
+import multiprocessing
+import os
+import subprocess
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from .cache import write_json_atomic
+
+Limits = namedtuple("Limits", "timeout memory_mb retries")
+
+REASON_TIMEOUT = "timeout"
+REASON_CRASH = "crash"
+REASON_ERROR = "error"
+REASON_MEMORY = "memory"
+
+# Abstand der RSS-Abfragen, solange ein Speicherlimit gilt
+MEMORY_POLL_SECONDS = 0.5
+
+
+def _set_memory_limit(memory_mb):
+    try:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        # Plattform ohne durchsetzbares Adressraum-Limit -> nur Zeitlimit
+        pass
+
+
+def process_rss_bytes(pid):
+    """Aktueller Arbeitsspeicher (RSS) eines Prozesses; None, wenn er nicht abfragbar ist"""
+    try:
+        # Linux: residente Seiten aus /proc
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        # macOS/BSD: ps meldet KiB
+        output = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True,
+                                timeout=5).stdout
+        return int(output.strip()) * 1024
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def _worker_main(conn, job, memory_mb, initializer, initargs):
+    if memory_mb:
+        _set_memory_limit(memory_mb)
+    if initializer:
+        initializer(*initargs)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, item = task
+        conn.send((index, job(item)))
+
+
+class _Worker:
+    def __init__(self, context, job, limits, initializer, initargs):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, job, limits.memory_mb, initializer, initargs), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = None
+
+    def submit(self, task):
+        self.task = task
+        self.started = time.monotonic()
+        self.conn.send((task[0], task[1]))
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def supervised_map(job, items, workers, limits, initializer=None, initargs=()):
+    """
+    Wie map(job, items), aber jedes Element isoliert mit Zeit-/Speicherlimit.
+
+    job(item) liefert (Ergebnis, Fehler, Metriken) wie extract_pdf_job. Erzeugt je
+    Element (Ergebnis, Fehler, Metriken, Versuch-Info), Versuch-Info =
+    {"attempts", "reason"} - reason None bei Erfolg, sonst timeout/memory/crash/error.
+    """
+    items = list(items)
+    if not items:
+        return
+    context = multiprocessing.get_context()
+    pending = deque((index, item, 1) for index, item in enumerate(items))
+    done = {}
+    next_index = 0
+    pool = [_Worker(context, job, limits, initializer, initargs) for _ in range(max(1, min(workers, len(items))))]
+    memory_limit = limits.memory_mb * 1024 * 1024 if limits.memory_mb else None
+
+    def finish(worker, outcome, reason):
+        index, item, attempt = worker.task
+        worker.task = None
+        if reason is not None and attempt <= limits.retries:
+            pending.append((index, item, attempt + 1))
+            return
+        done[index] = outcome + ({"attempts": attempt, "reason": reason},)
+
+    try:
+        while next_index < len(items):
+            for i, worker in enumerate(pool):
+                if worker.task is None and pending:
+                    worker.submit(pending.popleft())
+
+            busy = [w for w in pool if w.task is not None]
+            if busy:
+                now = time.monotonic()
+                remaining = [w.started + limits.timeout - now for w in busy] if limits.timeout else []
+                if memory_limit:
+                    remaining.append(MEMORY_POLL_SECONDS)
+                ready = wait([w.conn for w in busy], timeout=max(0, min(remaining)) if remaining else None)
+
+                for i, worker in enumerate(pool):
+                    if worker.task is None:
+                        continue
+                    if worker.conn in ready:
+                        try:
+                            _, outcome = worker.conn.recv()
+                        except (EOFError, OSError):
+                            # Worker gestorben (Segfault, OOM-Killer) -> ersetzen
+                            error = f"Worker-Prozess abgebrochen (Exit-Code {worker.process.exitcode})"
+                            finish(worker, (None, error, None), REASON_CRASH)
+                            worker.kill()
+                            pool[i] = _Worker(context, job, limits, initializer, initargs)
+                            continue
+                        finish(worker, outcome, REASON_ERROR if outcome[1] else None)
+                    elif limits.timeout and time.monotonic() - worker.started >= limits.timeout:
+                        finish(worker, (None, f"Zeitlimit von {limits.timeout:g}s überschritten", None),
+                               REASON_TIMEOUT)
+                        worker.kill()
+                        pool[i] = _Worker(context, job, limits, initializer, initargs)
+                    elif memory_limit:
+                        rss = process_rss_bytes(worker.process.pid)
+                        if rss is not None and rss > memory_limit:
+                            finish(worker, (None, f"Speicherlimit von {limits.memory_mb} MB überschritten "
+                                                  f"({rss / 1024 / 1024:.0f} MB)", None), REASON_MEMORY)
+                            worker.kill()
+                            pool[i] = _Worker(context, job, limits, initializer, initargs)
+
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+    finally:
+        for worker in pool:
+            worker.stop()
+
+
+class Quarantine:
+    """
+    Endgültig fehlgeschlagene PDFs, als JSON-Bericht neben den Monatsdateien.
+
+    files: Inhalts-Hash -> {sourceFile, reason, attempts, error, quarantinedAt}
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.files = json.load(f)["files"]
+            except (OSError, ValueError, KeyError):
+                self.files = {}
+
+    def __len__(self):
+        return len(self.files)
+
+    def get(self, source_hash):
+        return self.files.get(source_hash)
+
+    def prune(self, live_hashes):
+        """Einträge für Dateien entfernen, die es (mit diesem Inhalt) nicht mehr gibt"""
+        self.files = {h: entry for h, entry in self.files.items() if h in live_hashes}
+
+    def clear(self):
+        self.files = {}
+
+    def add(self, source_hash, source_file, error, attempts=1, reason=REASON_ERROR):
+        self.files[source_hash] = {
+            "sourceFile": source_file,
+            "reason": reason,
+            "attempts": attempts,
+            "error": error.strip().splitlines()[-1] if error.strip() else error,
+            "details": error,
+            "quarantinedAt": datetime.now().isoformat(),
+        }
+
+    def save(self):
+        write_json_atomic(self.path, {
+            "updatedAt": datetime.now().isoformat(),
+            "count": len(self.files),
+            "files": self.files,
+        }, indent=2)
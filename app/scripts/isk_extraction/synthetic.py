@@ -0,0 +1,249 @@
+"""
+Synthetische BW-Bank Tagesauszüge für Benchmarks und Regressionstests.
+
+Echte Auszüge enthalten Patientendaten und dürfen nicht eingecheckt werden.
+Dieser Generator erzeugt Auszüge im gleichen Layout (Kopf, Umsatzzeilen mit
+Folgezeilen, Endsaldo, Seitenfuß) als Text und als minimales PDF
+(Helvetica/WinAnsi, Umsatztabelle in Spalten mit rechtsbündigem Betrag), das
+pdfplumber wie ein echtes UC eBanking PDF liest. Gleicher Seed -> gleiche Dateien.
+Dazu ein fester Sparkassen-Auszug (SPARKASSE_PAGES) für das zweite Bankformat.
+"""
+
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from .amounts import format_cents
+from .lines import DATE_PAIR_RE, split_trailing_amount
+
+ACCOUNTS = {
+    "400080156": {"iban": "DE91 6005 0101 0400 0801 56", "folder": "BW-Bank #400080156 (ISK) Uckerath"},
+    "400080228": {"iban": "DE87 6005 0101 0400 0802 28", "folder": "BW-Bank #400080228 (ISK) Velbert"},
+}
+
+# (Buchungstext, Folgezeilen, Vorzeichen) - deckt alle Kategorien der Standardregeln ab
+BOOKING_TEMPLATES = [
+    ("Gutschrift HZV ABS. Q4/25", ["HAVG Hausärztliche Vertragsgemeinschaft AG", "HAEVGID {haevgid} LANR {lanr}"], 1),
+    ("Gutschrift Kassenärztliche Vereinigung Nordrhein", ["Rate {n}/2026"], 1),
+    ("Gutschrift PVS rhein-ruhr GmbH", ["Privatabrechnung {n}/25"], 1),
+    ("Gutschrift DRV Befundberichtskosten", ["Deutsche Rentenversicherung Rheinland"], 1),
+    ("Gutschrift Kreis Mettmann Gutachten", ["Gesundheitsamt Az. {ref}"], 1),
+    ("Echtzeit-Sammelüberweisung", ["Gehälter {n}/25"], -1),
+    ("Auskehrung gem. Massekreditvereinbarung", ["Sparkasse Hilden-Ratingen-Velbert WELADED1VEL"], -1),
+    ("Umbuchung ISK Uckerath", [], -1),
+    ("Lastschrift Telekom Deutschland GmbH", ["Rechnung {n}/2025 Kundennummer {ref}"], -1),
+    ("Überweisung Medizintechnik Service GmbH", ["Wartung EKG-Gerät Praxis Velbert"], -1),
+]
+
+# Sparkassen-Auszug (Layout der Finanz Informatik) über zwei Blätter. Verwendungszwecke,
+# die wie Kopf- oder Fußzeilen beginnen, dürfen keine Umsätze verschlucken.
+SPARKASSE_PAGES = [
+    ["Sparkasse Hilden-Ratingen-Velbert", "Kontoauszug 3/2025 Blatt 1/2",
+     "Konto 1234567890 IBAN DE12 3345 0000 1234 5678 90", "Datum Erläuterung Betrag EUR",
+     "Kontostand am 28.02.2025, Auszug Nr. 2 12.345,67+",
+     "03.03.2025 Lastschrift 123,45-", "AOK Rheinland/Hamburg", "Sparkasse KölnBonn Ref 1",
+     "03.03.2025 Umbuchung 500,00-", "Übertrag auf Tagesgeldkonto 4711",
+     "04.03.2025 05.03.2025 Gutschrift HZV ABS. Q4/25 4.567,89+", "HAVG Hausärztliche Vertragsgemeinschaft AG",
+     "Blatt 7 der Abrechnung", "HAEVGID 132025 LANR 1445587",
+     "Übertrag auf Blatt 2 16.290,11+", "Blatt 1/2"],
+    ["Sparkasse Hilden-Ratingen-Velbert", "Kontoauszug 3/2025 Blatt 2/2", "Datum Erläuterung Betrag EUR",
+     "Übertrag von Blatt 1 16.290,11+",
+     "10.03.2025 Überweisung -1.000,00", "Medizintechnik Service GmbH",
+     "11.03.2025 Entgelt", "Kontoführung 5,90 S",
+     "Kontostand am 31.03.2025 um 20:15 Uhr 15.284,21+", "Bitte prüfen Sie Ihren Kontoauszug"],
+]
+# (Buchungstag, Betrag) der Umsätze in SPARKASSE_PAGES
+SPARKASSE_BOOKINGS = [
+    ("03.03.2025", "-123,45"), ("03.03.2025", "-500,00"), ("04.03.2025", "4.567,89"),
+    ("10.03.2025", "-1.000,00"), ("11.03.2025", "-5,90"),
+]
+
+LANRS = [("055425", "3892462"), ("067026", "8836735"), ("132025", "1445587"), ("132052", "3243603")]
+
+# Sonstige Folgezeilen für längere Verwendungszwecke
+FILLER_LINES = ["Verwendungszweck {ref}", "End-to-End-Ref. {ref}", "Mandatsreferenz {ref}"]
+
+PAGE_HEADER = ["UC eBanking Version 5.2 UniCredit", "Gedruckt am {datum} 09:14"]
+TABLE_HEADER = "Datum Valuta Buchungsinformationen Umsatz EUR"
+
+
+def generate_statement(rng, account_id, number, day, transactions=20, pages=1, extra_lines=0,
+                       split_amount_ratio=0.2, opening_cents=None):
+    """
+    Ein Tagesauszug als Liste von Seiten (Liste von Zeilen) plus erwartete Werte.
+
+    extra_lines: zusätzliche Verwendungszweck-Zeilen je Umsatz (mehrzeilige Beschreibungen)
+    split_amount_ratio: Anteil Umsätze, deren Betrag erst auf einer Folgezeile steht
+    opening_cents: Anfangssaldo (z.B. Endsaldo des Vorgängers), sonst zufällig
+    """
+    datum = day.strftime("%d.%m.%Y")
+    opening = rng.randint(0, 100_000_000) if opening_cents is None else opening_cents
+
+    bookings = []
+    expected = []
+    for _ in range(transactions):
+        text, follow, sign = rng.choice(BOOKING_TEMPLATES)
+        haevgid, lanr = rng.choice(LANRS)
+        fields = {"haevgid": haevgid, "lanr": lanr, "n": rng.randint(1, 12), "ref": rng.randint(1000, 999_999)}
+        follow = [line.format(**fields) for line in follow]
+        follow += [rng.choice(FILLER_LINES).format(ref=rng.randint(1000, 999_999)) for _ in range(extra_lines)]
+        cents = sign * rng.randint(100, 5_000_000)
+
+        valuta = (day + timedelta(days=rng.random() < 0.1)).strftime("%d.%m.%Y")
+        if follow and rng.random() < split_amount_ratio:
+            lines = [f"{datum} {valuta} {text}"] + follow[:-1] + [f"{follow[-1]} {format_cents(cents)}"]
+        else:
+            lines = [f"{datum} {valuta} {text} {format_cents(cents)}"] + follow
+        bookings.append(lines)
+        expected.append({"date": datum, "valueDate": valuta, "amountCents": cents})
+
+    closing = opening + sum(tx["amountCents"] for tx in expected)
+
+    # Umsätze möglichst gleichmäßig auf die Seiten verteilen (ein Umsatz bleibt zusammen)
+    pages = max(1, pages)
+    per_page = -(-len(bookings) // pages) if bookings else 0
+    chunks = [bookings[i * per_page:(i + 1) * per_page] for i in range(pages)]
+
+    page_lines = []
+    for page_no, chunk in enumerate(chunks, 1):
+        lines = [line.format(datum=datum) for line in PAGE_HEADER]
+        if page_no == 1:
+            lines += [
+                f"Kontonummer {account_id}",
+                f"IBAN {ACCOUNTS[account_id]['iban']}",
+                f"Auszug Nr. {number}",
+                f"Kontoauszugsdatum {datum}",
+                f"Anfangssaldo {format_cents(opening)} EUR",
+                f"Anfangsaldo (in EUR) {format_cents(opening)}",
+            ]
+        lines.append(TABLE_HEADER)
+        for booking in chunk:
+            lines += booking
+        if page_no == pages:
+            lines += [f"Endsaldo {format_cents(closing)} EUR", f"Endsaldo (in EUR) {format_cents(closing)}"]
+        lines.append(f"Seite {page_no} von {pages}")
+        page_lines.append(lines)
+
+    return {
+        "pages": page_lines,
+        "statementNumber": number,
+        "statementDate": datum,
+        "openingCents": opening,
+        "closingCents": closing,
+        "transactions": expected,
+    }
+
+
+def statement_text(statement):
+    """Seiten wie page.extract_text() sie liefert, mit Leerzeile als Seitentrenner"""
+    return "\n\n".join("\n".join(lines) for lines in statement["pages"])
+
+
+def _pdf_string(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# Spalten der Umsatztabelle wie im UC eBanking Layout (x in pt), Betrag rechtsbündig
+TABLE_COLUMNS = {"datum": 40, "valuta": 100, "info": 160}
+AMOUNT_RIGHT = 555
+FONT_SIZE = 9
+
+# Helvetica-Breiten (1/1000 em) für rechtsbündige Spalten, sonst Ziffernbreite
+_HELVETICA_WIDTHS = {" ": 278, ",": 278, ".": 278, "-": 333, "E": 667, "R": 722, "U": 722,
+                     "a": 556, "m": 833, "s": 500, "t": 278, "z": 500}
+
+
+def _text_width(text):
+    return sum(_HELVETICA_WIDTHS.get(ch, 556) for ch in text) * FONT_SIZE / 1000
+
+
+def _right_aligned(text):
+    return AMOUNT_RIGHT - _text_width(text), text
+
+
+def _segments(line, in_table):
+    """Zeile -> [(x, Text)]: Tabellenzeilen in Spalten, alles andere linksbündig"""
+    if line == TABLE_HEADER:
+        return [(TABLE_COLUMNS["datum"], "Datum"), (TABLE_COLUMNS["valuta"], "Valuta"),
+                (TABLE_COLUMNS["info"], "Buchungsinformationen"), _right_aligned("Umsatz EUR")]
+    if not in_table:
+        return [(TABLE_COLUMNS["datum"], line)]
+
+    segments = []
+    date_match = DATE_PAIR_RE.match(line)
+    if date_match:
+        segments += [(TABLE_COLUMNS["datum"], date_match.group(1)), (TABLE_COLUMNS["valuta"], date_match.group(2))]
+        line = line[date_match.end():]
+    text, amount = split_trailing_amount(line)
+    if text.strip():
+        segments.append((TABLE_COLUMNS["info"], text.strip()))
+    if amount:
+        segments.append(_right_aligned(amount))
+    return segments
+
+
+def render_pdf(pages):
+    """Minimales PDF: eine Seite pro Zeilenliste, Helvetica 9pt, 11pt Zeilenabstand"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    font_id = 3 + 2 * len(pages)
+
+    for i, lines in enumerate(pages):
+        # Lange Seiten werden höher statt abgeschnitten
+        height = max(842, 60 + 11 * len(lines))
+        ops = [f"BT /F1 {FONT_SIZE} Tf"]
+        in_table = False
+        for row, line in enumerate(lines):
+            if line.startswith(("Endsaldo", "Seite")):
+                in_table = False
+            y = height - 42 - 11 * row
+            ops += [f"1 0 0 1 {x:.2f} {y} Tm ({_pdf_string(text)}) Tj" for x, text in _segments(line, in_table)]
+            if line == TABLE_HEADER:
+                in_table = True
+        content = "\n".join(ops + ["ET"]).encode("cp1252")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 {height}] "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_statement_pdf(path, statement):
+    Path(path).write_bytes(render_pdf(statement["pages"]))
+    return path
+
+
+def write_case_tree(raw_dir, statements=30, transactions=(3, 25), pages=(1, 3), extra_lines=0,
+                    start=date(2025, 11, 1), seed=7):
+    """
+    Kontoauszug-Ordner beider ISK-Konten wie im Fall-Verzeichnis (01-raw/.../Kontoauszüge).
+    transactions/pages: (min, max) je Auszug. Salden sind verkettet (Endsaldo = nächster
+    Anfangssaldo). Liefert die erzeugten PDF-Pfade.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for account_id, account in ACCOUNTS.items():
+        folder = Path(raw_dir) / account["folder"] / "Kontoauszüge"
+        folder.mkdir(parents=True, exist_ok=True)
+        opening = None
+        for number in range(1, statements + 1):
+            statement = generate_statement(
+                rng, account_id, number, start + timedelta(days=3 * (number - 1)),
+                transactions=rng.randint(*transactions), pages=rng.randint(*pages), extra_lines=extra_lines,
+                opening_cents=opening,
+            )
+            opening = statement["closingCents"]
+            paths.append(write_statement_pdf(folder / f"Tagesauszug #{account_id} Nr {number:03d}.pdf", statement))
+    return paths
@@ -0,0 +1,198 @@
+"""
+Plan-/Ist-Abgleich: extrahierte ISK-Umsätze gegen die Planmonate.
+
+Ist-Seite: jeder Umsatz geht in einem Durchgang in seine Zelle (Monat,
+Kategorie, Standort) - Standort aus der LANR-Zuordnung, sonst aus dem Konto
+("ISK Velbert" -> Velbert). Markierte Duplikate zählen nicht.
+
+Plan-Seite: die Umsatzpositionen der Planung (einnahmen.umsatz.kv_velbert,
+hzv_uckerath, pvs_velbert, ...) ergeben über Präfix und Standort dieselben
+Zellen. Verglichen wird über die Vereinigung beider Seiten in den Planmonaten,
+für die es schon Umsätze gibt (spätere Planmonate sind keine Abweichung, nur
+noch nicht ausgezogen); eine Zelle wird markiert, wenn die Abweichung die absolute
+Schwelle und (bei geplantem Betrag) die prozentuale Schwelle erreicht.
+
+Die Ist-Zellen stehen mit im Bericht, damit der Watch-Modus nur geänderte
+Monate aus den Monatsdateien neu aufbauen muss (wie die HZV-Rollups).
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .amounts import cents_to_euro
+from .cache import write_json_atomic
+
+# Präfix der Planposition -> Kategorie der Umsätze (isk-category-rules.json)
+PLAN_CATEGORIES = {"kv": "KV", "hzv": "HZV", "pvs": "PVS"}
+PLAN_SECTION = ("einnahmen", "umsatz")
+
+DEFAULT_THRESHOLD_CENTS = 100000
+DEFAULT_THRESHOLD_PERCENT = 10.0
+
+
+def _month(date):
+    """ "31.12.2025" -> "2025-12" """
+    return f"{date[6:10]}-{date[3:5]}"
+
+
+def account_standort(isk_name):
+    """ "ISK Velbert" -> "Velbert" """
+    return isk_name.removeprefix("ISK ").strip() if isk_name else None
+
+
+class ActualCells:
+    """(Monat, Kategorie, Standort) -> [Summe Cent, Anzahl]; Standort klein geschrieben als Schlüssel"""
+
+    def __init__(self):
+        self.cells = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, records):
+        """Transaction-Datensätze einarbeiten (markierte Duplikate zählen nicht)"""
+        cells = self.cells
+        for tx in records:
+            if tx.duplicate_of is not None:
+                continue
+            standort = tx.standort or account_standort(tx.isk_name)
+            key = (_month(tx.date), tx.category, standort.lower() if standort else None)
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [tx.amount_cents, 1]
+            else:
+                cell[0] += tx.amount_cents
+                cell[1] += 1
+
+    def add_dicts(self, transactions):
+        """Wie add(), für Umsätze in JSON-Form (Monatsdateien)"""
+        cells = self.cells
+        for tx in transactions:
+            if "duplicateOf" in tx:
+                continue
+            standort = tx.get("standort") or account_standort(tx.get("iskName"))
+            key = (_month(tx["date"]), tx["category"], standort.lower() if standort else None)
+            amount_cents = tx.get("amountCents", round(tx["amount"] * 100))
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [amount_cents, 1]
+            else:
+                cell[0] += amount_cents
+                cell[1] += 1
+
+    def drop_months(self, months):
+        months = set(months)
+        self.cells = {key: cell for key, cell in self.cells.items() if key[0] not in months}
+
+    def rows(self):
+        return [
+            {"month": month, "category": category, "standort": standort, "amountCents": cell[0], "count": cell[1]}
+            for (month, category, standort), cell in sorted(self.cells.items(), key=lambda item: tuple(
+                value or "" for value in item[0]))
+        ]
+
+    @classmethod
+    def from_rows(cls, rows):
+        actuals = cls()
+        for row in rows:
+            actuals.cells[(row["month"], row["category"], row["standort"])] = [row["amountCents"], row["count"]]
+        return actuals
+
+
+def plan_line_key(name):
+    """ "hzv_uckerath" -> ("HZV", "uckerath"); andere Positionen -> None"""
+    prefix, _, standort = name.partition("_")
+    category = PLAN_CATEGORIES.get(prefix)
+    return (category, standort) if category and standort else None
+
+
+def load_plan_cells(path):
+    """
+    Planzellen aus der Planungsdatei (monate[].einnahmen.umsatz):
+    ({(Monat, Kategorie, Standort): Cent}, {Zelle: Positionsname}, [Monate])
+    """
+    with open(path, encoding="utf-8") as f:
+        monate = json.load(f)["monate"]
+
+    cells = {}
+    lines = {}
+    for month in monate:
+        node = month
+        for key in PLAN_SECTION:
+            node = node.get(key) if isinstance(node, dict) else None
+        if not isinstance(node, dict):
+            continue
+        for name, value in node.items():
+            line_key = plan_line_key(name)
+            if line_key is None or not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            cell = (month["monat"],) + line_key
+            cells[cell] = cells.get(cell, 0) + round(value * 100)
+            lines[cell] = name
+    return cells, lines, [month["monat"] for month in monate]
+
+
+def compare(actuals, plan_cells, plan_lines, months, threshold_cents=DEFAULT_THRESHOLD_CENTS,
+            threshold_percent=DEFAULT_THRESHOLD_PERCENT):
+    """IST/PLAN/Abweichung je Zelle der Plankategorien, in Planmonaten mit Umsätzen"""
+    months = set(months) & {key[0] for key in actuals.cells}
+    categories = set(PLAN_CATEGORIES.values())
+    keys = {key for key in plan_cells if key[0] in months}
+    keys.update(key for key in actuals.cells if key[0] in months and key[1] in categories)
+
+    rows = []
+    for key in sorted(keys, key=lambda k: (k[0], k[1], k[2] or "")):
+        month, category, standort = key
+        ist_cents, count = actuals.cells.get(key, (0, 0))
+        plan_cents = plan_cells.get(key, 0)
+        deviation = ist_cents - plan_cents
+        percent = round(deviation * 100 / abs(plan_cents), 1) if plan_cents else None
+        flagged = abs(deviation) >= threshold_cents and (percent is None or abs(percent) >= threshold_percent)
+        rows.append({
+            "month": month,
+            "category": category,
+            "standort": standort,
+            "planLine": plan_lines.get(key),
+            "ist": cents_to_euro(ist_cents),
+            "plan": cents_to_euro(plan_cents),
+            "abweichung": cents_to_euro(deviation),
+            "abweichungProzent": percent,
+            "istCents": ist_cents,
+            "planCents": plan_cents,
+            "abweichungCents": deviation,
+            "count": count,
+            "flagged": flagged,
+        })
+    return rows
+
+
+def save_report(path, case_number, plan_file, rows, actuals, threshold_cents, threshold_percent):
+    write_json_atomic(path, {
+        "caseNumber": case_number,
+        "generatedAt": datetime.now().isoformat(),
+        "planFile": str(plan_file),
+        "thresholdCents": threshold_cents,
+        "thresholdPercent": threshold_percent,
+        "summary": {
+            "months": sorted({row["month"] for row in rows}),
+            "cells": len(rows),
+            "flagged": sum(row["flagged"] for row in rows),
+            "istCents": sum(row["istCents"] for row in rows),
+            "planCents": sum(row["planCents"] for row in rows),
+        },
+        "cells": rows,
+        "actuals": actuals.rows(),
+    }, indent=2)
+
+
+def load_actuals(path):
+    """Ist-Zellen aus einem früheren Bericht; fehlt er oder ist er unlesbar, leer"""
+    path = Path(path)
+    if not path.exists():
+        return ActualCells()
+    try:
+        with open(path, encoding="utf-8") as f:
+            return ActualCells.from_rows(json.load(f)["actuals"])
+    except (OSError, ValueError, KeyError):
+        return ActualCells()
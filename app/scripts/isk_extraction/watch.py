@@ -0,0 +1,129 @@
+"""
+Überwachung der Kontoauszug-Ordner für den Watch-Modus des Extraktors.
+
+Mit installiertem `watchdog` (pip install watchdog) lösen Dateisystem-
+Ereignisse einen Abgleich aus, sonst wird in festen Abständen gepollt.
+Ereignisse dienen nur als Auslöser: maßgeblich ist immer der Abgleich der
+Ordnerinhalte (Größe + mtime), damit Sammel-Ereignisse, Umbenennungen und
+verpasste Notifications keine Rolle spielen. Eine Datei gilt erst dann als
+angekommen, wenn sie zwei Abgleiche lang unverändert ist (Kopiervorgang fertig).
+"""
+
+import threading
+import time
+from pathlib import Path
+
+# Ohne Notification trotzdem gelegentlich abgleichen (z.B. Netzlaufwerke ohne Events)
+NOTIFY_RESCAN_SECONDS = 60.0
+
+
+def file_signature(path):
+    """(Größe, mtime_ns) - None, wenn die Datei verschwunden ist"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _start_observer(folders, event):
+    """watchdog-Observer, der bei jedem Ereignis `event` setzt - None ohne watchdog"""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _Trigger(FileSystemEventHandler):
+        def on_any_event(self, _event):
+            event.set()
+
+    observer = Observer()
+    scheduled = 0
+    for folder in folders:
+        if folder.exists():
+            observer.schedule(_Trigger(), str(folder), recursive=True)
+            scheduled += 1
+    if not scheduled:
+        return None
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+class StatementWatcher:
+    """
+    Meldet neue oder geänderte Auszug-PDFs in den überwachten Ordnern.
+
+    list_pdfs(folder) entscheidet, welche Dateien zählen (find_pdfs-Filter).
+    """
+
+    def __init__(self, folders, list_pdfs, interval=2.0, use_notifications=True):
+        self.folders = [Path(folder) for folder in folders]
+        self.list_pdfs = list_pdfs
+        self.interval = interval
+        self.known = {}
+        self.pending = {}
+        self._event = threading.Event()
+        self._observer = _start_observer(self.folders, self._event) if use_notifications else None
+
+    @property
+    def mode(self):
+        return "Dateisystem-Ereignisse" if self._observer else f"Polling alle {self.interval:g}s"
+
+    def baseline(self, paths):
+        """Bereits verarbeitete PDFs - nur spätere Änderungen werden gemeldet"""
+        for path in paths:
+            signature = file_signature(path)
+            if signature is not None:
+                self.known[Path(path)] = signature
+
+    def scan(self):
+        """Ein Abgleich: liefert die PDFs, die neu/geändert und inzwischen stabil sind"""
+        current = {}
+        for folder in self.folders:
+            if folder.exists():
+                for path in self.list_pdfs(folder):
+                    signature = file_signature(path)
+                    if signature is not None:
+                        current[path] = signature
+
+        ready = []
+        for path, signature in current.items():
+            if self.known.get(path) == signature:
+                self.pending.pop(path, None)
+            elif self.pending.get(path) == signature:
+                del self.pending[path]
+                self.known[path] = signature
+                ready.append(path)
+            else:
+                self.pending[path] = signature
+
+        # Gelöschte Dateien vergessen (ihre Umsätze bleiben in den Monatsdateien)
+        for path in set(self.known) - set(current):
+            del self.known[path]
+        for path in set(self.pending) - set(current):
+            del self.pending[path]
+        return sorted(ready)
+
+    def wait(self):
+        """Blockiert bis zum nächsten Abgleich-Zeitpunkt"""
+        if self.pending or self._observer is None:
+            # Polling, oder Datei noch in Bewegung -> volle `interval` abwarten, auch bei weiteren Ereignissen
+            time.sleep(self.interval)
+        else:
+            self._event.wait(NOTIFY_RESCAN_SECONDS)
+        self._event.clear()
+
+    def batches(self):
+        """Endlos: Listen neu angekommener PDFs, sobald es welche gibt"""
+        while True:
+            self.wait()
+            ready = self.scan()
+            if ready:
+                yield ready
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Smoke Test: ISK-Extraktion ohne echte Auszüge
+
+Prüft:
+1. Kategorie-Regeln im Format der App-Tabelle ClassificationRule
+   (matchField bezeichnung/counterpartyHint, AMOUNT_RANGE ">100", "<=500", "100-500")
+2. Sparkassen-Auszug (synthetic.SPARKASSE_PAGES) als PDF: Format-Erkennung,
+   alle Umsätze trotz Verwendungszwecken wie "Übertrag auf ...", Kontostände
+
+Ausführen: python3 scripts/smoke-test-isk-extraction.py
+"""
+
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import pdfplumber
+
+from isk_extraction.amounts import parse_amount_cents
+from isk_extraction.formats import read_first_page
+from isk_extraction.metrics import NULL_TIMER
+from isk_extraction.rules import CategoryRuleEngine
+from isk_extraction.sparkasse import SPARKASSE
+from isk_extraction.synthetic import SPARKASSE_BOOKINGS, SPARKASSE_PAGES, render_pdf
+
+# Wie aus ClassificationRule exportiert (zusätzliche Spalten wie id/caseId stören nicht)
+APP_RULES = [
+    {"id": "r1", "caseId": "c1", "name": "HZV", "priority": 10, "isActive": True,
+     "matchField": "bezeichnung", "matchType": "CONTAINS", "matchValue": "hzv", "suggestedCategory": "HZV"},
+    {"id": "r2", "caseId": "c1", "name": "KV Gegenpartei", "priority": 20, "isActive": True,
+     "matchField": "counterpartyHint", "matchType": "STARTS_WITH", "matchValue": "Kassenärztliche",
+     "suggestedCategory": "KV"},
+    {"id": "r3", "caseId": "c1", "name": "Große Eingänge", "priority": 50, "isActive": True,
+     "matchField": "betrag", "matchType": "AMOUNT_RANGE", "matchValue": ">100", "suggestedCategory": "EINGANG"},
+    {"id": "r4", "caseId": "c1", "name": "Kleine Ausgaben", "priority": 60, "isActive": True,
+     "matchField": "betrag", "matchType": "AMOUNT_RANGE", "matchValue": "<=-10", "suggestedCategory": "AUSGANG"},
+    {"id": "r5", "caseId": "c1", "name": "Mittlere Beträge", "priority": 70, "isActive": True,
+     "matchField": "betrag", "matchType": "AMOUNT_RANGE", "matchValue": "1-100", "suggestedCategory": "MITTEL"},
+    {"id": "r6", "caseId": "c1", "name": "Standort Velbert", "priority": 5, "isActive": True,
+     "matchField": "standort", "matchType": "EQUALS", "matchValue": "Velbert", "suggestedCategory": "VELBERT"},
+]
+
+
+def check(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def test_app_rules():
+    engine = CategoryRuleEngine(APP_RULES)
+    check([name for name, _ in engine.skipped] == ["Standort Velbert"],
+          f"nur die standort-Regel darf übersprungen werden: {engine.skipped}")
+    check(engine.classify("Gutschrift HZV ABS. Q4/25", None, 5) == "HZV", "bezeichnung -> description")
+    check(engine.classify("Gutschrift", "Kassenärztliche Vereinigung", 5) == "KV", "counterpartyHint -> counterparty")
+    check(engine.classify("Gutschrift", None, 150) == "EINGANG", ">100 auf den Betrag mit Vorzeichen")
+    check(engine.classify("Lastschrift", None, -150) == "AUSGANG", "-150 ist nicht >100, aber <=-10")
+    check(engine.classify("Gutschrift", None, 100) == "MITTEL", ">100 schließt 100 aus, 1-100 schließt es ein")
+    check(engine.classify("Lastschrift", None, -5) == "SONSTIGE", "-5 liegt in keinem Bereich")
+
+
+def test_sparkasse():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "Konto_1234567890-Auszug_2025_0003.pdf"
+        pdf_path.write_bytes(render_pdf(SPARKASSE_PAGES))
+        check(SPARKASSE.filename(pdf_path.name), "Dateiname des Sparkassen-Exports")
+
+        metadata = {"account": {}, "balances": {}}
+        with pdfplumber.open(pdf_path) as pdf:
+            first_page = read_first_page(pdf)
+            check(SPARKASSE.sniff(first_page), "Seite 1 als Sparkasse erkannt")
+            transactions = list(SPARKASSE.parse(pdf, first_page, metadata, NULL_TIMER))
+
+    bookings = [(tx["date"], tx["amountText"]) for tx in transactions]
+    check(bookings == SPARKASSE_BOOKINGS, f"Umsätze: {bookings}")
+    check(transactions[1]["description"] == "Umbuchung Übertrag auf Tagesgeldkonto 4711",
+          "Verwendungszweck mit \"Übertrag auf\" bleibt Teil des Umsatzes")
+    check(metadata["account"]["kontonummer"] == "1234567890", "Kontonummer aus dem Kopf")
+    balances = metadata["balances"]
+    total = sum(parse_amount_cents(amount) for _, amount in bookings)
+    check(balances["openingCents"] + total == balances["closingCents"],
+          f"Anfangssaldo + Umsätze = Schlusssaldo: {balances}")
+
+
+TESTS = [
+    ("Kategorie-Regeln im App-Format", test_app_rules),
+    ("Sparkassen-Auszug", test_sparkasse),
+]
+
+
+def main():
+    failed = 0
+    for name, test in TESTS:
+        try:
+            test()
+            print(f"✓ {name}")
+        except Exception:
+            failed += 1
+            print(f"✗ {name}")
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} bestanden")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
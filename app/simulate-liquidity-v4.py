@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Monte-Carlo-Simulation der Zahlungszeitpunkte für die Liquiditätsplanung V4.0
+
+Liest die von create-planning-v4.py erzeugte Planung, lässt KV/HZV/PVS und
+Altforderungen nach den Annahmen in planning-payment-timing.json verspätet
+und in abweichender Höhe eingehen und berichtet je Monat die Verteilung des
+Kontostands und die Wahrscheinlichkeit eines Fehlbetrags.
+
+Verwendung:
+    python3 create-planning-v4.py && python3 simulate-liquidity-v4.py
+    python3 simulate-liquidity-v4.py --paths 50000 --seed 7
+    python3 simulate-liquidity-v4.py --opening 25000      # Anfangsbestand in EUR
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from planning.matrix import PlanMatrix, to_cents
+from planning.simulation import TimingConfigError, load_timings, simulate, summarize
+
+PLAN_FILE = Path('/Users/david/Projekte/AI Terminal/Inso-Liquiplanung/Cases/Hausärztliche Versorgung PLUS eG/06-review/PLANUNG-V4.0-IV-TAUGLICH.json')
+TIMING_FILE = Path(__file__).with_name('planning-payment-timing.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Monte-Carlo-Simulation der Zahlungszeitpunkte (Planung V4.0)")
+    parser.add_argument("--plan", type=Path, default=PLAN_FILE, help="Planungsdatei (JSON mit monate)")
+    parser.add_argument("--timing", type=Path, default=TIMING_FILE,
+                        help=f"Zahlungsannahmen (Standard: {TIMING_FILE.name})")
+    parser.add_argument("--paths", type=int, default=20000, help="Anzahl simulierter Pfade")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators (reproduzierbar)")
+    parser.add_argument("--opening", type=float, default=0, help="Anfangsbestand in EUR")
+    parser.add_argument("--output", type=Path,
+                        help="Bericht als JSON (Standard: neben der Planung, -SIMULATION.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        timings = load_timings(args.timing)
+    except TimingConfigError as e:
+        raise SystemExit(str(e))
+    with open(args.plan, encoding='utf-8') as f:
+        monate = json.load(f)['monate']
+
+    start = time.perf_counter()
+    matrix = PlanMatrix.from_monate(monate)
+    result = simulate(matrix, timings, args.paths, to_cents(args.opening), args.seed)
+    report = summarize(result)
+    seconds = time.perf_counter() - start
+
+    output = args.output or args.plan.with_name(args.plan.stem + '-SIMULATION.json')
+    report = {"planung": args.plan.name, "seed": args.seed, "anfangsbestand": args.opening,
+              "sekunden": round(seconds, 3), **report}
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"{report['pfade']:,} Pfade in {seconds:.2f}s, simuliert: {', '.join(report['simuliertePositionen'])}")
+    print(f"\n{'Monat':<8} {'Plan':>13} {'P5':>13} {'Median':>13} {'P95':>13} {'P(<0)':>7}")
+    for m in report['monate']:
+        print(f"{m['monat']:<8} {m['plan']:>13,.2f} {m['p05']:>13,.2f} {m['p50']:>13,.2f} "
+              f"{m['p95']:>13,.2f} {m['wahrscheinlichkeitFehlbetrag']:>7.1%}")
+    tief = report['tiefststand']
+    print(f"\nTiefststand: Median {tief['p50']:,.2f} EUR, P5 {tief['p05']:,.2f} EUR, "
+          f"P(Fehlbetrag) {tief['wahrscheinlichkeitFehlbetrag']:.1%}")
+    print(f"Bericht: {output}")
+
+
+if __name__ == '__main__':
+    main()